@@ -2,6 +2,13 @@
 A Python library for open neuroscience data access and manipulation.
 """
 
-from .convenience import array
-
 from .version import __version__, check_version
+from .utils.lazy import lazy_module_attributes
+
+# Attributes that are imported on first use (PEP 562), so that `import intern`
+# does not pull in numpy, requests, PIL etc. until they are needed:
+_LAZY_ATTRIBUTES = {
+    "array": "intern.convenience",
+}
+
+__getattr__, __dir__ = lazy_module_attributes(__name__, _LAZY_ATTRIBUTES)
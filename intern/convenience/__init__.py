@@ -1,2 +1,30 @@
-from .uri import parse_fquri, PROTOCOLS, InvalidURIError
-from .array import AxisOrder, array
+import sys
+import types
+
+from intern.utils.lazy import lazy_module_attributes
+
+# Attributes that are imported on first use (PEP 562), so that importing this
+# package does not pull in the Boss remote, PIL, psutil etc. until needed:
+_LAZY_ATTRIBUTES = {
+    "parse_fquri": "intern.convenience.uri",
+    "get_remote": "intern.convenience.uri",
+    "PROTOCOLS": "intern.convenience.uri",
+    "InvalidURIError": "intern.convenience.uri",
+    "AxisOrder": "intern.convenience.array",
+    "array": "intern.convenience.array",
+}
+
+
+__getattr__, __dir__ = lazy_module_attributes(__name__, _LAZY_ATTRIBUTES)
+
+
+class _ConvenienceModule(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing the `array` submodule binds it here as `array`, which would
+        # shadow the `array` class this package exports:
+        if name == "array" and isinstance(value, types.ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _ConvenienceModule
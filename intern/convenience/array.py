@@ -16,13 +16,17 @@ limitations under the License.
 
 # Standard imports
 import time
-from typing import List, Optional, Union, Tuple
+from typing import Iterator, List, Optional, Union, Tuple
 import abc
+import itertools
 import json
+import os
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait
 from urllib.parse import unquote
 import warnings
 import pathlib
+import threading
 import psutil
 import warnings
 
@@ -31,12 +35,18 @@ from requests.exceptions import HTTPError
 import numpy as np
 from PIL import Image
 
-import math
 from tqdm.auto import tqdm
-from joblib import Parallel, delayed
 
 from intern.service.boss.httperrorlist import HTTPErrorList
-from .uri import parse_fquri
+from intern.utils.cache import MemoryCache, open_cache
+from intern.utils.parallel import (
+    CUBOID_SIZE,
+    DEFAULT_MAX_WORKERS,
+    align_to_cuboids,
+    cuboid_aligned_blocks,
+    imap_bounded,
+)
+from .uri import get_remote, parse_fquri
 
 
 # Pip-installable imports
@@ -60,6 +70,12 @@ try:
 except ModuleNotFoundError:
     HAS_CLOUDVOLUME = False
 
+HAS_TIFFFILE = True
+try:
+    import tifffile
+except ModuleNotFoundError:
+    HAS_TIFFFILE = False
+
 warnings.filterwarnings("once", "CloudVolume")
 
 # A named tuple that represents a bossDB URI.
@@ -89,10 +105,21 @@ _DEFAULT_BOSS_OPTIONS = {
 }
 
 
+# A channel of a ZSliceIngestJob: its z-slices, their (x, y) shape, and the
+# array they are uploaded to.
+_IngestChannel = namedtuple(
+    "_IngestChannel", ["name", "dtype", "paths", "shape", "dataset"]
+)
+
+
 class ZSliceIngestJob:
 
     _max_batch_size: int = 256
     _retry_wait: int = 5
+    _slab_depth: int = 2 * CUBOID_SIZE[2]
+    _tile_size: Tuple[int, int] = (2048, 2048)
+    _upload_workers: int = 4
+    _header_workers: int = DEFAULT_MAX_WORKERS
 
     def __init__(
         self,
@@ -105,6 +132,7 @@ class ZSliceIngestJob:
         ram_pct_to_use: float = 0.75,
         retries: int = 5,
         boss_options: dict = None,
+        manifest_path: str = None,
     ):
         """
         Create a new ZSliceIngestJob.
@@ -126,6 +154,10 @@ class ZSliceIngestJob:
             ram_pct_to_use (float): Percentage of free RAM to use for uploading.
             retries (int): Number of times to retry an upload if it fails.
             boss_options (dict): Options for the BossRemote.
+            manifest_path (str): A JSON file in which to remember the size,
+                modification time, shape and mode of every image that has been
+                verified, so that later runs only open the files that changed.
+                Defaults to no manifest.
 
         """
         self.image = image
@@ -139,6 +171,9 @@ class ZSliceIngestJob:
         self._ignore_hidden = ignore_hidden
         self._boss_options = boss_options
         self._retries = retries
+        self._manifest_path = manifest_path
+        self._image_filenames = None
+        self._annotation_filenames = None
         if verify_data:
             self._verify_paths()
             self._verify_shapes()
@@ -166,10 +201,14 @@ class ZSliceIngestJob:
         return True
 
     def _get_image_filenames(self) -> List[pathlib.Path]:
-        fnames = list(self.image["path"].glob(self.image["pattern"]))
-        if self._ignore_hidden:
-            fnames = [f for f in fnames if not f.name.startswith(".")]
-        return sorted(fnames)
+        # Listing large directories is slow (especially on network
+        # filesystems), so the stack is only listed once.
+        if self._image_filenames is None:
+            fnames = list(self.image["path"].glob(self.image["pattern"]))
+            if self._ignore_hidden:
+                fnames = [f for f in fnames if not f.name.startswith(".")]
+            self._image_filenames = sorted(fnames)
+        return self._image_filenames
 
     def _get_ram_bytes_available(self):
         """
@@ -210,12 +249,14 @@ class ZSliceIngestJob:
         """
         return self._get_shape_px_of_zslice() * dtype.itemsize
 
-    def _get_permitted_zcount(self, dtype):
+    def _get_permitted_zcount(self, dtype, tile: Tuple[int, int] = None):
         """
         Get the number of z-slices that can be uploaded at once.
 
         Arguments:
             dtype (numpy.dtype): The data type of the array.
+            tile (tuple[int, int]): The (x, y) size of the part of each
+                z-slice that is uploaded at once. Defaults to the whole slice.
 
         Returns:
             int: Number of z-slices that can be uploaded at once.
@@ -223,11 +264,11 @@ class ZSliceIngestJob:
         """
         if isinstance(dtype, str):
             dtype = np.dtype(dtype)
-        count = int(
-            self._get_ram_bytes_available()
-            * self._ram_pct_to_use
-            / self._get_size_bytes_of_zslice(dtype)
-        )
+        if tile is None:
+            size = self._get_size_bytes_of_zslice(dtype)
+        else:
+            size = tile[0] * tile[1] * dtype.itemsize
+        count = int(self._get_ram_bytes_available() * self._ram_pct_to_use / size)
 
         if count == 0:
             raise ValueError(
@@ -262,16 +303,18 @@ class ZSliceIngestJob:
             list[list[pathlib.Path]]: Paths to the z-slices.
 
         """
-        return [
-            [
-                fname
-                for fname in list(
-                    sorted(annotation["path"].glob(annotation["pattern"]))
-                )
-                if not self._ignore_hidden or not fname.name.startswith(".")
+        if self._annotation_filenames is None:
+            self._annotation_filenames = [
+                [
+                    fname
+                    for fname in list(
+                        sorted(annotation["path"].glob(annotation["pattern"]))
+                    )
+                    if not self._ignore_hidden or not fname.name.startswith(".")
+                ]
+                for annotation in self.annotations
             ]
-            for annotation in self.annotations
-        ]
+        return self._annotation_filenames
 
     def _get_zslice_count(self):
         """
@@ -307,30 +350,287 @@ class ZSliceIngestJob:
                     )
                 return False
 
-        # Get the shape of the first image
-        shape = Image.open(self._get_zslice_image_paths()[0]).size
-
-        # Check that all the other images are the same size
-        for path in self._get_zslice_image_paths()[1:]:
-            if Image.open(path).size != shape:
+        # Read the headers of every image, and check that they are all the
+        # same size as the first one
+        paths = self._get_zslice_image_paths()
+        headers = self._read_image_headers(paths)
+        shape = headers[0]["shape"]
+        for path, header in zip(paths[1:], headers[1:]):
+            if header["shape"] != shape:
                 if warn:
                     warnings.warn(
                         "Not all image stacks have the same shape. "
-                        f"Image [{path}] has shape {Image.open(path).size}, but the first image has shape {shape}."
+                        f"Image [{path}] has shape {tuple(header['shape'])}, but the first image has shape {tuple(shape)}."
                     )
                 return False
 
         return True
 
-    def upload_images(self, progress: bool = True) -> bool:
+    def _read_image_headers(self, paths: List[pathlib.Path]) -> List[dict]:
         """
-        Upload the images to the channel.
+        Read the headers of images in parallel.
+
+        If the job has a manifest, images whose size and modification time
+        match their manifest entry are not opened, and the manifest is
+        updated with the headers that were read.
 
         Arguments:
-            progress (bool): Whether to show a progress bar.
+            paths (list[pathlib.Path]): The images.
 
         Returns:
-            bool: Whether the upload was successful.
+            list[dict]: The `size`, `mtime`, `shape` (x, y) and `mode` of each
+                image.
+
+        """
+        manifest = {}
+        if self._manifest_path and os.path.isfile(self._manifest_path):
+            with open(self._manifest_path) as fh:
+                manifest = json.load(fh)
+
+        def read_header(path):
+            stat = path.stat()
+            entry = manifest.get(str(path))
+            if (
+                entry is not None
+                and entry["size"] == stat.st_size
+                and entry["mtime"] == stat.st_mtime
+            ):
+                return entry
+            # Opening an image only reads its header:
+            with Image.open(path) as image:
+                return {
+                    "size": stat.st_size,
+                    "mtime": stat.st_mtime,
+                    "shape": list(image.size),
+                    "mode": image.mode,
+                }
+
+        with ThreadPoolExecutor(self._header_workers) as executor:
+            headers = list(executor.map(read_header, paths))
+
+        if self._manifest_path:
+            manifest.update(zip(map(str, paths), headers))
+            tmp = f"{self._manifest_path}.tmp"
+            with open(tmp, "w") as fh:
+                json.dump(manifest, fh)
+            os.replace(tmp, self._manifest_path)
+        return headers
+
+    def _get_slab_plan(self, dtype, shape: Tuple[int, int]):
+        """
+        Choose how the z-slices are grouped and pipelined.
+
+        Slabs are a whole number of cuboids deep, so that their uploads stay
+        on the cuboid grid, and as many are kept in memory (being decoded,
+        queued or uploaded) as the permitted RAM allows. If not even two
+        cuboid-deep slabs of whole z-slices fit, slabs are also tiled in XY
+        (by `_tile_size`), and only the window of each image that a tile
+        needs is read.
+
+        Arguments:
+            dtype (numpy.dtype): The data type of the array.
+            shape (tuple[int, int]): The (x, y) size of a z-slice.
+
+        Returns:
+            tuple[int, tuple[int, int], int, int]: The slab depth, the (x, y)
+                tile size, the number of tiles decoded ahead of the uploads,
+                and the number of concurrent uploads.
+
+        """
+        itemsize = np.dtype(dtype).itemsize
+        tile = tuple(shape)
+        if (
+            self._get_ram_bytes_available() * self._ram_pct_to_use
+            < 2 * CUBOID_SIZE[2] * shape[0] * shape[1] * itemsize
+        ):
+            tile_x, tile_y, _ = align_to_cuboids(self._tile_size + (1,))
+            tile = (min(shape[0], tile_x), min(shape[1], tile_y))
+
+        permitted = min(self._get_permitted_zcount(dtype, tile), self._max_batch_size)
+        depth = min(self._slab_depth, permitted)
+        if depth >= CUBOID_SIZE[2]:
+            depth -= depth % CUBOID_SIZE[2]
+        in_flight = max(2, permitted // depth)
+        uploads = max(1, min(self._upload_workers, in_flight // 2))
+        return depth, tile, max(1, in_flight - uploads), uploads
+
+    def _retry(self, fn, *args):
+        """
+        Call `fn`, retrying it up to `self._retries` times.
+
+        Returns:
+            Whatever `fn` returns.
+
+        Raises:
+            The exception of the last attempt, if every attempt fails.
+
+        """
+        for attempt in range(self._retries):
+            try:
+                return fn(*args)
+            except Exception:
+                if attempt == self._retries - 1:
+                    raise
+                # Wait for a bit before trying again
+                time.sleep(self._retry_wait)
+
+    def _plan_tiles(self, channel: "_IngestChannel"):
+        """
+        Split a channel's stack into the tiles that are read and uploaded.
+
+        Arguments:
+            channel (_IngestChannel): The channel.
+
+        Returns:
+            tuple[list, int, int]: The (zs, ys, xs) of every tile, the number
+                of tiles that may be decoded ahead of the uploads, and the
+                number of concurrent uploads.
+
+        """
+        width, height = channel.shape
+        depth, (tile_x, tile_y), queued, uploads = self._get_slab_plan(
+            channel.dtype, channel.shape
+        )
+        if (tile_x, tile_y) != (width, height) and not HAS_TIFFFILE:
+            warnings.warn(
+                "The z-slices are too large to upload whole, so each image will be "
+                "decoded once per XY tile. Install tifffile and use tiled TIFFs to "
+                "read only the needed windows."
+            )
+        tiles = [
+            (
+                (z, min(z + depth, len(channel.paths))),
+                (y, min(y + tile_y, height)),
+                (x, min(x + tile_x, width)),
+            )
+            for z in range(0, len(channel.paths), depth)
+            for y in range(0, height, tile_y)
+            for x in range(0, width, tile_x)
+        ]
+        return tiles, queued, uploads
+
+    def _upload_channels(
+        self, channels: List["_IngestChannel"], progress: bool = True
+    ) -> List[bool]:
+        """
+        Upload stacks of z-slices through one shared decode/upload pipeline.
+
+        Decode workers read cuboid-aligned z-slabs (tiled in XY if the
+        slices are too large) straight into their final arrays, and a bounded
+        number of decoded tiles wait for the upload workers, so that disk
+        reads, decoding and uploads overlap while the memory in use stays
+        within the permitted RAM. The tiles of all the channels are
+        interleaved, so that they are uploaded side by side rather than one
+        after another.
+
+        A channel whose tile fails `retries` times is abandoned with a
+        warning; the other channels carry on.
+
+        Arguments:
+            channels (list[_IngestChannel]): The channels to upload.
+            progress (bool): Whether to show a progress bar per channel.
+
+        Returns:
+            list[bool]: Whether each channel was uploaded successfully.
+
+        """
+        plans = [self._plan_tiles(channel) for channel in channels]
+        # Every channel's plan keeps its own tiles within the permitted RAM,
+        # so the smallest of their limits is safe for any mix of tiles:
+        queued = min(plan[1] for plan in plans)
+        uploads = min(plan[2] for plan in plans)
+
+        progress_bars = [
+            tqdm(
+                total=len(channel.paths),
+                desc=f"Uploading channel [{channel.name}]",
+                position=i,
+            )
+            if progress
+            else None
+            for i, channel in enumerate(channels)
+        ]
+        failed = set()
+
+        def fail(i):
+            if i not in failed:
+                failed.add(i)
+                warnings.warn(
+                    f"Failed to upload channel {channels[i].name} after {self._retries} retries."
+                )
+
+        def interleave():
+            for items in itertools.zip_longest(
+                *[[(i, tile) for tile in plan[0]] for i, plan in enumerate(plans)]
+            ):
+                for item in items:
+                    if item is not None and item[0] not in failed:
+                        yield item
+
+        def read_tile(item):
+            i, (zs, ys, xs) = item
+            channel = channels[i]
+            data = np.empty(
+                (zs[1] - zs[0], ys[1] - ys[0], xs[1] - xs[0]), dtype=channel.dtype
+            )
+            for z, path in enumerate(channel.paths[zs[0] : zs[1]]):
+                data[z] = _read_image_window(path, xs, ys)
+            return data
+
+        def upload_tile(item):
+            (i, (zs, ys, xs)), data = item
+            channels[i].dataset[zs[0] : zs[1], ys[0] : ys[1], xs[0] : xs[1]] = data
+
+        def guarded(fn, channel_of):
+            # Retry `fn`, and abandon the tile's channel if it keeps failing
+            def run(item):
+                i = channel_of(item)
+                if i in failed:
+                    return None
+                try:
+                    return self._retry(fn, item)
+                except Exception:
+                    fail(i)
+                    return None
+
+            return run
+
+        with ThreadPoolExecutor(queued) as readers, ThreadPoolExecutor(
+            uploads
+        ) as uploaders:
+            decoded = imap_bounded(
+                readers, guarded(read_tile, lambda item: item[0]), interleave(), queued
+            )
+            try:
+                for ((i, (zs, ys, xs)), _), _ in imap_bounded(
+                    uploaders,
+                    guarded(upload_tile, lambda item: item[0][0]),
+                    decoded,
+                    uploads,
+                ):
+                    if progress_bars[i] is not None and i not in failed:
+                        # Progress is counted in z-slices
+                        width, height = channels[i].shape
+                        progress_bars[i].update(
+                            (zs[1] - zs[0])
+                            * (ys[1] - ys[0])
+                            * (xs[1] - xs[0])
+                            / (width * height)
+                        )
+            finally:
+                decoded.close()
+                for progress_bar in progress_bars:
+                    if progress_bar is not None:
+                        progress_bar.close()
+
+        return [i not in failed for i in range(len(channels))]
+
+    def _open_image_channel(self) -> "_IngestChannel":
+        """
+        Get (or create) the image's array.
+
+        Returns:
+            _IngestChannel: The image channel.
 
         """
         # Get the z-slice paths
@@ -342,17 +642,6 @@ class ZSliceIngestJob:
         # Get the shape of the images
         shape = Image.open(zslice_paths[0]).size
 
-        # Get the number of images to upload per batch
-        batch_size = min(
-            self._get_permitted_zcount(self.image["dtype"]), self._max_batch_size
-        )
-        # Get the number of batches
-        batch_count = math.ceil(zslice_count / batch_size)
-
-        # Set the progress bar lambda
-        if progress:
-            progress_bar = tqdm(total=zslice_count, desc="Uploading images")
-
         # Try making the array pointer. If it already exists, then make sure
         # that the shape is the same.
         boss_config_partial = (
@@ -373,63 +662,25 @@ class ZSliceIngestJob:
                 **boss_config_partial,
             )
 
-        # Now break up the images into batches and upload them. First we'll do
-        # all of the batches of size `batch_size`, then we'll do the last batch
-        # (if it exists) which may be smaller than `batch_size` if the total
-        # number of z-slices is not divisible by `batch_size`.
-        for batch in range(batch_count):
-            # Get the start and end indices for the batch
-            start = batch * batch_size
-            end = min((batch + 1) * batch_size, zslice_count)
-
-            for _ in range(self._retries):
-                try:
-                    batch_array = Parallel(n_jobs=-1)(
-                        delayed(Image.open)(path) for path in zslice_paths[start:end]
-                    )
-                    batch_array = np.stack(batch_array, axis=0).astype(
-                        self.image["dtype"]
-                    )
-
-                    # Upload the batch
-                    dataset[start:end, 0 : shape[1], 0 : shape[0]] = batch_array
-                except:
-                    # Wait for a bit before trying again
-                    time.sleep(self._retry_wait)
-                else:
-                    # Break out of the retry loop
-                    break
-            else:
-                warnings.warn(
-                    f"Failed to upload slices {start} to {end} of channel {self.image['name']} after {self._retries} retries."
-                )
-                return False
-
-            # Update the progress bar
-            if progress:
-                progress_bar.update(end - start)  # type: ignore
-
-        # Close the progress bar
-        if progress:
-            progress_bar.close()  # type: ignore
-
-        return True
+        return _IngestChannel(
+            self.image["name"], self.image["dtype"], zslice_paths, shape, dataset
+        )
 
-    def upload_annotations(self, progress: bool = True) -> bool:
+    def _open_annotation_channels(self) -> List["_IngestChannel"]:
         """
-        Upload the annotations to the channel.
+        Get (or create) the arrays of the annotations.
 
-        Arguments:
-            progress (bool): Whether to show a progress bar.
+        The image channel must already exist, as it is the annotations'
+        source channel.
 
         Returns:
-            bool: Whether the upload was successful.
+            list[_IngestChannel]: The annotation channels.
 
         """
-        # Get the z-slice paths
-        zslice_paths = self._get_zslice_annotation_paths()
-
-        for anno_dict, paths in zip(self.annotations, zslice_paths):
+        channels = []
+        for anno_dict, paths in zip(
+            self.annotations, self._get_zslice_annotation_paths()
+        ):
 
             # Get the number of z-slices
             zslice_count = len(paths)
@@ -437,19 +688,6 @@ class ZSliceIngestJob:
             # Get the shape of the images
             shape = Image.open(paths[0]).size
 
-            # Get the number of images to upload per batch
-            batch_size = min(
-                self._get_permitted_zcount(anno_dict["dtype"]), self._max_batch_size
-            )
-            # Get the number of batches
-            batch_count = math.ceil(zslice_count / batch_size)
-
-            # Set the progress bar lambda
-            if progress:
-                progress_bar = tqdm(
-                    total=zslice_count, desc=f"Uploading channel [{anno_dict['name']}]"
-                )
-
             # Try making the array pointer. If it already exists, then make sure
             # that the shape is the same.
             boss_config_partial = (
@@ -480,68 +718,58 @@ class ZSliceIngestJob:
                     f"Array [{anno_dict['name']}] already exists, but has a different shape."
                 )
 
-            # Now break up the images into batches and upload them. First we'll do
-            # all of the batches of size `batch_size`, then we'll do the last batch
-            # (if it exists) which may be smaller than `batch_size` if the total
-            # number of z-slices is not divisible by `batch_size`.
-            for batch in range(batch_count):
-                # Get the start and end indices for the batch
-                start = batch * batch_size
-                end = min((batch + 1) * batch_size, zslice_count)
-
-                for _ in range(self._retries):
-                    try:
-                        batch_array = Parallel(n_jobs=-1)(
-                            delayed(Image.open)(path) for path in paths[start:end]
-                        )
-                        batch_array = np.stack(batch_array, axis=0).astype(
-                            anno_dict["dtype"]
-                        )
+            channels.append(
+                _IngestChannel(anno_dict["name"], anno_dict["dtype"], paths, shape, dataset)
+            )
+        return channels
 
-                        # Upload the batch
-                        dataset[start:end, 0 : shape[1], 0 : shape[0]] = batch_array
-                    except:
-                        # Wait a bit before trying again
-                        time.sleep(self._retry_wait)
-                    else:
-                        # if we get here, then the upload was successful
-                        break
-                else:
-                    # If we get here, then the upload failed
-                    warnings.warn(
-                        f"Failed to upload slices {start} to {end} of channel {self.image['name']} after {self._retries} retries."
-                    )
-                    return False
+    def upload_images(self, progress: bool = True) -> bool:
+        """
+        Upload the images to the channel.
 
-                # Update the progress bar
-                if progress:
-                    progress_bar.update(end - start)  # type: ignore
+        Arguments:
+            progress (bool): Whether to show a progress bar.
 
-            # Close the progress bar
-            if progress:
-                progress_bar.close()  # type: ignore
+        Returns:
+            bool: Whether the upload was successful.
 
-        return True
+        """
+        return all(self._upload_channels([self._open_image_channel()], progress))
 
-    def upload(self, progress: bool = True) -> bool:
+    def upload_annotations(self, progress: bool = True) -> bool:
         """
-        Upload the image and annotations to the channel.
+        Upload the annotations to their channels, side by side.
 
         Arguments:
-            progress (bool): Whether to show a progress bar.
+            progress (bool): Whether to show a progress bar per channel.
 
         Returns:
             bool: Whether the upload was successful.
 
         """
-        # Upload the image
-        self.upload_images(progress=progress)
+        channels = self._open_annotation_channels()
+        if not channels:
+            return True
+        return all(self._upload_channels(channels, progress))
 
-        if len(self.annotations) > 0:
-            # Upload the annotations
-            self.upload_annotations(progress=progress)
+    def upload(self, progress: bool = True) -> bool:
+        """
+        Upload the image and annotations to their channels.
 
-        return True
+        All the channels are uploaded side by side through one pipeline, so
+        the upload takes about as long as the largest channel rather than the
+        sum of all of them.
+
+        Arguments:
+            progress (bool): Whether to show a progress bar per channel.
+
+        Returns:
+            bool: Whether the upload was successful.
+
+        """
+        # The image channel is opened first, as it is the annotations' source
+        channels = [self._open_image_channel()] + self._open_annotation_channels()
+        return all(self._upload_channels(channels, progress))
 
 
 class VolumeProvider(abc.ABC):
@@ -568,6 +796,7 @@ class VolumeProvider(abc.ABC):
         xs: Tuple[int, int],
         ys: Tuple[int, int],
         zs: Tuple[int, int],
+        out: Optional[np.ndarray] = None,
     ) -> np.ndarray:
         ...
 
@@ -579,9 +808,31 @@ class VolumeProvider(abc.ABC):
         ys: Tuple[int, int],
         zs: Tuple[int, int],
         data,
+        journal=None,
     ):
         ...
 
+    def iter_cutout(
+        self,
+        channel: Resource,
+        resolution: int,
+        xs: Tuple[int, int],
+        ys: Tuple[int, int],
+        zs: Tuple[int, int],
+        block_size: Tuple[int, int, int],
+        parallel: Union[int, bool] = True,
+    ) -> Iterator[Tuple[List[List[int]], np.ndarray]]:
+        """
+        Yield ([xs, ys, zs], data) blocks covering a region.
+
+        Providers without a streaming endpoint fall back to one get_cutout
+        call per block, made one after another.
+        """
+        for block in cuboid_aligned_blocks(
+            xs, ys, zs, block_size=block_size, cuboid_size=(1, 1, 1)
+        ).tolist():
+            yield block, self.get_cutout(channel, resolution, *block)
+
     def get_vp_type(self) -> str:
         ...
 
@@ -611,15 +862,94 @@ class _BossDBVolumeProvider(VolumeProvider):
     convenience `array` can be easily stripped out. (The array module was
     originally a visitor from another Python package called `emboss`, so moving
     VolumeProvider endpoints back into the Remote API is an outstanding TODO.)
+
+    Arguments:
+        boss (BossRemote : None): The remote to use. Defaults to one configured
+            from ~/.intern/intern.cfg, or else the public bossDB.
+        cache (bool | str | int | DiskCache | MemoryCache : None): Cache the
+            cuboids of cutouts on disk or, given a byte budget, in memory (see
+            `BossRemote.cache`). If not given, the remote's cache is used, if
+            it has one.
+        metadata_ttl (float : 60): How many seconds the experiments and
+            coordinate frames behind `get_shape`, `get_voxel_size` etc. are
+            remembered for. None remembers them until `invalidate` is called;
+            0 disables the cache and fetches them every time.
     """
 
-    def __init__(self, boss: BossRemote = None):
+    def __init__(self, boss: BossRemote = None, cache=None, metadata_ttl=60):
         if boss is None:
             try:
-                boss = BossRemote()
+                boss = get_remote()
             except:
-                boss = BossRemote(_DEFAULT_BOSS_OPTIONS)
+                boss = get_remote(_DEFAULT_BOSS_OPTIONS)
         self.boss = boss
+        self.cache = open_cache(cache)
+        self.metadata_ttl = metadata_ttl
+        self._descriptors = {}
+        self._descriptors_lock = threading.Lock()
+
+    def _get_descriptor(self, resource):
+        """
+        Get an experiment or coordinate frame, remembered for `metadata_ttl`.
+        """
+        if self.metadata_ttl == 0:
+            return self.get_project(resource)
+        key = (type(resource).__name__, resource.get_route())
+        now = time.monotonic()
+        with self._descriptors_lock:
+            entry = self._descriptors.get(key)
+        if entry is not None and (entry[0] is None or now < entry[0]):
+            return entry[1]
+        # Fetch outside the lock, so that a slow request does not hold up
+        # read-ahead threads asking for other resources.
+        descriptor = self.get_project(resource)
+        expires = None if self.metadata_ttl is None else now + self.metadata_ttl
+        with self._descriptors_lock:
+            self._descriptors[key] = (expires, descriptor)
+        return descriptor
+
+    def _get_coord_frame(self, channel: ChannelResource):
+        experiment = self._get_experiment(channel)
+        return self._get_descriptor(CoordinateFrameResource(experiment.coord_frame))
+
+    def _get_experiment(self, channel: ChannelResource):
+        return self._get_descriptor(
+            ExperimentResource(channel.exp_name, channel.coll_name)
+        )
+
+    def invalidate(self):
+        """
+        Forget the experiments and coordinate frames fetched so far.
+
+        Call this after changing the extents or voxel size of a dataset
+        through another client.
+
+        Returns:
+            None
+
+        """
+        with self._descriptors_lock:
+            self._descriptors.clear()
+
+    def _get_cache(self):
+        if self.cache is not None:
+            return self.cache
+        return getattr(self.boss, "cache", None)
+
+    def _get_cache_bounds(self, channel: ChannelResource, resolution: int):
+        """
+        Get the XYZ bounds of a channel at a resolution, so that cuboids on the
+        edge of a cutout can be fetched whole and cached.
+
+        Bounds are rounded inward, so they never reach past the data.
+        """
+        cf = self._get_coord_frame(channel)
+        scale = 2**resolution
+        return [
+            [-(-cf.x_start // scale), cf.x_stop // scale],
+            [-(-cf.y_start // scale), cf.y_stop // scale],
+            [cf.z_start, cf.z_stop],
+        ]
 
     def get_vp_type(self) -> str:
         return "bossdb"
@@ -646,8 +976,16 @@ class _BossDBVolumeProvider(VolumeProvider):
         xs: Tuple[int, int],
         ys: Tuple[int, int],
         zs: Tuple[int, int],
+        out: Optional[np.ndarray] = None,
     ) -> np.ndarray:
-        return self.boss.get_cutout(channel, resolution, xs, ys, zs)
+        kwargs = {}
+        if out is not None:
+            kwargs["out"] = out
+        cache = self._get_cache()
+        if cache is not None:
+            kwargs["cache"] = cache
+            kwargs["cache_bounds"] = self._get_cache_bounds(channel, resolution)
+        return self.boss.get_cutout(channel, resolution, xs, ys, zs, **kwargs)
 
     def create_cutout(
         self,
@@ -657,18 +995,32 @@ class _BossDBVolumeProvider(VolumeProvider):
         ys: Tuple[int, int],
         zs: Tuple[int, int],
         data,
+        journal=None,
     ):
-        return self.boss.create_cutout(channel, resolution, xs, ys, zs, data)
+        kwargs = {}
+        if journal is not None:
+            kwargs["journal"] = journal
+        return self.boss.create_cutout(channel, resolution, xs, ys, zs, data, **kwargs)
+
+    def iter_cutout(
+        self,
+        channel: ChannelResource,
+        resolution: int,
+        xs: Tuple[int, int],
+        ys: Tuple[int, int],
+        zs: Tuple[int, int],
+        block_size: Tuple[int, int, int],
+        parallel: Union[int, bool] = True,
+    ) -> Iterator[Tuple[List[List[int]], np.ndarray]]:
+        return self.boss.iter_cutout(
+            channel, resolution, xs, ys, zs, chunk_size=block_size, parallel=parallel
+        )
 
     def get_shape(
         self, channel: ChannelResource, resolution: int = 0
     ) -> Tuple[int, int, int]:
-        # Get the experiment:
-        experiment = self.get_project(
-            ExperimentResource(channel.exp_name, channel.coll_name)
-        )
         # Get the coordinate frame:
-        cf = self.get_project(CoordinateFrameResource(experiment.coord_frame))
+        cf = self._get_coord_frame(channel)
 
         # Return the bounds of the coordinate frame:
         return (
@@ -680,28 +1032,20 @@ class _BossDBVolumeProvider(VolumeProvider):
     def get_voxel_size(
         self, channel: ChannelResource, resolution: int = 0
     ) -> Tuple[float, float, float]:
-        experiment = self.get_project(
-            ExperimentResource(channel.exp_name, channel.coll_name)
-        )
         # Get the coordinate frame:
-        cf = self.get_project(CoordinateFrameResource(experiment.coord_frame))
+        cf = self._get_coord_frame(channel)
         return tuple(
             dimension * (2**resolution)
             for dimension in (cf.x_voxel_size, cf.y_voxel_size, cf.z_voxel_size)
         )
 
     def get_voxel_unit(self, channel: ChannelResource, resolution: int = 0) -> str:
-        experiment = self.get_project(
-            ExperimentResource(channel.exp_name, channel.coll_name)
-        )
         # Get the coordinate frame:
-        cf = self.get_project(CoordinateFrameResource(experiment.coord_frame))
+        cf = self._get_coord_frame(channel)
         return cf.voxel_unit
 
     def get_available_resolutions(self, channel: Resource) -> List[int]:
-        experiment = self.get_project(
-            ExperimentResource(channel.exp_name, channel.coll_name)
-        )
+        experiment = self._get_experiment(channel)
         return list(range(experiment.num_hierarchy_levels))
 
 
@@ -761,8 +1105,13 @@ if HAS_CLOUDVOLUME:
             xs: Tuple[int, int],
             ys: Tuple[int, int],
             zs: Tuple[int, int],
+            out: Optional[np.ndarray] = None,
         ) -> np.ndarray:
-            return self._cv.get_cutout(uri, resolution, zs, ys, xs)
+            cutout = self._cv.get_cutout(uri, resolution, zs, ys, xs)
+            if out is None:
+                return cutout
+            out[...] = cutout
+            return out
 
         def get_shape(
             self, channel: CloudVolumeResource, resolution: int = 0
@@ -781,6 +1130,64 @@ if HAS_CLOUDVOLUME:
             return list(channel.cloudvolume.available_mips)
 
 
+def _read_image_window(
+    path: pathlib.Path, xs: Tuple[int, int], ys: Tuple[int, int]
+) -> np.ndarray:
+    """
+    Read a window of a single-channel 2D image.
+
+    Tiled TIFFs are read with tifffile (if it is installed), which reads and
+    decodes only the tiles that overlap the window. Other images are decoded
+    in full and cropped.
+
+    Arguments:
+        path (pathlib.Path): The image file.
+        xs (tuple[int, int]): The x range of the window.
+        ys (tuple[int, int]): The y range of the window.
+
+    Returns:
+        np.ndarray: The window, in YX order.
+
+    """
+    if HAS_TIFFFILE and path.suffix.lower() in (".tif", ".tiff"):
+        with tifffile.TiffFile(path) as tif:
+            page = tif.pages[0]
+            if (
+                page.is_tiled
+                and page.samplesperpixel == 1
+                and page.imagedepth == 1
+                and page.tiledepth == 1
+            ):
+                return _read_tiff_window(tif.filehandle, page, xs, ys)
+
+    image = Image.open(path)
+    if (tuple(xs), tuple(ys)) != ((0, image.size[0]), (0, image.size[1])):
+        image = image.crop((xs[0], ys[0], xs[1], ys[1]))
+    return np.asarray(image)
+
+
+def _read_tiff_window(fh, page, xs: Tuple[int, int], ys: Tuple[int, int]):
+    # Decode only the tiles of a tiled TIFF page that overlap the window.
+    out = np.empty((ys[1] - ys[0], xs[1] - xs[0]), dtype=page.dtype)
+    tiles_across = -(-page.imagewidth // page.tilewidth)
+    for ty in range(ys[0] // page.tilelength, -(-ys[1] // page.tilelength)):
+        for tx in range(xs[0] // page.tilewidth, -(-xs[1] // page.tilewidth)):
+            index = ty * tiles_across + tx
+            fh.seek(page.dataoffsets[index])
+            segment, _, _ = page.decode(
+                fh.read(page.databytecounts[index]), index, jpegtables=page.jpegtables
+            )
+            # Segments are (..., length, width, samples):
+            tile = segment.reshape(segment.shape[-3], segment.shape[-2])
+            y0, x0 = ty * page.tilelength, tx * page.tilewidth
+            ya, yb = max(ys[0], y0), min(ys[1], y0 + tile.shape[0])
+            xa, xb = max(xs[0], x0), min(xs[1], x0 + tile.shape[1])
+            out[ya - ys[0] : yb - ys[0], xa - xs[0] : xb - xs[0]] = tile[
+                ya - y0 : yb - y0, xa - x0 : xb - x0
+            ]
+    return out
+
+
 def _construct_boss_url(boss, col, exp, chan, res, xs, ys, zs) -> str:
     # TODO: use boss host
     return f"https://api.theboss.io/v1/cutout/{col}/{exp}/{chan}/{res}/{xs[0]}:{xs[1]}/{ys[0]}:{ys[1]}/{zs[0]}:{zs[1]}"
@@ -830,7 +1237,7 @@ class AxisOrder:
 
 class Metadata:
     def __init__(self, resource: Union[BossResource, str], remote: BossRemote = None):
-        self._remote = remote or BossRemote(_DEFAULT_BOSS_OPTIONS)
+        self._remote = remote or get_remote(_DEFAULT_BOSS_OPTIONS)
         if isinstance(resource, str):
             resource = resource.split("://")[-1]
             path_items = resource.split("/")
@@ -948,6 +1355,134 @@ def _infer_volume_provider(channel: Union[ChannelResource, str, Tuple]):
     return None
 
 
+class _ReadAhead:
+    """
+    Prefetch cuboid-aligned slabs ahead of a monotonic scan through an array.
+
+    Successive reads that share their extents on two axes and move forward
+    (or backward) along the third are a scan, like `for z in range(n):
+    data[z]`. While the caller works on one read, the next `depth` slabs
+    along the scan axis, each one cuboid thick and with the read's extents
+    on the other two axes, are fetched in background threads. The fetches
+    only warm the volume provider's cache; a read waits for any prefetch of
+    an overlapping region before it starts, so nothing is fetched twice.
+
+    The threads are started on the first prefetch and stopped by `close`.
+
+    Arguments:
+        fetch (Callable): Function of the x, y and z ranges of a slab that
+            downloads it into the cache.
+        get_bounds (Callable): Function returning the XYZ extents of the
+            array, called the first time a scan is detected.
+        depth (int): Number of slabs to keep ahead of the scan.
+        cuboid_size (Tuple[int, int, int]): XYZ thickness of the slabs.
+
+    """
+
+    def __init__(self, fetch, get_bounds, depth: int, cuboid_size=CUBOID_SIZE):
+        if depth < 1:
+            raise ValueError("read_ahead must be at least 1.")
+        self._fetch = fetch
+        self._get_bounds = get_bounds
+        self._bounds = None
+        self.depth = depth
+        self.cuboid_size = cuboid_size
+        self._executor = None
+        self._pending = {}
+        self._last = None
+        self._scan = None
+        self._frontier = None
+
+    def observe(self, region: Tuple[Tuple[int, int], ...]):
+        """
+        Record a read of the XYZ `region`, and prefetch ahead if it continues
+        a scan. Blocks until prefetches overlapping the region are done.
+        """
+        region = tuple(tuple(rng) for rng in region)
+        self.wait(region)
+
+        axis, step = self._detect(region)
+        self._last = region
+        if axis is None:
+            self._scan = None
+            return
+        scan = (axis, step) + tuple(region[i] for i in range(3) if i != axis)
+        if scan != self._scan:
+            self._scan = scan
+            self._frontier = None
+
+        if self._bounds is None:
+            self._bounds = self._get_bounds()
+        size = self.cuboid_size[axis]
+        limit = self._bounds[axis]
+        if step > 0:
+            start = -(-region[axis][1] // size) * size
+            stop = min(limit, start + self.depth * size)
+            if self._frontier is not None:
+                start = max(start, self._frontier)
+            slabs = [(i, min(i + size, limit)) for i in range(start, stop, size)]
+            self._frontier = max(start, stop)
+        else:
+            stop = region[axis][0] // size * size
+            start = max(0, stop - self.depth * size)
+            if self._frontier is not None:
+                stop = min(stop, self._frontier)
+            slabs = [(max(i - size, 0), i) for i in range(stop, start, -size)]
+            self._frontier = min(start, stop)
+
+        if slabs and self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.depth, thread_name_prefix="intern-readahead"
+            )
+        for slab in slabs:
+            key = region[:axis] + (slab,) + region[axis + 1 :]
+            self._pending[key] = self._executor.submit(self._fetch, *key)
+
+    def wait(self, region: Optional[Tuple[Tuple[int, int], ...]] = None):
+        """
+        Wait for the prefetches that overlap `region` (or for all of them).
+        Prefetch errors are ignored: the read itself will report them.
+        """
+        overlapping = [
+            key
+            for key in self._pending
+            if region is None
+            or all(k[0] < r[1] and r[0] < k[1] for k, r in zip(key, region))
+        ]
+        wait([self._pending[key] for key in overlapping])
+        for key in list(self._pending):
+            if self._pending[key].done():
+                del self._pending[key]
+
+    def close(self):
+        """
+        Cancel the prefetches that have not started and stop the threads.
+        Prefetches already running are left to finish in the background.
+        A later read starts the threads again.
+        """
+        for future in self._pending.values():
+            future.cancel()
+        self._pending = {}
+        self._scan = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _detect(self, region):
+        last = self._last
+        if last is None:
+            return None, None
+        moved = [i for i in range(3) if region[i] != last[i]]
+        if len(moved) != 1:
+            return None, None
+        axis = moved[0]
+        if region[axis][0] > last[axis][0] and region[axis][1] > last[axis][1]:
+            return axis, 1
+        if region[axis][0] < last[axis][0] and region[axis][1] < last[axis][1]:
+            return axis, -1
+        return None, None
+
+
 class array:
     """
     An intern/bossDB-backed numpy array.
@@ -959,6 +1494,12 @@ class array:
     Data are downloaded when a request is made. This means that even "simple"
     commands like `array#[:]sum()` are very network-heavy (don't do this!).
 
+    The experiment and coordinate frame behind `shape`, `voxel_size` etc. are
+    fetched once and remembered for 60 seconds by the default bossDB volume
+    provider, so changes made through another client may take that long to
+    show up. Pass `volume_provider=_BossDBVolumeProvider(metadata_ttl=...)` to
+    change this (0 disables it), or call its `invalidate()`.
+
     Examples:
 
     >>> import intern.array
@@ -987,6 +1528,8 @@ class array:
         experiment_desc: Optional[str] = None,
         source_channel: Optional[str] = None,
         boss_config: Optional[dict] = None,
+        cache=None,
+        read_ahead: int = 0,
     ) -> None:
         """
         Construct a new intern-backed array.
@@ -1035,7 +1578,22 @@ class array:
             boss_config (Optional[dict]): The BossRemote configuration dict to
                 use in order to authenticate with a BossDB remote. This option
                 is mutually exclusive with the VolumeProvider configuration. If
-                the `volume_provider` arg is set, this will be ignored.
+                the `volume_provider` arg is set, this will be ignored. Arrays
+                of the same configuration share one remote (see
+                `intern.convenience.uri.get_remote`).
+            cache (Optional[int | str | bool | object]): Cache downloaded
+                cuboids, so that overlapping slices (e.g. `data[100:110]` and
+                then `data[105:115]`) only fetch the cuboids they do not share.
+                An int is the byte budget of an in-memory cache of compressed
+                cuboids; a path or True selects an on-disk cache; a
+                MemoryCache or DiskCache is used as is. Replaces the volume
+                provider's cache. Only supported by bossDB volume providers.
+            read_ahead (int: 0): When reads scan monotonically along an axis
+                (e.g. `for z in range(n): data[z]`), prefetch this many
+                cuboid-thick slabs ahead of the scan in background threads.
+                Prefetched data lands in the cache; if there is none, a
+                MemoryCache is created. Only supported by bossDB volume
+                providers. See `close`.
 
         """
         self.axis_order = axis_order
@@ -1044,13 +1602,32 @@ class array:
         volume_provider = volume_provider or _infer_volume_provider(channel)
         if volume_provider is None:
             if boss_config:
-                volume_provider = _BossDBVolumeProvider(BossRemote(boss_config))
+                volume_provider = _BossDBVolumeProvider(get_remote(boss_config))
             else:
                 volume_provider = _BossDBVolumeProvider()
 
         # Handle custom Remote:
         self.volume_provider = volume_provider
 
+        if cache is not None:
+            if not hasattr(self.volume_provider, "cache"):
+                raise ValueError(
+                    f"The {self.volume_provider.get_vp_type()} volume provider does not support caching."
+                )
+            self.volume_provider.cache = open_cache(cache)
+
+        self._read_ahead = None
+        if read_ahead:
+            if not hasattr(self.volume_provider, "cache"):
+                raise ValueError(
+                    f"The {self.volume_provider.get_vp_type()} volume provider does not support read-ahead."
+                )
+            if self.volume_provider.cache is None:
+                self.volume_provider.cache = MemoryCache()
+            self._read_ahead = _ReadAhead(
+                self._prefetch, self._xyz_bounds, read_ahead
+            )
+
         if create_new:
 
             if self.volume_provider.get_vp_type() != "bossdb":
@@ -1175,7 +1752,34 @@ class array:
         self.channel_name = self._channel.name
 
         # Create a pointer to the metadata for the channel.
-        self._channel_metadata = Metadata(self._channel)
+        self._channel_metadata = Metadata(
+            self._channel, remote=getattr(self.volume_provider, "boss", None)
+        )
+
+    def close(self) -> None:
+        """
+        Stop the read-ahead threads, if any, cancelling queued prefetches.
+
+        The array can still be read afterwards; a scan starts the threads
+        again. Arrays also close themselves when used as a context manager
+        or garbage-collected.
+
+        Returns:
+            None
+
+        """
+        read_ahead = getattr(self, "_read_ahead", None)
+        if read_ahead is not None:
+            read_ahead.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        self.close()
 
     @property
     def remote(self):
@@ -1342,6 +1946,17 @@ class array:
         if self.axis_order != self.volume_provider.get_axis_order():
             key = (key[2], key[1], key[0])
 
+        # The key is now in the provider's axis order, so open-ended indices
+        # are bounded by the provider's shape. Only look it up if needed:
+        _provider_shape = []
+
+        def provider_extent(axis: int) -> int:
+            if not _provider_shape:
+                _provider_shape.extend(
+                    self.volume_provider.get_shape(self._channel, self.resolution)
+                )
+            return _provider_shape[axis]
+
         # Now we can begin. There is a wide variety of indexing options
         # available, including single-integer indexing, tuple-of-slices
         # indexing, tuple-of-int indexing...
@@ -1355,8 +1970,8 @@ class array:
         # We will get the full XY extents and download a single 2D array:
         if isinstance(key, int) and permit_single_int:
             # Get the full Z slice:
-            xs = (0, self.shape[2])
-            ys = (0, self.shape[1])
+            xs = (0, provider_extent(2))
+            ys = (0, provider_extent(1))
             zs = (key, key + 1)
         else:
             # We also support indexing with units. For example, you can ask for
@@ -1391,7 +2006,7 @@ class array:
                 # (The user is requesting an array with more than one slice
                 # in this dimension.)
                 start = key[2].start if key[2].start else 0
-                stop = key[2].stop if key[2].stop else self.shape[0]
+                stop = key[2].stop if key[2].stop else provider_extent(2)
 
                 start = int(start / _normalize_units[0])
                 stop = int(stop / _normalize_units[0])
@@ -1405,7 +2020,7 @@ class array:
                 ys = (key[1], key[1] + 1)
             else:
                 start = key[1].start if key[1].start else 0
-                stop = key[1].stop if key[1].stop else self.shape[1]
+                stop = key[1].stop if key[1].stop else provider_extent(1)
 
                 start = start / _normalize_units[1]
                 stop = stop / _normalize_units[1]
@@ -1418,7 +2033,7 @@ class array:
                 zs = (key[0], key[0] + 1)
             else:
                 start = key[0].start if key[0].start else 0
-                stop = key[0].stop if key[0].stop else self.shape[2]
+                stop = key[0].stop if key[0].stop else provider_extent(0)
 
                 start = start / _normalize_units[2]
                 stop = stop / _normalize_units[2]
@@ -1439,11 +2054,53 @@ class array:
 
             myarray[1, 1:100, 2]
 
+        """
+        return self.read(key)
+
+    def read(self, key: Tuple, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Get a subarray or subvolume, optionally downloading into `out`.
+
+        This is the same as `array[key]`, but the data can be written straight
+        into a caller-provided buffer instead of a newly allocated array. Use a
+        `np.memmap` to download cutouts that are larger than RAM, or an array
+        backed by `multiprocessing.shared_memory` to share the result between
+        processes without pickling it.
+
+        Examples:
+
+        >>> out = np.lib.format.open_memmap(
+        ...     "cutout.npy", mode="w+", dtype=data.dtype, shape=(64, 4096, 4096)
+        ... )
+        >>> data.read((slice(0, 64), slice(0, 4096), slice(0, 4096)), out=out)
+
+        Arguments:
+            key (Tuple): The region to read, indexed as in `array[key]`.
+            out (np.ndarray): A writable array with the shape and dtype that
+                `array[key]` would return. Single-index axes may be kept with
+                length 1 or dropped.
+
+        Returns:
+            np.ndarray: The requested data (`out`, if it was provided).
+
         """
         xs, ys, zs = self._normalize_key(key=key)
+        if self._read_ahead is not None:
+            self._read_ahead.observe((xs, ys, zs))
 
         # Finally, we can perform the cutout itself, using the x, y, and z
         # coordinates that we computed in the previous step.
+        if out is not None:
+            self.volume_provider.get_cutout(
+                self._channel,
+                self.resolution,
+                xs,
+                ys,
+                zs,
+                out=self._provider_view(out, xs, ys, zs),
+            )
+            return out
+
         cutout = self.volume_provider.get_cutout(
             self._channel, self.resolution, xs, ys, zs
         )
@@ -1468,6 +2125,103 @@ class array:
             data = data[:, :, 0]
         return data
 
+    def _prefetch(
+        self, xs: Tuple[int, int], ys: Tuple[int, int], zs: Tuple[int, int]
+    ):
+        # The cutout is discarded; fetching it is enough to fill the cache.
+        self.volume_provider.get_cutout(self._channel, self.resolution, xs, ys, zs)
+
+    def _xyz_bounds(self) -> Tuple[int, int, int]:
+        return tuple(
+            reversed(self.volume_provider.get_shape(self._channel, self.resolution))
+        )
+
+    def _provider_view(
+        self,
+        out: np.ndarray,
+        xs: Tuple[int, int],
+        ys: Tuple[int, int],
+        zs: Tuple[int, int],
+    ) -> np.ndarray:
+        """
+        Get a view of `out` in the volume provider's 3D axis order.
+
+        Raises:
+            ValueError: If `out` cannot hold the region.
+
+        """
+        extents = (xs[1] - xs[0], ys[1] - ys[0], zs[1] - zs[0])
+        if self.axis_order == AxisOrder.ZYX:
+            extents = extents[::-1]
+
+        view = out
+        if view.ndim < 3:
+            # Restore the axes that `array[key]` would have flattened:
+            view = np.expand_dims(
+                view, tuple(i for i, n in enumerate(extents) if n == 1)
+            )
+        if view.shape != extents:
+            raise ValueError(
+                f"out has shape {out.shape} but the requested region has shape {extents}."
+            )
+
+        if self.axis_order != self.volume_provider.get_axis_order():
+            view = np.swapaxes(view, 0, 2)
+        return view
+
+    def iter_blocks(
+        self,
+        block_shape: Optional[Tuple[int, int, int]] = None,
+        key: Optional[Tuple] = None,
+        parallel: Union[int, bool] = True,
+    ) -> Iterator[Tuple[Tuple[slice, slice, slice], np.ndarray]]:
+        """
+        Iterate over the array (or a region of it) one block at a time.
+
+        Blocks are yielded as soon as they are downloaded, so memory use is
+        bounded by the number of requests in flight rather than by the size
+        of the region. On bossDB, the block shape is rounded up to a whole
+        number of 512x512x16 cuboids.
+
+        Examples:
+
+        >>> data = array("bossdb://collection/experiment/channel")
+        >>> for bbox, block in data.iter_blocks((64, 1024, 1024)):
+        ...     result[bbox] = process(block)
+
+        Arguments:
+            block_shape (Tuple[int, int, int]): The shape of each block, in the
+                axis order of this array. Defaults to the provider's preferred
+                chunk size.
+            key (Tuple): An optional region to iterate over, indexed as in
+                `array[key]`. Defaults to the whole array.
+            parallel (Union[int, bool]: True): The number of blocks to keep
+                in flight at once.
+
+        Yields:
+            Tuple[Tuple[slice, slice, slice], np.ndarray]: The location of the
+                block in the array, and its data, in this array's axis order.
+
+        """
+        key = key or (slice(None), slice(None), slice(None))
+        xs, ys, zs = self._normalize_key(key=key, permit_single_int=False)
+
+        if block_shape is None:
+            block_size = (512, 512, 16 * 6)
+        elif self.axis_order == self.volume_provider.get_axis_order():
+            block_size = (block_shape[2], block_shape[1], block_shape[0])
+        else:
+            block_size = tuple(block_shape)
+
+        for block, cutout in self.volume_provider.iter_cutout(
+            self._channel, self.resolution, xs, ys, zs, block_size, parallel
+        ):
+            bbox = tuple(slice(start, stop) for start, stop in reversed(block))
+            if self.axis_order != self.volume_provider.get_axis_order():
+                bbox = bbox[::-1]
+                cutout = np.swapaxes(cutout, 0, 2)
+            yield bbox, cutout
+
     def __setitem__(self, key: Tuple, value: np.ndarray) -> None:
         """
         Set a subarray or subvolume.
@@ -1482,16 +2236,49 @@ class array:
 
         Start-only (`10:`) or stop-only (`:10`) indexing is unsupported.
         """
+        self.write(key, value)
+
+    def write(self, key: Tuple, value: np.ndarray, journal=None) -> None:
+        """
+        Set a subarray or subvolume, optionally resuming an interrupted write.
+
+        This is the same as `array[key] = value`, but with a `journal`, each
+        block of a large write is recorded once it is uploaded. If the write
+        fails or the process is killed, call `write` again with the same
+        arguments and journal to upload only the blocks that are missing.
+
+        Examples:
+
+        >>> data.write(
+        ...     (slice(0, 64), slice(0, 8192), slice(0, 8192)),
+        ...     volume,
+        ...     journal="upload.journal",
+        ... )
+
+        Arguments:
+            key (Tuple): The region to write, indexed as in `array[key]`.
+            value (np.ndarray): The data to write.
+            journal (str | UploadJournal : None): An upload journal, or the
+                path of its file. Only supported by bossDB volume providers.
 
+        Returns:
+            None
+
+        """
         xs, ys, zs = self._normalize_key(key=key, permit_single_int=False)
 
         if len(value.shape) == 2:
             # TODO: Support other 2D shapes as well
             value = np.array([value])
 
-        self.volume_provider.create_cutout(
-            self._channel, self.resolution, xs, ys, zs, value
-        )
+        if journal is None:
+            self.volume_provider.create_cutout(
+                self._channel, self.resolution, xs, ys, zs, value
+            )
+        else:
+            self.volume_provider.create_cutout(
+                self._channel, self.resolution, xs, ys, zs, value, journal=journal
+            )
 
 
 def arrays_from_neuroglancer(url: str):
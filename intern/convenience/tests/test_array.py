@@ -0,0 +1,467 @@
+import os
+import pathlib
+import tempfile
+import unittest
+import threading
+from unittest.mock import Mock, call, patch
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from PIL import Image
+
+from intern.convenience.array import (
+    VolumeProvider,
+    AxisOrder,
+    array,
+    HAS_TIFFFILE,
+    ZSliceIngestJob,
+    _BossDBVolumeProvider,
+    _read_image_window,
+)
+from intern.utils.cache import MemoryCache
+from intern.resource.boss.resource import ChannelResource
+
+
+class InMemoryVolumeProvider(VolumeProvider):
+    """
+    A VolumeProvider backed by a local ZYX numpy array, which records every
+    cutout it is asked for.
+    """
+
+    def __init__(self, volume: np.ndarray):
+        self.volume = volume
+        self.requests = []
+
+    def get_vp_type(self) -> str:
+        return "bossdb"
+
+    def get_axis_order(self) -> str:
+        return AxisOrder.ZYX
+
+    def get_shape(self, channel, resolution=0):
+        return self.volume.shape
+
+    def get_cutout(self, channel, resolution, xs, ys, zs, out=None):
+        self.requests.append((tuple(xs), tuple(ys), tuple(zs)))
+        cutout = self.volume[zs[0] : zs[1], ys[0] : ys[1], xs[0] : xs[1]]
+        if out is None:
+            return cutout.copy()
+        out[...] = cutout
+        return out
+
+    def create_cutout(self, channel, resolution, xs, ys, zs, data):
+        self.requests.append((tuple(xs), tuple(ys), tuple(zs)))
+        self.volume[zs[0] : zs[1], ys[0] : ys[1], xs[0] : xs[1]] = data
+
+
+def make_array(volume: np.ndarray, **kwargs) -> array:
+    channel = ChannelResource(
+        "chan", "coll", "exp", "image", datatype=str(volume.dtype)
+    )
+    return array(channel, volume_provider=InMemoryVolumeProvider(volume), **kwargs)
+
+
+class TestArrayIterBlocks(unittest.TestCase):
+    def setUp(self):
+        self.volume = np.random.randint(0, 255, (20, 30, 40), dtype="uint8")
+
+    def test_blocks_cover_array(self):
+        data = make_array(self.volume)
+        result = np.zeros_like(self.volume)
+        for bbox, block in data.iter_blocks((8, 16, 16)):
+            self.assertTrue(block.shape[0] <= 8 and block.shape[1] <= 16)
+            result[bbox] = block
+        np.testing.assert_array_equal(self.volume, result)
+        self.assertEqual(3 * 2 * 3, len(data.volume_provider.requests))
+
+    def test_blocks_of_region(self):
+        data = make_array(self.volume)
+        result = np.zeros_like(self.volume)
+        for bbox, block in data.iter_blocks((8, 16, 16), key=(slice(2, 10), slice(0, 30), slice(5, 20))):
+            result[bbox] = block
+        np.testing.assert_array_equal(self.volume[2:10, :, 5:20], result[2:10, :, 5:20])
+        self.assertEqual(0, result[10:].sum())
+
+    def test_blocks_xyz_order(self):
+        data = make_array(self.volume, axis_order=AxisOrder.XYZ)
+        result = np.zeros(self.volume.shape[::-1], dtype=self.volume.dtype)
+        for bbox, block in data.iter_blocks((16, 16, 8)):
+            result[bbox] = block
+        np.testing.assert_array_equal(np.swapaxes(self.volume, 0, 2), result)
+
+
+class TestArrayRead(unittest.TestCase):
+    def setUp(self):
+        self.volume = np.random.randint(0, 255, (20, 30, 40), dtype="uint8")
+
+    def test_read_matches_getitem(self):
+        data = make_array(self.volume)
+        np.testing.assert_array_equal(
+            data[2:10, 5:25, 0:40], data.read((slice(2, 10), slice(5, 25), slice(0, 40)))
+        )
+
+    def test_read_into_memmap(self):
+        data = make_array(self.volume)
+        with tempfile.TemporaryDirectory() as tmp:
+            out = np.lib.format.open_memmap(
+                os.path.join(tmp, "cutout.npy"), mode="w+", dtype="uint8", shape=(8, 20, 40)
+            )
+            result = data.read((slice(2, 10), slice(5, 25), slice(0, 40)), out=out)
+            self.assertIs(out, result)
+            np.testing.assert_array_equal(self.volume[2:10, 5:25, :], out)
+            del out, result
+
+    def test_read_into_flattened_slice(self):
+        data = make_array(self.volume)
+        out = np.zeros((30, 40), dtype="uint8")
+        data.read((3, slice(0, 30), slice(0, 40)), out=out)
+        np.testing.assert_array_equal(self.volume[3], out)
+
+    def test_read_xyz_order(self):
+        data = make_array(self.volume, axis_order=AxisOrder.XYZ)
+        out = np.zeros((40, 30, 20), dtype="uint8")
+        data.read((slice(0, 40), slice(0, 30), slice(0, 20)), out=out)
+        np.testing.assert_array_equal(np.swapaxes(self.volume, 0, 2), out)
+
+    def test_read_wrong_shape(self):
+        data = make_array(self.volume)
+        with self.assertRaises(ValueError):
+            data.read((slice(0, 10), slice(0, 30), slice(0, 40)), out=np.zeros((10, 30, 30)))
+
+
+class TestArrayCache(unittest.TestCase):
+    def test_cache_budget_sets_provider_cache(self):
+        channel = ChannelResource("chan", "coll", "exp", "image", datatype="uint8")
+        provider = _BossDBVolumeProvider(boss=Mock())
+        data = array(channel, volume_provider=provider, cache=1024 * 1024)
+        self.assertIsInstance(provider.cache, MemoryCache)
+        self.assertEqual(1024 * 1024, data.volume_provider.cache.max_bytes)
+
+    def test_cache_unsupported_provider(self):
+        with self.assertRaises(ValueError):
+            make_array(np.zeros((4, 4, 4), dtype="uint8"), cache=1024)
+
+
+class TestArrayMetadata(unittest.TestCase):
+    def test_metadata_uses_provider_remote(self):
+        channel = ChannelResource("chan", "coll", "exp", "image", datatype="uint8")
+        boss = Mock()
+        data = array(channel, volume_provider=_BossDBVolumeProvider(boss=boss))
+        self.assertIs(boss, data.metadata._remote)
+
+
+class TestArrayWrite(unittest.TestCase):
+    def test_write_matches_setitem(self):
+        data = make_array(np.zeros((4, 8, 8), dtype="uint8"))
+        value = np.random.randint(1, 255, (2, 8, 4), dtype="uint8")
+        data.write((slice(0, 2), slice(0, 8), slice(4, 8)), value)
+        np.testing.assert_array_equal(value, data.volume_provider.volume[0:2, :, 4:8])
+
+    def test_journal_is_passed_to_boss(self):
+        boss = Mock()
+        provider = _BossDBVolumeProvider(boss=boss)
+        channel = ChannelResource("chan", "coll", "exp", "image", datatype="uint8")
+        value = np.zeros((1, 1, 1), dtype="uint8")
+        provider.create_cutout(channel, 0, (0, 1), (0, 1), (0, 1), value)
+        boss.create_cutout.assert_called_with(channel, 0, (0, 1), (0, 1), (0, 1), value)
+        provider.create_cutout(
+            channel, 0, (0, 1), (0, 1), (0, 1), value, journal="upload.journal"
+        )
+        boss.create_cutout.assert_called_with(
+            channel, 0, (0, 1), (0, 1), (0, 1), value, journal="upload.journal"
+        )
+
+
+class TestBossDBVolumeProviderMetadata(unittest.TestCase):
+    def setUp(self):
+        self.boss = Mock()
+        self.boss.get_project.side_effect = self.get_project
+        self.channel = ChannelResource("chan", "coll", "exp", "image", datatype="uint8")
+
+    def get_project(self, resource):
+        if resource.get_route() == "coll/experiment/exp":
+            return Mock(coord_frame="frame", num_hierarchy_levels=3)
+        return Mock(
+            x_start=0, x_stop=1024, y_start=0, y_stop=512, z_start=0, z_stop=16,
+            x_voxel_size=4, y_voxel_size=4, z_voxel_size=40, voxel_unit="nanometers",
+        )
+
+    def test_descriptors_are_cached(self):
+        provider = _BossDBVolumeProvider(boss=self.boss)
+        self.assertEqual((16, 256, 512), provider.get_shape(self.channel, 1))
+        self.assertEqual((8, 8, 80), provider.get_voxel_size(self.channel, 1))
+        self.assertEqual("nanometers", provider.get_voxel_unit(self.channel))
+        self.assertEqual([0, 1, 2], provider.get_available_resolutions(self.channel))
+        self.assertEqual(2, self.boss.get_project.call_count)
+
+        provider.invalidate()
+        provider.get_shape(self.channel)
+        self.assertEqual(4, self.boss.get_project.call_count)
+
+    def test_zero_ttl_disables_the_cache(self):
+        provider = _BossDBVolumeProvider(boss=self.boss, metadata_ttl=0)
+        provider.get_shape(self.channel)
+        provider.get_shape(self.channel)
+        self.assertEqual(4, self.boss.get_project.call_count)
+        self.assertEqual({}, provider._descriptors)
+
+    def test_descriptors_are_shared_across_threads(self):
+        provider = _BossDBVolumeProvider(boss=self.boss, metadata_ttl=None)
+        with ThreadPoolExecutor(8) as pool:
+            shapes = list(pool.map(
+                lambda _: provider.get_shape(self.channel), range(64)))
+        self.assertEqual([(16, 512, 1024)] * 64, shapes)
+        self.assertEqual(2, len(provider._descriptors))
+
+
+class CachingVolumeProvider(InMemoryVolumeProvider):
+    """An InMemoryVolumeProvider that accepts a cache, as bossDB ones do."""
+
+    cache = None
+
+
+class TestArrayReadAhead(unittest.TestCase):
+    def setUp(self):
+        self.volume = np.random.randint(0, 255, (64, 32, 32), dtype="uint8")
+        self.provider = CachingVolumeProvider(self.volume)
+        channel = ChannelResource("chan", "coll", "exp", "image", datatype="uint8")
+        self.data = array(channel, volume_provider=self.provider, read_ahead=2)
+
+    def test_z_scan_prefetches_next_slabs(self):
+        for z in range(3):
+            np.testing.assert_array_equal(self.volume[z], self.data[z])
+        self.data._read_ahead.wait()
+
+        self.assertIsInstance(self.provider.cache, MemoryCache)
+        for slab in [(16, 32), (32, 48)]:
+            self.assertIn(((0, 32), (0, 32), slab), self.provider.requests)
+        # Slabs are only prefetched once per scan:
+        self.assertEqual(2 + 3, len(self.provider.requests))
+
+    def test_backward_scan(self):
+        for z in (40, 39):
+            self.data[z, 0:8, :]
+        self.data._read_ahead.wait()
+        for slab in [(16, 32), (0, 16)]:
+            self.assertIn(((0, 32), (0, 8), slab), self.provider.requests)
+
+    def test_random_access_does_not_prefetch(self):
+        self.data[5]
+        self.data[3:10, 0:4, 0:4]
+        self.data[40]
+        self.data._read_ahead.wait()
+        self.assertEqual(3, len(self.provider.requests))
+
+    def test_close_stops_threads(self):
+        with self.data as data:
+            for z in range(2):
+                data[z]
+            executor = data._read_ahead._executor
+            self.assertIsNotNone(executor)
+        self.assertIsNone(self.data._read_ahead._executor)
+        self.assertEqual({}, self.data._read_ahead._pending)
+        with self.assertRaises(RuntimeError):
+            executor.submit(print)
+
+        # Reads still work, and restart read-ahead:
+        for z in range(2, 4):
+            np.testing.assert_array_equal(self.volume[z], self.data[z])
+        self.assertIsNotNone(self.data._read_ahead._executor)
+        self.data.close()
+
+    def test_no_threads_without_a_scan(self):
+        self.data[5]
+        self.assertIsNone(self.data._read_ahead._executor)
+
+    def test_read_ahead_unsupported_provider(self):
+        with self.assertRaises(ValueError):
+            make_array(self.volume, read_ahead=2)
+
+
+class RecordingDataset:
+    """A stand-in for an ingest job's destination array."""
+
+    def __init__(self, shape, dtype):
+        self.volume = np.zeros(shape, dtype=dtype)
+        self.writes = []
+        self._lock = threading.Lock()
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self.writes.append((key[0].start, key[0].stop))
+        self.volume[key] = value
+
+
+class TestZSliceIngestJob(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.stack = np.random.randint(0, 255, (40, 6, 8), dtype="uint8")
+        for z, zslice in enumerate(self.stack):
+            Image.fromarray(zslice).save(os.path.join(tmp.name, f"{z:04d}.png"))
+        self.job = ZSliceIngestJob(
+            {"path": tmp.name, "pattern": "*.png", "name": "coll/exp/chan", "dtype": "uint8"}
+        )
+
+    def test_upload_images_in_cuboid_aligned_slabs(self):
+        dataset = RecordingDataset(self.stack.shape, "uint8")
+        with patch("intern.convenience.array.array", return_value=dataset):
+            self.assertTrue(self.job.upload_images(progress=False))
+        np.testing.assert_array_equal(self.stack, dataset.volume)
+        self.assertEqual([(0, 32), (32, 40)], sorted(dataset.writes))
+
+    def test_failed_upload_returns_false(self):
+        dataset = Mock()
+        dataset.__setitem__ = Mock(side_effect=RuntimeError)
+        self.job._retry_wait = 0
+        self.job._upload_workers = 1
+        with patch("intern.convenience.array.array", return_value=dataset):
+            with self.assertWarns(UserWarning):
+                self.assertFalse(self.job.upload_images(progress=False))
+        self.assertEqual(5, dataset.__setitem__.call_count)
+
+    def test_slab_plan_fits_permitted_ram(self):
+        self.job._get_ram_bytes_available = lambda: 1e12
+        self.job._get_permitted_zcount = lambda dtype, tile=None: 100
+        self.assertEqual((32, (8, 6), 2, 1), self.job._get_slab_plan("uint8", (8, 6)))
+        self.job._get_permitted_zcount = lambda dtype, tile=None: 256
+        self.assertEqual((32, (8, 6), 4, 4), self.job._get_slab_plan("uint8", (8, 6)))
+        self.job._get_permitted_zcount = lambda dtype, tile=None: 3
+        self.assertEqual((3, (8, 6), 1, 1), self.job._get_slab_plan("uint8", (8, 6)))
+
+    def test_slab_plan_tiles_large_slices(self):
+        # Room for 20 slices of 4096x4096, or 80 of a 2048x2048 tile:
+        self.job._get_ram_bytes_available = lambda: 20 * 4096 * 4096 / 0.75
+        self.assertEqual(
+            (32, (2048, 2048), 1, 1), self.job._get_slab_plan("uint8", (4096, 4096))
+        )
+        self.job._tile_size = (1000, 1000)
+        self.assertEqual(
+            (32, (1024, 1024), 4, 4), self.job._get_slab_plan("uint8", (4096, 4096))
+        )
+
+    def test_upload_images_in_xy_tiles(self):
+        dataset = RecordingDataset(self.stack.shape, "uint8")
+        self.job._get_ram_bytes_available = lambda: 1000
+        self.job._tile_size = (4, 4)
+        with patch("intern.convenience.array.CUBOID_SIZE", (4, 4, 16)), patch(
+            "intern.convenience.array.align_to_cuboids", lambda size: size
+        ), patch("intern.convenience.array.array", return_value=dataset):
+            self.assertTrue(self.job.upload_images(progress=False))
+        np.testing.assert_array_equal(self.stack, dataset.volume)
+        # 2 z-slabs of 2x2 tiles:
+        self.assertEqual(8, len(dataset.writes))
+
+
+class TestZSliceIngestJobChannels(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = pathlib.Path(tmp.name)
+        self.stacks = {
+            "image": np.random.randint(0, 255, (40, 6, 8), dtype="uint8"),
+            "labels": np.random.randint(0, 255, (40, 6, 8), dtype="uint8"),
+        }
+        for name, stack in self.stacks.items():
+            (self.tmp / name).mkdir()
+            for z, zslice in enumerate(stack):
+                Image.fromarray(zslice).save(self.tmp / name / f"{z:04d}.png")
+        self.job = ZSliceIngestJob(
+            {"path": self.tmp / "image", "pattern": "*.png", "name": "c/e/image", "dtype": "uint8"},
+            annotations=[
+                {"path": self.tmp / "labels", "pattern": "*.png", "name": "c/e/labels", "dtype": "uint8"}
+            ],
+        )
+        self.job._retry_wait = 0
+        self.datasets = {
+            name: RecordingDataset(stack.shape, "uint8")
+            for name, stack in self.stacks.items()
+        }
+        for dataset in self.datasets.values():
+            dataset.dtype = "uint8"
+            dataset.shape = (40, 6, 8)
+
+    def get_array(self, name, **kwargs):
+        return self.datasets[name.split("/")[-1]]
+
+    def test_upload_interleaves_channels(self):
+        # One tile decoded and one uploaded at a time, so uploads are in order:
+        self.job._max_batch_size = 32
+        writes = self.datasets["image"].writes
+        self.datasets["labels"].writes = writes
+        with patch("intern.convenience.array.array", side_effect=self.get_array):
+            self.assertTrue(self.job.upload(progress=False))
+        for name, stack in self.stacks.items():
+            np.testing.assert_array_equal(stack, self.datasets[name].volume)
+        self.assertEqual([(0, 32), (0, 32), (32, 40), (32, 40)], writes)
+
+    def test_failed_channel_does_not_stop_the_others(self):
+        self.datasets["image"].__class__ = type(
+            "FailingDataset",
+            (RecordingDataset,),
+            {"__setitem__": Mock(side_effect=RuntimeError)},
+        )
+        with patch("intern.convenience.array.array", side_effect=self.get_array):
+            with self.assertWarns(UserWarning):
+                self.assertFalse(self.job.upload(progress=False))
+        np.testing.assert_array_equal(
+            self.stacks["labels"], self.datasets["labels"].volume
+        )
+
+
+class TestZSliceIngestJobVerification(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = pathlib.Path(tmp.name)
+        for z in range(5):
+            Image.new("L", (8, 6)).save(self.tmp / f"{z:04d}.png")
+        self.image = {"path": self.tmp, "pattern": "*.png", "name": "c/e/ch", "dtype": "uint8"}
+
+    def test_listing_is_cached(self):
+        job = ZSliceIngestJob(self.image)
+        Image.new("L", (8, 6)).save(self.tmp / "0005.png")
+        self.assertEqual(5, job._get_zslice_count())
+
+    def test_mismatched_shape(self):
+        Image.new("L", (8, 7)).save(self.tmp / "0003.png")
+        with self.assertWarns(UserWarning):
+            job = ZSliceIngestJob(self.image)
+        self.assertFalse(job._verify_shapes(warn=False))
+
+    def test_manifest_skips_unchanged_files(self):
+        manifest = str(self.tmp / "manifest.json")
+        ZSliceIngestJob(dict(self.image), manifest_path=manifest)
+
+        Image.new("L", (8, 6), color=1).save(self.tmp / "0002.png")
+        os.utime(self.tmp / "0002.png", (0, 0))
+        with patch("intern.convenience.array.Image.open", wraps=Image.open) as opened:
+            job = ZSliceIngestJob(dict(self.image), manifest_path=manifest)
+        # Only the changed file's header is read:
+        self.assertEqual([call(self.tmp / "0002.png")], opened.call_args_list)
+        self.assertTrue(job._verify_shapes())
+
+
+class TestReadImageWindow(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = pathlib.Path(tmp.name)
+        self.image = np.random.randint(0, 65535, (300, 500), dtype="uint16")
+
+    def test_png_window(self):
+        Image.fromarray(self.image.astype("uint8")).save(self.tmp / "slice.png")
+        np.testing.assert_array_equal(
+            self.image.astype("uint8")[37:299, 100:433],
+            _read_image_window(self.tmp / "slice.png", (100, 433), (37, 299)),
+        )
+
+    @unittest.skipUnless(HAS_TIFFFILE, "tifffile is not installed")
+    def test_tiled_tiff_window(self):
+        import tifffile
+
+        tifffile.imwrite(self.tmp / "slice.tif", self.image, tile=(64, 128))
+        for xs, ys in [((0, 500), (0, 300)), ((100, 433), (37, 299)), ((490, 500), (290, 300))]:
+            np.testing.assert_array_equal(
+                self.image[ys[0] : ys[1], xs[0] : xs[1]],
+                _read_image_window(self.tmp / "slice.tif", xs, ys),
+            )
@@ -6,8 +6,12 @@ import unittest
 
 from intern import array
 
-from intern.convenience.array import _DEFAULT_BOSS_OPTIONS
+from unittest.mock import patch
+
+from intern.convenience.array import _DEFAULT_BOSS_OPTIONS, Metadata
+from intern.convenience.uri import get_remote, clear_remotes
 from intern.remote.boss import BossRemote
+from intern.resource.boss.resource import ChannelResource
 
 
 class TestConvenienceProjectCreation(unittest.TestCase):
@@ -67,3 +71,34 @@ class TestFQURIParser(unittest.TestCase):
             "bossdb://https://api.bossdb.io/Bock/bock11/image", token="public"
         )
         self.assertEqual(remote._token_volume, "public")
+
+
+class TestGetRemote(unittest.TestCase):
+    def setUp(self):
+        clear_remotes()
+        self.addCleanup(clear_remotes)
+        self.config = {"protocol": "https", "host": "api.test.com", "token": "a"}
+
+    def test_remotes_are_shared_by_configuration(self):
+        remote = get_remote(self.config)
+        self.assertIsInstance(remote, BossRemote)
+        self.assertIs(remote, get_remote(dict(self.config)))
+        self.assertIsNot(remote, get_remote(dict(self.config, token="b")))
+
+        clear_remotes()
+        self.assertIsNot(remote, get_remote(self.config))
+
+    def test_parse_fquri_reuses_remote(self):
+        with patch.object(BossRemote, "get_channel") as get_channel:
+            first, _ = parse_fquri("bossdb://https://api.test.com/col/exp/chan")
+            second, _ = parse_fquri("bossdb://https://api.test.com/col/exp/other")
+        self.assertIs(first, second)
+        self.assertEqual(2, get_channel.call_count)
+
+    def test_metadata_uses_shared_remote(self):
+        channel = ChannelResource("chan", "col", "exp")
+        self.assertIs(
+            get_remote(_DEFAULT_BOSS_OPTIONS), Metadata(channel)._remote
+        )
+        remote = get_remote(self.config)
+        self.assertIs(remote, Metadata(channel, remote=remote)._remote)
@@ -1,3 +1,5 @@
+import threading
+
 from ..remote.boss import BossRemote
 
 # A mapping of permitted protocol types:
@@ -6,6 +8,10 @@ PROTOCOLS = {
     "boss": BossRemote,
 }
 
+# Remotes built by `get_remote`, keyed by their configuration:
+_remotes = {}
+_remotes_lock = threading.Lock()
+
 
 class InvalidURIError(ValueError):
     def __init__(self, *args):
@@ -20,11 +26,51 @@ class InvalidURIError(ValueError):
         )
 
 
+def get_remote(config=None):
+    """
+    Get the BossRemote for a configuration, constructing it on first use.
+
+    Remotes are shared for the life of the process, keyed by their
+    configuration (protocol, host and token), so the configuration is
+    parsed and the remote's services are set up once per host and token.
+    Changes made to a shared remote (e.g. its `cache`) are seen by every
+    user of it.
+
+    Arguments:
+        config (dict : None): A BossRemote configuration dict. If None, the
+            remote is configured from the default config file (see
+            `BossRemote`).
+
+    Returns:
+        BossRemote
+
+    """
+    key = None if config is None else tuple(sorted(config.items()))
+    with _remotes_lock:
+        remote = _remotes.get(key)
+        if remote is None:
+            remote = _remotes[key] = BossRemote(config)
+        return remote
+
+
+def clear_remotes():
+    """
+    Forget every remote built by `get_remote`, e.g. after a token changes.
+
+    Returns:
+        None
+
+    """
+    with _remotes_lock:
+        _remotes.clear()
+
+
 def parse_fquri(fully_qualified_uri, **kwargs):
     """
     Given a fully-qualified URI string, return a Remote and Resource.
 
     These should be directly usable as, e.g., `remote.get_cutout(resource)`.
+    URIs of the same host and token share a remote (see `get_remote`).
 
     Arguments:
         fully_qualified_uri (str): The URI to parse, of the form explained in
@@ -77,7 +123,7 @@ def parse_fquri(fully_qualified_uri, **kwargs):
         remote_path_components = remote_path.split("/")
         if len(remote_path_components) == 4:
             host, collection, experiment, channel = remote_path_components
-            remote = remote_constructor(
+            remote = get_remote(
                 {
                     "protocol": secondary_protocol,
                     "host": host,
@@ -89,7 +135,7 @@ def parse_fquri(fully_qualified_uri, **kwargs):
             # file, and we only have col/exp/chan, of the form:
             # `bossdb://col/exp/chan`
             collection, experiment, channel = remote_path_components
-            remote = remote_constructor()
+            remote = get_remote()
         else:
             raise InvalidURIError(
                 "BossDB URIs must be of the form bossdb://http[s]://[host]/[collection]/[experiment]/[echannel], got "
@@ -19,4 +19,11 @@ talk to non-local machines.
 
 # from __future__ import absolute_import
 
-from intern.remote.remote import Remote
+from intern.utils.lazy import lazy_module_attributes
+
+# Attributes that are imported on first use (PEP 562):
+_LAZY_ATTRIBUTES = {
+    "Remote": "intern.remote.remote",
+}
+
+__getattr__, __dir__ = lazy_module_attributes(__name__, _LAZY_ATTRIBUTES)
@@ -19,4 +19,15 @@ Author:
     Tim Gion
 """
 
-from intern.remote.boss.remote import BossRemote, LATEST_VERSION
+from intern.utils.lazy import lazy_module_attributes
+
+# Attributes that are imported on first use (PEP 562), so that importing a
+# submodule (e.g. the asyncio client) does not pull in the requests-based
+# remote, and aiohttp is only imported by code that uses the asyncio client:
+_LAZY_ATTRIBUTES = {
+    "BossRemote": "intern.remote.boss.remote",
+    "LATEST_VERSION": "intern.remote.boss.remote",
+    "AsyncBossRemote": "intern.remote.boss.async_remote",
+}
+
+__getattr__, __dir__ = lazy_module_attributes(__name__, _LAZY_ATTRIBUTES)
@@ -0,0 +1,320 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from intern.remote import Remote
+from intern.remote.boss.remote import (
+    BossRemote, LATEST_VERSION, CONFIG_PROJECT_SECTION, CONFIG_METADATA_SECTION,
+    CONFIG_VOLUME_SECTION, CONFIG_PROTOCOL, CONFIG_HOST, CONFIG_TOKEN, CONFIG_MAX_WORKERS)
+from intern.resource.boss.resource import ChannelResource
+from intern.service.boss.aio import (
+    AsyncSession, AsyncProjectService, AsyncMetadataService, AsyncVolumeService)
+from intern.service.boss.v1.volume import CacheMode
+
+
+class AsyncBossRemote(Remote):
+    """
+    asyncio client for the Boss API.
+
+    Mirrors the cutout, project and metadata calls of BossRemote as
+    coroutines.  All calls share one aiohttp session, which keeps at most
+    `max_concurrency` requests in flight.  Cancelling a call cancels its
+    outstanding requests.
+
+    Requires the optional aiohttp dependency (`pip install intern[async]`).
+
+    Example:
+
+        async with AsyncBossRemote() as rmt:
+            chan = await rmt.get_channel("chan", "coll", "exp")
+            data = await rmt.get_cutout(chan, 0, [0, 512], [0, 512], [0, 16])
+    """
+
+    def __init__(self, cfg_file_or_dict=None, version=None, max_concurrency=None):
+        """
+        Constructor.
+
+        Configuration is read exactly as in BossRemote.
+
+        Args:
+            cfg_file_or_dict (optional[string|dict]): Path to config file in
+                INI format or a dict of config parameters.
+            version (optional[string]): Version of Boss API to use.
+            max_concurrency (optional[int]): Maximum number of requests in
+                flight.  Overrides the optional `max_workers` config value.
+
+        Raises:
+            (FileNotFoundError): if can't load given config file.
+            (KeyError): if given invalid version.
+            (ImportError): if aiohttp is not installed.
+        """
+        Remote.__init__(self, cfg_file_or_dict)
+
+        if version is None:
+            version = LATEST_VERSION
+
+        volume_cfg = self._load_config_section(CONFIG_VOLUME_SECTION)
+        if max_concurrency is None and CONFIG_MAX_WORKERS in volume_cfg:
+            max_concurrency = int(volume_cfg[CONFIG_MAX_WORKERS])
+        self._session = AsyncSession(max_concurrency)
+
+        self._project, self._token_project = self._init_service(
+            AsyncProjectService, CONFIG_PROJECT_SECTION, version)
+        self._metadata, self._token_metadata = self._init_service(
+            AsyncMetadataService, CONFIG_METADATA_SECTION, version)
+        self._volume, self._token_volume = self._init_service(
+            AsyncVolumeService, CONFIG_VOLUME_SECTION, version)
+
+    def __repr__(self):
+        return "<intern.remote.AsyncBossRemote [" + self._config['Default']['host'] + "]>"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    _load_config_section = BossRemote._load_config_section
+
+    def _init_service(self, service_class, section_name, version):
+        """
+        Create one of the asyncio services from its config section.
+
+        Returns:
+            (AsyncBossService, string): The service and its token.
+        """
+        cfg = self._load_config_section(section_name)
+        service = service_class(cfg[CONFIG_HOST], version, self._session)
+        service.base_protocol = cfg[CONFIG_PROTOCOL]
+        service.set_auth(cfg[CONFIG_TOKEN])
+        return service, cfg[CONFIG_TOKEN]
+
+    @property
+    def max_concurrency(self):
+        """
+        Maximum number of requests in flight at once.
+        """
+        return self._session.max_concurrency
+
+    async def close(self):
+        """
+        Close the remote's HTTP session.
+        """
+        await self._session.close()
+
+    async def get_channel(self, chan_name, coll_name, exp_name):
+        """
+        Helper that gets a fully initialized ChannelResource for an *existing* channel.
+
+        Args:
+            chan_name (str): Name of channel.
+            coll_name (str): Name of channel's collection.
+            exp_name (str): Name of channel's experiment.
+
+        Returns:
+            (intern.resource.boss.ChannelResource)
+        """
+        chan = ChannelResource(chan_name, coll_name, exp_name)
+        return await self.get_project(chan)
+
+    async def parse_bossURI(self, uri):
+        """
+        Parse a bossDB URI and handle malform errors.
+
+        Arguments:
+            uri (str): URI of the form bossdb://<collection>/<experiment>/<channel>
+
+        Returns:
+            Resource
+
+        """
+        t = uri.split("://")[1].split("/")
+        if len(t) == 3:
+            return await self.get_channel(t[2], t[0], t[1])
+        raise ValueError("Cannot parse URI " + uri + ".")
+
+    async def create_project(self, resource):
+        """
+        Create the entity described by the given resource.
+
+        Args:
+            resource (intern.resource.boss.BossResource)
+
+        Returns:
+            (intern.resource.boss.BossResource): Returns resource of type
+                requested on success.
+
+        Raises:
+            requests.HTTPError on failure.
+        """
+        return await self._project.create(resource)
+
+    async def get_project(self, resource):
+        """
+        Get attributes of the data model object named by the given resource.
+
+        Args:
+            resource (intern.resource.boss.BossResource): resource.name as well
+                as any parents must be identified to succeed.
+
+        Returns:
+            (intern.resource.boss.BossResource): Returns resource of type
+                requested on success.
+
+        Raises:
+            requests.HTTPError on failure.
+        """
+        return await self._project.get(resource)
+
+    async def delete_project(self, resource):
+        """
+        Deletes the entity described by the given resource.
+
+        Args:
+            resource (intern.resource.boss.BossResource)
+
+        Raises:
+            requests.HTTPError on a failure.
+        """
+        await self._project.delete(resource)
+
+    async def list_metadata(self, resource):
+        """
+        List all keys associated with the given resource.
+
+        Args:
+            resource (intern.resource.boss.BossResource)
+
+        Returns:
+            (list)
+
+        Raises:
+            requests.HTTPError on a failure.
+        """
+        return await self._metadata.list(resource)
+
+    async def create_metadata(self, resource, keys_vals):
+        """
+        Associates new key-value pairs with the given resource.
+
+        Will attempt to add all key-value pairs even if some fail.
+
+        Args:
+            resource (intern.resource.boss.BossResource)
+            keys_vals (dictionary): Collection of key-value pairs to assign to
+                given resource.
+
+        Raises:
+            HTTPErrorList on failure.
+        """
+        await self._metadata.create(resource, keys_vals)
+
+    async def get_metadata(self, resource, keys):
+        """
+        Gets the values for given keys associated with the given resource.
+
+        Args:
+            resource (intern.resource.boss.BossResource)
+            keys (list)
+
+        Returns:
+            (dictionary)
+
+        Raises:
+            HTTPErrorList on failure.
+        """
+        return await self._metadata.get(resource, keys)
+
+    async def update_metadata(self, resource, keys_vals):
+        """
+        Updates key-value pairs with the given resource.
+
+        Will attempt to update all key-value pairs even if some fail.
+        Keys must already exist.
+
+        Args:
+            resource (intern.resource.boss.BossResource)
+            keys_vals (dictionary): Collection of key-value pairs to update on
+                the given resource.
+
+        Raises:
+            HTTPErrorList on failure.
+        """
+        await self._metadata.update(resource, keys_vals)
+
+    async def delete_metadata(self, resource, keys):
+        """
+        Deletes the given key-value pairs associated with the given resource.
+
+        Will attempt to delete all key-value pairs even if some fail.
+
+        Args:
+            resource (intern.resource.boss.BossResource)
+            keys (list)
+
+        Raises:
+            HTTPErrorList on failure.
+        """
+        await self._metadata.delete(resource, keys)
+
+    async def get_cutout(self, resource, resolution, x_range, y_range, z_range, time_range=None, id_list=[], access_mode=CacheMode.no_cache, **kwargs):
+        """Get a cutout from the volume service.
+
+        Args:
+            resource (intern.resource.boss.resource.ChannelResource | str): Channel or layer Resource. If a
+                string is provided instead, AsyncBossRemote.parse_bossURI is called instead on a URI-formatted
+                string of the form `bossdb://collection/experiment/channel`.
+            resolution (int): 0 indicates native resolution.
+            x_range (list[int]): x range such as [10, 20] which means x>=10 and x<20.
+            y_range (list[int]): y range such as [10, 20] which means y>=10 and y<20.
+            z_range (list[int]): z range such as [10, 20] which means z>=10 and z<20.
+            time_range (optional [list[int]]): time range such as [30, 40] which means t>=30 and t<40.
+            id_list (optional [list[int]]): list of object ids to filter the cutout by.
+            access_mode (optional [Enum]): Identifies one of three cache access options:
+                cache = Will check both cache and for dirty keys
+                no_cache = Will skip cache check but check for dirty keys
+                raw = Will skip both the cache and dirty keys check
+            out (optional [numpy.ndarray]): A writable array to download into.
+
+        Returns:
+            (numpy.array): A 3D or 4D (time) numpy matrix in (time)ZYX order.
+
+        Raises:
+            requests.HTTPError on error.
+        """
+        if isinstance(resource, str):
+            resource = await self.parse_bossURI(resource)
+        return await self._volume.get_cutout(
+            resource, resolution, x_range, y_range, z_range, time_range,
+            id_list, access_mode, **kwargs)
+
+    async def create_cutout(self, resource, resolution, x_range, y_range, z_range, data, time_range=None, compression=None):
+        """Upload a cutout to the volume service.
+
+        Args:
+            resource (intern.resource.boss.resource.ChannelResource): Channel or layer Resource.
+            resolution (int): 0 indicates native resolution.
+            x_range (list[int]): x range such as [10, 20] which means x>=10 and x<20.
+            y_range (list[int]): y range such as [10, 20] which means y>=10 and y<20.
+            z_range (list[int]): z range such as [10, 20] which means z>=10 and z<20.
+            data (numpy.array): A 3D or 4D (time) numpy matrix in (time)ZYX order.
+            time_range (optional [list[int]]): time range such as [30, 40] which means t>=30 and t<40.
+            compression (optional [intern.utils.compression.BloscSettings]): How blocks are compressed.
+
+        Raises:
+            RuntimeError when given invalid resource.
+            requests.HTTPError on error.
+        """
+        if not resource.valid_volume():
+            raise RuntimeError('Resource incompatible with the volume service.')
+        await self._volume.create_cutout(
+            resource, resolution, x_range, y_range, z_range, data, time_range, compression)
@@ -19,6 +19,9 @@ from intern.service.boss.project import ProjectService
 from intern.service.boss.metadata import MetadataService
 from intern.service.boss.volume import VolumeService
 from intern.service.boss.v1.volume import CacheMode
+from intern.utils.autotune import CutoutAutotuner
+from intern.utils.cache import TTLCache, open_cache
+from intern.utils.compression import benchmark
 import warnings
 
 
@@ -29,6 +32,8 @@ CONFIG_PROTOCOL = 'protocol'
 # CONFIG_HOST example: api.theboss.io
 CONFIG_HOST = 'host'
 CONFIG_TOKEN = 'token'
+# Optional: number of threads used for parallel cutout transfers.
+CONFIG_MAX_WORKERS = 'max_workers'
 
 LATEST_VERSION = 'v1'
 
@@ -45,7 +50,8 @@ class BossRemote(Remote):
             volume service.
     """
 
-    def __init__(self, cfg_file_or_dict=None, version=None):
+    def __init__(self, cfg_file_or_dict=None, version=None, max_workers=None, autotune=False, cache=None,
+                 resource_cache_ttl=None, retry_policy=None):
         """
         Constructor.
 
@@ -57,6 +63,28 @@ class BossRemote(Remote):
             version (optional[string]): Version of Boss API to use.
             cfg_file_or_dict (optional[string|dict]): Path to config file in
                 INI format or a dict of config parameters.
+            max_workers (optional[int]): Number of threads the volume service
+                keeps for parallel cutout transfers.  Overrides the optional
+                `max_workers` config value.
+            autotune (optional[bool|intern.utils.autotune.CutoutAutotuner]): Tune
+                the chunk size and concurrency of parallel cutout downloads from
+                measured throughput.  Pass a CutoutAutotuner to control its
+                bounds or to persist the best settings per host.
+            cache (optional[bool|str|int|intern.utils.cache.DiskCache]): Keep the
+                cuboids of downloaded cutouts in a local on-disk cache, so that
+                repeated or overlapping cutouts only download missing cuboids.
+                True uses ~/.intern/cache; a string is the cache directory; an
+                int is the byte budget of an in-memory MemoryCache instead.
+            resource_cache_ttl (optional[float]): Cache the resources returned by
+                get_project() and get_channel() for this many seconds, so that code
+                which looks up the same channels repeatedly only asks the server once.
+                Resources updated or deleted through this remote are dropped from the
+                cache straight away.  Defaults to no cache.
+            retry_policy (optional[intern.utils.retry.RetryPolicy]): Retry cutout
+                chunks that fail with a transient error (429, 5xx, connection errors),
+                e.g. `RetryPolicy()`.  Chunks that still fail are then
+                reported together in a CutoutError, which can resume the download.
+                Defaults to no retries: the first failure is raised straight away.
 
         Raises:
             (FileNotFoundError): if can't load given config file.
@@ -70,7 +98,11 @@ class BossRemote(Remote):
         # Init the services
         self._init_project_service(version)
         self._init_metadata_service(version)
-        self._init_volume_service(version)
+        self._init_volume_service(version, max_workers)
+        self.autotune = autotune
+        self.cache = cache
+        self.resource_cache = resource_cache_ttl
+        self.retry_policy = retry_policy
 
     def __repr__(self):
         """
@@ -124,12 +156,14 @@ class BossRemote(Remote):
         self._metadata.base_protocol = proto
         self._metadata.set_auth(self._token_metadata)
 
-    def _init_volume_service(self, version):
+    def _init_volume_service(self, version, max_workers=None):
         """
         Method to initialize the Volume Service from the config data
 
         Args:
             version (string): Version of Boss API to use.
+            max_workers (optional[int]): Size of the volume service's thread
+                pool.  Falls back to the config value, then the default.
 
         Returns:
             None
@@ -141,8 +175,10 @@ class BossRemote(Remote):
         self._token_volume = volume_cfg[CONFIG_TOKEN]
         proto = volume_cfg[CONFIG_PROTOCOL]
         host = volume_cfg[CONFIG_HOST]
+        if max_workers is None and CONFIG_MAX_WORKERS in volume_cfg:
+            max_workers = int(volume_cfg[CONFIG_MAX_WORKERS])
 
-        self._volume = VolumeService(host, version)
+        self._volume = VolumeService(host, version, max_workers)
         self._volume.base_protocol = proto
         self._volume.set_auth(self._token_volume)
 
@@ -214,6 +250,83 @@ class BossRemote(Remote):
         self._token_volume = value
         self.volume_service.set_auth(self._token_volume)
 
+    @property
+    def max_workers(self):
+        """
+        Number of threads used for parallel cutout transfers
+        """
+        return self._volume.max_workers
+
+    @max_workers.setter
+    def max_workers(self, value):
+        self._volume.max_workers = value
+
+    @property
+    def retry_policy(self):
+        """
+        The RetryPolicy for cutout chunks that fail with a transient error, or
+        None (the default) to disable retries
+        """
+        return self._volume.retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, value):
+        self._volume.retry_policy = value
+
+    @property
+    def autotune(self):
+        """
+        The CutoutAutotuner used for parallel cutout downloads, or None
+        """
+        return self._volume.autotuner
+
+    @autotune.setter
+    def autotune(self, value):
+        if value is True:
+            value = CutoutAutotuner(max_workers=self.max_workers)
+        elif not value:
+            value = None
+        self._volume.autotuner = value
+
+    @property
+    def compression(self):
+        """
+        The BloscSettings used to compress cutout uploads
+        """
+        return self._volume.compression
+
+    @compression.setter
+    def compression(self, value):
+        self._volume.compression = value
+
+    @property
+    def cache(self):
+        """
+        The cache of cutout cuboids (a DiskCache or MemoryCache), or None
+        """
+        return self._volume.cache
+
+    @cache.setter
+    def cache(self, value):
+        self._volume.cache = open_cache(value)
+
+    @property
+    def resource_cache(self):
+        """
+        The TTLCache of project resources, or None.  Its stats() report hits and misses.
+        """
+        return self._project.resource_cache
+
+    @resource_cache.setter
+    def resource_cache(self, value):
+        if value is None or value is False:
+            value = None
+        elif value is True:
+            value = TTLCache()
+        elif not isinstance(value, TTLCache):
+            value = TTLCache(ttl=value)
+        self._project.resource_cache = value
+
     def list_groups(self, filtr=None):
         """
         Get the groups the logged in user is a member of.
@@ -918,7 +1031,24 @@ class BossRemote(Remote):
                     cache = Will check both cache and for dirty keys
                     no_cache = Will skip cache check but check for dirty keys
                     raw = Will skip both the cache and dirty keys check
-                parallel (bool: True): Whether downloads should be parallelized using multiprocessing
+                parallel (Union[int, bool]: True): Whether downloads should be parallelized using
+                    the volume service's persistent thread pool. If set to an integer, will keep
+                    at most that number of requests in flight.
+                out (optional [numpy.ndarray]): A writable array with the cutout's (time)ZYX shape
+                    and the channel's dtype to download into, such as a numpy.memmap or an array
+                    backed by multiprocessing.shared_memory. Chunks are written straight into it,
+                    so cutouts larger than RAM can be streamed to disk.
+                retry (optional [intern.utils.retry.RetryPolicy]): Overrides BossRemote.retry_policy
+                    for this call. Chunks failing with a transient error are retried with
+                    backoff; chunks that still fail are reported together at the end.
+                resume (optional [intern.service.boss.httperrorlist.CutoutError]): Error raised
+                    by an earlier call with the same arguments; only its failed regions are
+                    fetched, into its partial result.
+                cache (optional [intern.utils.cache.DiskCache]): Overrides BossRemote.cache for
+                    this call; None bypasses the cache.
+                cache_bounds (optional [list[list[int]]]): x, y and z ranges of the channel at
+                    this resolution. If given, cuboids on the edge of the cutout are downloaded
+                    whole so that they can be cached too.
 
                 TODO: Add mode to documentation
 
@@ -928,6 +1058,8 @@ class BossRemote(Remote):
 
             Raises:
                 requests.HTTPError on error.
+                intern.service.boss.httperrorlist.CutoutError: if some chunks could not be
+                    downloaded. It lists the failed regions and holds the partial result.
             """
             if no_cache is not None:
                 warnings.warn("The no-cache option has been deprecated and will not be used in future versions of intern.")
@@ -947,6 +1079,69 @@ class BossRemote(Remote):
                 parallel=parallel, **kwargs
             )
     
+    def iter_cutout(self, resource, resolution, x_range, y_range, z_range, time_range=None, id_list=[], access_mode=CacheMode.no_cache, parallel=True, **kwargs):
+        """Download a cutout block by block, yielding each block as it arrives.
+
+        Unlike get_cutout, the full region is never held in memory: only the
+        blocks in flight and the block being handed to the caller are.
+
+        Args:
+            resource (intern.resource.boss.resource.ChannelResource | str): Channel or layer Resource.
+            resolution (int): 0 indicates native resolution.
+            x_range (list[int]): x range such as [10, 20] which means x>=10 and x<20.
+            y_range (list[int]): y range such as [10, 20] which means y>=10 and y<20.
+            z_range (list[int]): z range such as [10, 20] which means z>=10 and z<20.
+            time_range (optional [list[int]]): time range such as [30, 40] which means t>=30 and t<40.
+            id_list (optional [list[int]]): list of object ids to filter the cutout by.
+            access_mode (optional [Enum]): Identifies one of three cache access options.
+            parallel (Union[int, bool]: True): Number of requests to keep in flight.
+            chunk_size (optional Tuple[int, int, int]): The (x, y, z) size of each block,
+                rounded up to a whole number of cuboids.
+
+        Returns:
+            (generator): Yields ([x_range, y_range, z_range(, time_range)], numpy.array)
+                pairs in the order the blocks arrive. Arrays are in (time)ZYX order.
+
+        Raises:
+            requests.HTTPError on error.
+            ValueError: if given an option only get_cutout supports (out, resume,
+                cache or cache_bounds).
+        """
+        if isinstance(resource, str):
+            resource = self.parse_bossURI(resource)
+        return self._volume.iter_cutout(
+            resource, resolution,
+            x_range, y_range, z_range, time_range,
+            id_list, access_mode,
+            parallel=parallel, **kwargs
+        )
+
+    def benchmark_compression(self, resource, resolution, x_range, y_range, z_range, **kwargs):
+        """Compare blosc compression settings on a sample of a channel's data.
+
+        Downloads the given region and measures the compression ratio and speed
+        of each combination of settings, to help choose BossRemote.compression.
+
+        Args:
+            resource (intern.resource.boss.resource.ChannelResource | str): Channel of the sample.
+            resolution (int): 0 indicates native resolution.
+            x_range (list[int]): x range such as [10, 20] which means x>=10 and x<20.
+            y_range (list[int]): y range such as [10, 20] which means y>=10 and y<20.
+            z_range (list[int]): z range such as [10, 20] which means z>=10 and z<20.
+            kwargs: The cnames, clevels, shuffles and repeat arguments of
+                intern.utils.compression.benchmark.
+
+        Returns:
+            (list[dict]): From intern.utils.compression.benchmark, best ratio first.
+
+        Raises:
+            requests.HTTPError on error.
+        """
+        if isinstance(resource, str):
+            resource = self.parse_bossURI(resource)
+        sample = self.get_cutout(resource, resolution, x_range, y_range, z_range)
+        return benchmark(sample, **kwargs)
+
     def create_cutout_to_black(self, resource, resolution, x_range, y_range, z_range, time_range=None):
         """Post a black cutout to the volume service.
 
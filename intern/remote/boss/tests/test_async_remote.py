@@ -0,0 +1,152 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from intern.remote.boss import AsyncBossRemote
+from intern.resource.boss.resource import ChannelResource
+from intern.service.boss.aio import HAS_AIOHTTP, run_bounded
+from intern.service.boss.httperrorlist import HTTPErrorList
+from requests import HTTPError
+import asyncio
+import blosc
+import numpy
+import re
+import unittest
+
+if HAS_AIOHTTP:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+
+
+@unittest.skipUnless(HAS_AIOHTTP, 'aiohttp is not installed')
+class TestAsyncBossRemote(unittest.IsolatedAsyncioTestCase):
+    """Exercise AsyncBossRemote against a local fake of the Boss API."""
+
+    async def asyncSetUp(self):
+        self.volume = numpy.random.randint(0, 3000, (32, 600, 600), numpy.uint16)
+        self.uploads = []
+        self.metadata = {'foo': 'bar'}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+        app = web.Application()
+        app.router.add_route('*', '/v1/cutout/{tail:.*}', self.cutout)
+        app.router.add_route('*', '/v1/meta/{tail:.*}', self.meta)
+        app.router.add_get('/v1/collection/{tail:.*}', self.channel)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        self.rmt = AsyncBossRemote({
+            'protocol': 'http',
+            'host': '{}:{}'.format(self.server.host, self.server.port),
+            'token': 'my_token',
+        }, max_concurrency=3)
+        self.chan = ChannelResource(
+            'chan', 'coll', 'exp', 'image', datatype='uint16')
+
+    async def asyncTearDown(self):
+        await self.rmt.close()
+        await self.server.close()
+
+    async def cutout(self, request):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            ranges = [tuple(int(v) for v in r.split(':'))
+                      for r in re.findall(r'/(\d+:\d+)', request.path)]
+            index = tuple(slice(*r) for r in reversed(ranges))
+            if request.method == 'POST':
+                body = await request.read()
+                self.uploads.append((ranges, blosc.decompress(body)))
+                return web.Response(status=201)
+            return web.Response(
+                body=blosc.compress(numpy.ascontiguousarray(self.volume[index]), typesize=16))
+        finally:
+            self.in_flight -= 1
+
+    async def meta(self, request):
+        key = request.query.get('key')
+        if key not in self.metadata:
+            return web.Response(status=404, text='missing')
+        return web.json_response({'key': key, 'value': self.metadata[key]})
+
+    async def channel(self, request):
+        return web.json_response({
+            'name': 'chan', 'description': '', 'creator': 'me',
+            'default_time_sample': 0, 'datatype': 'uint16', 'base_resolution': 0,
+            'type': 'image', 'sources': [], 'related': [], 'downsample_status': 'NOT_DOWNSAMPLED',
+        })
+
+    async def test_get_channel(self):
+        chan = await self.rmt.get_channel('chan', 'coll', 'exp')
+        self.assertEqual('uint16', chan.datatype)
+        self.assertEqual('coll', chan.coll_name)
+
+    async def test_get_cutout_chunked(self):
+        actual = await self.rmt.get_cutout(
+            self.chan, 0, [10, 590], [5, 600], [0, 32], chunk_size=(512, 512, 16))
+        numpy.testing.assert_array_equal(self.volume[:, 5:600, 10:590], actual)
+        self.assertLessEqual(self.peak_in_flight, 3)
+        self.assertGreater(self.peak_in_flight, 1)
+
+    async def test_get_cutout_from_uri(self):
+        actual = await self.rmt.get_cutout(
+            'bossdb://coll/exp/chan', 0, [0, 64], [0, 64], [0, 16])
+        numpy.testing.assert_array_equal(self.volume[0:16, 0:64, 0:64], actual)
+
+    async def test_concurrent_calls_share_limit(self):
+        await asyncio.gather(*(
+            self.rmt.get_cutout(self.chan, 0, [0, 600], [0, 600], [0, 32], chunk_size=(512, 512, 16))
+            for _ in range(3)))
+        self.assertLessEqual(self.peak_in_flight, 3)
+
+    async def test_create_cutout(self):
+        data = numpy.ones((16, 64, 64), numpy.uint16)
+        await self.rmt.create_cutout(self.chan, 0, [0, 64], [0, 64], [0, 16], data)
+        self.assertEqual(1, len(self.uploads))
+        self.assertEqual([(0, 64), (0, 64), (0, 16)], self.uploads[0][0])
+        self.assertEqual(data.tobytes(), self.uploads[0][1])
+
+    async def test_get_metadata(self):
+        self.assertEqual({'foo': 'bar'}, await self.rmt.get_metadata(self.chan, ['foo']))
+        with self.assertRaises(HTTPErrorList) as err:
+            await self.rmt.get_metadata(self.chan, ['foo', 'nope'])
+        self.assertEqual(404, err.exception.http_errors[0].response.status_code)
+
+    async def test_cancel_get_cutout(self):
+        task = asyncio.ensure_future(self.rmt.get_cutout(
+            self.chan, 0, [0, 600], [0, 600], [0, 32], chunk_size=(512, 512, 16)))
+        await asyncio.sleep(0.005)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+
+@unittest.skipUnless(HAS_AIOHTTP, 'aiohttp is not installed')
+class TestRunBounded(unittest.IsolatedAsyncioTestCase):
+    async def test_failure_cancels_pending(self):
+        cancelled = []
+
+        async def work(i):
+            if i == 0:
+                raise HTTPError('boom')
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(i)
+                raise
+
+        with self.assertRaises(HTTPError):
+            await run_bounded(work, range(10), 3)
+        self.assertEqual([1, 2], sorted(cancelled))
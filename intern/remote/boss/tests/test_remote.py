@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from intern.remote.boss import BossRemote
+from intern.utils.retry import RetryPolicy
 import tempfile
 import os
 
@@ -57,6 +58,85 @@ class RemoteConfigTest(unittest.TestCase):
     #     with self.assertRaises(OSError):
     #         rmt = BossRemote('nofile.cfg')
 
+    def test_init_max_workers(self):
+        config = {"protocol": "https",
+                  "host": "test.theboss.io",
+                  "token": "my_secret",
+                  "max_workers": 7}
+        rmt = BossRemote(config)
+        self.assertEqual(7, rmt.max_workers)
+
+        rmt = BossRemote(config, max_workers=3)
+        self.assertEqual(3, rmt.volume_service.max_workers)
+
+    def test_init_autotune(self):
+        config = {"protocol": "https",
+                  "host": "test.theboss.io",
+                  "token": "my_secret"}
+        rmt = BossRemote(config)
+        self.assertIsNone(rmt.autotune)
+
+        rmt = BossRemote(config, max_workers=5, autotune=True)
+        self.assertIs(rmt.autotune, rmt.volume_service.autotuner)
+        self.assertEqual(5, rmt.autotune.max_workers)
+
+        rmt.autotune = False
+        self.assertIsNone(rmt.volume_service.autotuner)
+
+    def test_init_cache(self):
+        config = {"protocol": "https",
+                  "host": "test.theboss.io",
+                  "token": "my_secret"}
+        rmt = BossRemote(config)
+        self.assertIsNone(rmt.cache)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            rmt = BossRemote(config, cache=tmp)
+            self.assertIs(rmt.cache, rmt.volume_service.cache)
+            self.assertEqual(tmp, rmt.cache.path)
+
+        rmt.cache = None
+        self.assertIsNone(rmt.volume_service.cache)
+
+    def test_init_resource_cache(self):
+        config = {"protocol": "https",
+                  "host": "test.theboss.io",
+                  "token": "my_secret"}
+        rmt = BossRemote(config)
+        self.assertIsNone(rmt.resource_cache)
+
+        rmt = BossRemote(config, resource_cache_ttl=30)
+        self.assertIs(rmt.resource_cache, rmt.project_service.resource_cache)
+        self.assertEqual(30, rmt.resource_cache.ttl)
+
+    def test_init_retry_policy(self):
+        config = {"protocol": "https",
+                  "host": "test.theboss.io",
+                  "token": "my_secret"}
+        rmt = BossRemote(config)
+        self.assertIsNone(rmt.retry_policy)
+
+        policy = RetryPolicy(retries=2)
+        rmt = BossRemote(config, retry_policy=policy)
+        self.assertIs(policy, rmt.volume_service.retry_policy)
+
+    def test_services_share_a_session(self):
+        config = {"protocol": "https",
+                  "host": "shared.theboss.io",
+                  "token": "my_secret"}
+        rmt = BossRemote(config, max_workers=3)
+        other = BossRemote(config)
+        session = rmt.volume_service.session
+        self.assertIs(session, rmt.project_service.session)
+        self.assertIs(session, rmt.metadata_service.session)
+        self.assertIs(session, other.volume_service.session)
+        self.assertGreaterEqual(
+            session.get_adapter("https://shared.theboss.io")._pool_maxsize,
+            other.max_workers)
+
+        config["token"] = "someone_else"
+        self.assertIsNot(session, BossRemote(config).volume_service.session)
+
     def test_init_with_malformed_file(self):
         """Test when a bad config file is provided"""
         with self.assertRaises(KeyError):
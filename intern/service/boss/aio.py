@@ -0,0 +1,553 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""asyncio versions of the Boss' volume, project and metadata services.
+
+Requests are built by the same BaseVersion implementations as the
+synchronous services and sent with aiohttp, so URLs, headers and error
+messages are identical.  Responses are wrapped as requests.Response objects
+and failures raise the same requests.HTTPError / HTTPErrorList exceptions.
+"""
+from intern.resource.boss.resource import ChannelResource
+from intern.service.boss.httperrorlist import HTTPErrorList
+from intern.service.boss.v1.metadata import MetadataService_1
+from intern.service.boss.v1.project import ProjectService_1
+from intern.service.boss.v1.volume import VolumeService_1, CacheMode
+from intern.service.boss.volume import check_channel
+from intern.utils.compression import BloscSettings
+from intern.utils.parallel import DEFAULT_MAX_WORKERS
+from requests import HTTPError, Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+import asyncio
+import functools
+import numpy as np
+
+HAS_AIOHTTP = True
+try:
+    import aiohttp
+except ImportError:
+    HAS_AIOHTTP = False
+
+
+async def run_blocking(fcn, *args, **kwargs):
+    """Run a blocking (GIL-releasing) function on the loop's default executor.
+
+    Args:
+        fcn (function): Function to call.
+
+    Returns:
+        The result of fcn(*args, **kwargs).
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, functools.partial(fcn, *args, **kwargs))
+
+
+async def run_bounded(fcn, items, max_in_flight):
+    """Await fcn(item) for every item, with at most max_in_flight running at once.
+
+    Coroutines are only created as slots free up, so memory held by pending
+    work stays bounded.  If any call fails, or the caller is cancelled, the
+    calls still running are cancelled and awaited before returning.
+
+    Args:
+        fcn (function): Coroutine function taking a single item.
+        items (iterable): Arguments to fcn.
+        max_in_flight (int): Maximum number of concurrent calls.
+
+    Raises:
+        The first exception raised by fcn.
+    """
+    items = iter(items)
+    pending = set()
+    try:
+        for item in items:
+            if len(pending) >= max_in_flight:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()
+            pending.add(asyncio.ensure_future(fcn(item)))
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+class AsyncSession(object):
+    """Sends requests.Request objects over a shared aiohttp.ClientSession.
+
+    The aiohttp session is created on first use so that it belongs to the
+    running event loop.
+
+    Attributes:
+        max_concurrency (int): Maximum number of requests in flight at once,
+            across every call using this session.
+    """
+
+    def __init__(self, max_concurrency=None):
+        """Constructor.
+
+        Args:
+            max_concurrency (optional[int]): Maximum number of requests in flight.
+                Defaults to DEFAULT_MAX_WORKERS.
+
+        Raises:
+            (ImportError): if aiohttp is not installed.
+            (ValueError): if max_concurrency is less than 1.
+        """
+        if not HAS_AIOHTTP:
+            raise ImportError(
+                "The asyncio Boss client requires aiohttp. "
+                "Install it with `pip install intern[async]`.")
+        if max_concurrency is None:
+            max_concurrency = DEFAULT_MAX_WORKERS
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be greater than 0.")
+        self.max_concurrency = max_concurrency
+        self._session = None
+        self._semaphore = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                trust_env=True)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def send(self, req):
+        """Send a request.
+
+        Args:
+            req (requests.Request): Request built by a BaseVersion implementation.
+
+        Returns:
+            (requests.Response): The response, with its body already read.
+        """
+        prep = req.prepare()
+        session = self._get_session()
+        async with self._semaphore:
+            async with session.request(
+                    prep.method, prep.url, headers=dict(prep.headers), data=prep.body) as resp:
+                content = await resp.read()
+
+        response = Response()
+        response.status_code = resp.status
+        response.reason = resp.reason
+        response.headers = CaseInsensitiveDict(resp.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = prep.url
+        response.request = prep
+        response._content = content
+        return response
+
+    async def close(self):
+        """Close the underlying aiohttp session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class AsyncBossService(object):
+    """Common state of the asyncio Boss services.
+
+    Attributes:
+        base_url (string): Host such as 'api.theboss.io'.
+        base_protocol (string): 'https' or 'http'.
+        session (AsyncSession): Session used to send requests.
+        service (intern.service.boss.BaseVersion): Builds the requests.
+    """
+
+    def __init__(self, base_url, version, session):
+        """Constructor.
+
+        Args:
+            base_url (string): Base url to the service such as 'api.boss.io'.
+            version (string): Version of Boss API to use.
+            session (AsyncSession): Session used to send requests.
+
+        Raises:
+            (KeyError): if given invalid version.
+        """
+        self.base_url = base_url
+        self.base_protocol = 'https'
+        self.session = session
+        self._auth = None
+        self.service = self._versions[version]
+
+    @property
+    def auth(self):
+        return self._auth
+
+    def set_auth(self, token):
+        """Set the token for authentication/authorization.
+
+        Args:
+            token (string):  Token generated by the Django Rest Framework.
+        """
+        self._auth = token
+
+    @property
+    def url_prefix(self):
+        return self.base_protocol + '://' + self.base_url
+
+
+class AsyncVolumeService(AsyncBossService):
+    """asyncio version of intern.service.boss.VolumeService."""
+
+    _versions = {'v1': VolumeService_1()}
+
+    @check_channel
+    async def get_cutout(
+            self, resource, resolution, x_range, y_range, z_range, time_range=None,
+            id_list=[], access_mode=CacheMode.no_cache, **kwargs):
+        """Get a cutout from the volume service.
+
+        Large cutouts are split into chunks exactly as in the synchronous
+        client and fetched concurrently, up to the session's concurrency limit.
+
+        Args:
+            resource (intern.resource.boss.resource.ChannelResource): Channel or layer resource.
+            resolution (int): 0 indicates native resolution.
+            x_range (list[int]): x range such as [10, 20] which means x>=10 and x<20.
+            y_range (list[int]): y range such as [10, 20] which means y>=10 and y<20.
+            z_range (list[int]): z range such as [10, 20] which means z>=10 and z<20.
+            time_range (optional [list[int]]): time range such as [30, 40] which means t>=30 and t<40.
+            id_list (optional [list[int]]): list of object ids to filter the cutout by.
+            access_mode (optional [Enum]): Identifies one of three cache access options:
+                cache = Will check both cache and for dirty keys
+                no_cache = Will skip cache check but check for dirty keys
+                raw = Will skip both the cache and dirty keys check
+            chunk_size (optional Tuple[int, int, int]): The chunk size to request.
+            time_chunk_size (optional int): Number of time points to request per chunk.
+            out (optional numpy.ndarray|buffer): Writable destination for the cutout.
+
+        Returns:
+            (numpy.array): A 3D or 4D (time) numpy matrix in (time)ZYX order.
+
+        Raises:
+            requests.HTTPError on error.
+        """
+        result, blocks = self.service._prepare_get_cutout(
+            resource, x_range, y_range, z_range, time_range, True, kwargs)
+
+        if blocks is None:
+            await self._get_cutout_block(
+                resource, resolution, x_range, y_range, z_range, time_range,
+                id_list, access_mode, result, **kwargs)
+            return result
+
+        async def fetch(b):
+            await self._get_cutout_block(
+                resource, resolution, b[0], b[1], b[2],
+                b[3] if time_range else None, id_list, access_mode,
+                result[self.service._block_index(b, x_range, y_range, z_range, time_range)],
+                **kwargs)
+
+        await run_bounded(fetch, blocks, self.session.max_concurrency)
+        return result
+
+    async def _get_cutout_block(
+            self, resource, resolution, x_range, y_range, z_range, time_range,
+            id_list, access_mode, out, **kwargs):
+        req = self.service.get_cutout_request(
+            resource, 'GET', 'application/blosc',
+            self.url_prefix, self.auth,
+            resolution, x_range, y_range, z_range, time_range, access_mode=access_mode,
+            id_list=id_list, **kwargs
+        )
+        # Hack in Accept header for now.
+        req.headers['Accept'] = 'application/blosc'
+        resp = await self.session.send(req)
+
+        if resp.status_code == 200:
+            await run_blocking(self.service.decompress_into, resp.content, out)
+            return
+
+        msg = ('Get cutout failed on {}, got HTTP response: ({}) - {}'.format(
+            resource.name, resp.status_code, resp.text))
+        raise HTTPError(msg, request=req, response=resp)
+
+    @check_channel
+    async def create_cutout(
+            self, resource, resolution, x_range, y_range, z_range, data, time_range=None,
+            compression=None):
+        """Upload a cutout to the volume service.
+
+        Args:
+            resource (intern.resource.boss.resource.ChannelResource): Channel or layer resource.
+            resolution (int): 0 indicates native resolution.
+            x_range (list[int]): x range such as [10, 20] which means x>=10 and x<20.
+            y_range (list[int]): y range such as [10, 20] which means y>=10 and y<20.
+            z_range (list[int]): z range such as [10, 20] which means z>=10 and z<20.
+            data (numpy.array): A 3D or 4D (time) numpy matrix in (time)ZYX order.
+            time_range (optional [list[int]]): time range such as [30, 40] which means t>=30 and t<40.
+            compression (optional intern.utils.compression.BloscSettings): How blocks are
+                compressed.  Defaults to BloscSettings().
+
+        Cuboids whose voxels are all zero are not uploaded.
+
+        Raises:
+            requests.HTTPError on error.
+        """
+        data = np.ascontiguousarray(data)
+        compression = compression or BloscSettings()
+
+        blocks = self.service._plan_upload(
+            data, x_range, y_range, z_range, time_range)
+        if blocks is None:
+            await self._create_cutout_block(
+                resource, resolution, x_range, y_range, z_range, time_range, data,
+                compression)
+            return
+
+        async def upload(b):
+            block = data[self.service._block_index(b, x_range, y_range, z_range, time_range)]
+            await self._create_cutout_block(
+                resource, resolution, b[0], b[1], b[2],
+                b[3] if time_range else None, np.ascontiguousarray(block), compression)
+
+        await run_bounded(upload, blocks, self.session.max_concurrency)
+
+    async def _create_cutout_block(
+            self, resource, resolution, x_range, y_range, z_range, time_range, data,
+            compression):
+        compressed = await run_blocking(compression.compress, data)
+        req = self.service.get_cutout_request(
+            resource, 'POST', 'application/blosc',
+            self.url_prefix, self.auth,
+            resolution, x_range, y_range, z_range, time_range, numpyVolume=compressed)
+        resp = await self.session.send(req)
+
+        if resp.status_code == 201:
+            return
+
+        msg = ('Create cutout failed on {}, got HTTP response: ({}) - {}'.format(
+            resource.name, resp.status_code, resp.text))
+        raise HTTPError(msg, request=req, response=resp)
+
+
+class AsyncProjectService(AsyncBossService):
+    """asyncio version of intern.service.boss.ProjectService."""
+
+    _versions = {'v1': ProjectService_1()}
+
+    async def create(self, resource):
+        """Create the given resource.
+
+        Args:
+            resource (intern.resource.boss.BossResource): Create a data model object with attributes matching those of the resource.
+
+        Returns:
+            (intern.resource.boss.BossResource): Returns resource of type requested on success.
+
+        Raises:
+            requests.HTTPError on failure.
+        """
+        json = self.service._get_resource_params(resource)
+        req = self.service.get_request(
+            resource, 'POST', 'application/json', self.url_prefix, self.auth, json=json)
+        resp = await self.session.send(req)
+
+        if resp.status_code == 201:
+            return self.service._create_resource_from_dict(resource, resp.json())
+
+        err = ('Create failed on {}, got HTTP response: ({}) - {}'.format(
+            resource.name, resp.status_code, resp.text))
+        raise HTTPError(err, request = req, response = resp)
+
+    async def get(self, resource):
+        """Get attributes of the given resource.
+
+        Args:
+            resource (intern.resource.boss.BossResource): Create a data model object with attributes matching those of the resource.
+
+        Returns:
+            (intern.resource.boss.BossResource): Returns resource of type requested on success.
+
+        Raises:
+            requests.HTTPError on failure.
+        """
+        req = self.service.get_request(
+            resource, 'GET', 'application/json', self.url_prefix, self.auth)
+        resp = await self.session.send(req)
+        if resp.status_code == 200:
+            return self.service._create_resource_from_dict(resource, resp.json())
+
+        err = ('Get failed on {}, got HTTP response: ({}) - {}'.format(
+            resource.name, resp.status_code, resp.text))
+        raise HTTPError(err, request = req, response = resp)
+
+    async def delete(self, resource):
+        """Deletes the entity described by the given resource.
+
+        Args:
+            resource (intern.resource.boss.BossResource)
+
+        Raises:
+            requests.HTTPError on a failure.
+        """
+        req = self.service.get_request(
+            resource, 'DELETE', 'application/json', self.url_prefix, self.auth)
+        resp = await self.session.send(req)
+        if resp.status_code == 204:
+            return
+
+        err = ('Delete failed on {}, got HTTP response: ({}) - {}'.format(
+            resource.name, resp.status_code, resp.text))
+        raise HTTPError(err, request = req, response = resp)
+
+
+class AsyncMetadataService(AsyncBossService):
+    """asyncio version of intern.service.boss.MetadataService.
+
+    Operations on several keys send one request per key concurrently.
+    """
+
+    _versions = {'v1': MetadataService_1()}
+
+    async def _send_each(self, resource, method, keys_vals):
+        """Send one metadata request per (key, value) pair concurrently.
+
+        Returns:
+            (list[tuple]): (key, value, request, response) for each pair.
+        """
+        async def send(key, value):
+            req = self.service.get_metadata_request(
+                resource, method, 'application/json', self.url_prefix, self.auth,
+                key, value)
+            return key, value, req, await self.session.send(req)
+
+        return await asyncio.gather(*(send(k, v) for k, v in keys_vals))
+
+    async def list(self, resource):
+        """List metadata keys associated with the given resource.
+
+        Args:
+            resource (intern.resource.boss.BossResource): List keys associated with this resource.
+
+        Returns:
+            (list): List of key names.
+
+        Raises:
+            requests.HTTPError on failure.
+        """
+        req = self.service.get_metadata_request(
+            resource, 'GET', 'application/json', self.url_prefix, self.auth)
+        resp = await self.session.send(req)
+        if resp.status_code == 200:
+            return resp.json()['keys']
+
+        err = ('List failed on {}, got HTTP response: ({}) - {}'.format(
+            resource.name, resp.status_code, resp.text))
+        raise HTTPError(err, request = req, response = resp)
+
+    async def create(self, resource, keys_vals):
+        """Create the given key-value pairs for the given resource.
+
+        Args:
+            resource (intern.resource.boss.BossResource): List keys associated with this resource.
+            keys_vals (dictionary): The metadata to associate with the resource.
+
+        Raises:
+            HTTPErrorList on failure.
+        """
+        exc = HTTPErrorList('At least one key-value create failed.')
+        for key, value, req, resp in await self._send_each(resource, 'POST', keys_vals.items()):
+            if resp.status_code != 201:
+                err = (
+                    'Create failed for {}: {}:{}, got HTTP response: ({}) - {}'
+                    .format(resource.name, key, value, resp.status_code, resp.text))
+                exc.http_errors.append(HTTPError(err, request=req, response=resp))
+
+        if exc.http_errors:
+            raise exc
+
+    async def get(self, resource, keys):
+        """Get metadata key-value pairs associated with the given resource.
+
+        Args:
+            resource (intern.resource.boss.BossResource): Get key-value pairs associated with this resource.
+            keys (list): Keys to retrieve.
+
+        Returns:
+            (dictionary): The requested metadata for the given resource.
+
+        Raises:
+            HTTPErrorList on failure.
+        """
+        resDict = {}
+        exc = HTTPErrorList('At least one key-value update failed.')
+        for key, _, req, resp in await self._send_each(
+                resource, 'GET', [(key, None) for key in keys]):
+            if resp.status_code == 200:
+                resDict[key] = resp.json()['value']
+            else:
+                err = ('Get failed on {}, got HTTP response: ({}) - {}'.format(
+                    resource.name, resp.status_code, resp.text))
+                exc.http_errors.append(HTTPError(err, request=req, response=resp))
+
+        if exc.http_errors:
+            raise exc
+
+        return resDict
+
+    async def update(self, resource, keys_vals):
+        """Update the given key-value pairs for the given resource.
+
+        Args:
+            resource (intern.resource.boss.BossResource): Update values associated with this resource.
+            keys_vals (dictionary): The metadata to update for the resource.
+
+        Raises:
+            HTTPErrorList on failure.
+        """
+        exc = HTTPErrorList('At least one key-value update failed.')
+        for key, value, req, resp in await self._send_each(resource, 'PUT', keys_vals.items()):
+            if resp.status_code != 200:
+                err = (
+                    'Update failed for {}: {}:{}, got HTTP response: ({}) - {}'
+                    .format(resource.name, key, value, resp.status_code, resp.text))
+                exc.http_errors.append(HTTPError(err, request=req, response=resp))
+
+        if exc.http_errors:
+            raise exc
+
+    async def delete(self, resource, keys):
+        """Delete metadata key-value pairs associated with the given resource.
+
+        Args:
+            resource (intern.resource.boss.BossResource): Delete key-value pairs associated with this resource.
+            keys (list): Keys to delete.
+
+        Raises:
+            HTTPErrorList on failure.
+        """
+        exc = HTTPErrorList('At least one key-value update failed.')
+        for key, _, req, resp in await self._send_each(
+                resource, 'DELETE', [(key, None) for key in keys]):
+            if resp.status_code != 204:
+                err = (
+                    'Delete failed for {}: {}, got HTTP response: ({}) - {}'
+                    .format(resource.name, key, resp.status_code, resp.text))
+                exc.http_errors.append(HTTPError(err, request=req, response=resp))
+
+        if exc.http_errors:
+            raise exc
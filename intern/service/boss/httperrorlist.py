@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from requests import HTTPError
+
 
 class HTTPErrorList(Exception):
     """HTTPErrorList stores a list of requests.HTTPError exceptions.
@@ -33,3 +35,38 @@ class HTTPErrorList(Exception):
         for i in self.http_errors:
             lines.append('\t{}'.format(i.__str__()))
         return '\n'.join(lines)
+
+
+class CutoutError(HTTPError):
+    """CutoutError reports the regions of a chunked cutout that failed.
+
+    Chunks that failed with a transient error are retried; this is raised
+    once every chunk has been attempted and some still could not be
+    downloaded.  The rest of the cutout is kept, so the transfer can be
+    resumed by passing this exception back to get_cutout as `resume`.
+
+    Attributes:
+        failed (list): (region, exception) pairs, where region is the
+            [x_range, y_range, z_range(, time_range)] of a failed chunk.
+        result (numpy.ndarray|None): The partially downloaded cutout.
+    """
+
+    def __init__(self, message, failed, result=None):
+        last = failed[-1][1] if failed else None
+        super(CutoutError, self).__init__(
+            message,
+            request=getattr(last, 'request', None),
+            response=getattr(last, 'response', None))
+        self.failed = failed
+        self.result = result
+
+    @property
+    def regions(self):
+        """The [x_range, y_range, z_range(, time_range)] of every failed chunk."""
+        return [region for region, _ in self.failed]
+
+    def __str__(self):
+        lines = [super(CutoutError, self).__str__()]
+        for region, err in self.failed:
+            lines.append('\t{}: {}'.format(region, err))
+        return '\n'.join(lines)
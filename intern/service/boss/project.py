@@ -12,12 +12,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from intern.resource.boss.resource import CoordinateFrameResource
 from intern.service.boss import BossService
 from intern.service.boss.v1.project import ProjectService_1
+import copy
 
 
 class ProjectService(BossService):
     """ProjectService routes calls to the appropriate API version.
+
+    Attributes:
+        resource_cache (intern.utils.cache.TTLCache): If set, the resources
+            returned by get() are cached by route until they expire or are
+            updated or deleted through this service.  Defaults to None.
     """
 
     def __init__(self, base_url, version):
@@ -36,6 +43,35 @@ class ProjectService(BossService):
             'v1': ProjectService_1()
         }
         self.service = self.get_api_impl(version)
+        self.resource_cache = None
+
+    def _cache_key(self, resource):
+        """Key of a resource in the resource cache: its route, under the service that serves it.
+
+        Args:
+            resource (intern.resource.boss.BossResource)
+
+        Returns:
+            (str)
+        """
+        if isinstance(resource, CoordinateFrameResource):
+            return 'coord/' + resource.get_route()
+        return 'collection/' + resource.get_route()
+
+    def _invalidate(self, resource, name=None):
+        """Drop a resource, and the resources beneath it, from the resource cache.
+
+        Args:
+            resource (intern.resource.boss.BossResource)
+            name (optional[string]): The resource's name in the cache, if it differs from resource.name.
+        """
+        if self.resource_cache is None:
+            return
+        if name is not None and name != resource.name:
+            old = copy.copy(resource)
+            old.name = name
+            self.resource_cache.delete_prefix(self._cache_key(old))
+        self.resource_cache.delete_prefix(self._cache_key(resource))
 
     def list_groups(self, filtr=None):
         """Get the groups the logged in user is a member of.
@@ -429,9 +465,21 @@ class ProjectService(BossService):
         Raises:
             requests.HTTPError on failure.
         """
-        return self.service.get(
-            resource, self.url_prefix, self.auth, self.session,
-            self.session_send_opts)
+        cache = self.resource_cache
+        if cache is None:
+            return self.service.get(
+                resource, self.url_prefix, self.auth, self.session,
+                self.session_send_opts)
+
+        key = self._cache_key(resource)
+        result = cache.get(key)
+        if result is None:
+            result = self.service.get(
+                resource, self.url_prefix, self.auth, self.session,
+                self.session_send_opts)
+            cache.put(key, result)
+        # Callers may modify the resource they get back:
+        return copy.deepcopy(result)
 
     def update(self, resource_name, resource):
         """Updates an entity in the data model using the given resource.
@@ -446,9 +494,12 @@ class ProjectService(BossService):
         Raises:
             requests.HTTPError on failure.
         """
-        return self.service.update(
-            resource_name, resource, self.url_prefix, self.auth,
-            self.session, self.session_send_opts)
+        try:
+            return self.service.update(
+                resource_name, resource, self.url_prefix, self.auth,
+                self.session, self.session_send_opts)
+        finally:
+            self._invalidate(resource, resource_name)
     
     def set_public_visibility(self, resource, public: bool):
         """Sets the public visibility of the given resource.
@@ -460,9 +511,12 @@ class ProjectService(BossService):
         Raises:
             requests.HTTPError on failure.
         """
-        self.service.set_public_visibility(
-            resource, public, self.url_prefix, self.auth, self.session,
-            self.session_send_opts)
+        try:
+            self.service.set_public_visibility(
+                resource, public, self.url_prefix, self.auth, self.session,
+                self.session_send_opts)
+        finally:
+            self._invalidate(resource)
 
     def delete(self, resource):
         """Deletes the entity described by the given resource.
@@ -473,7 +527,10 @@ class ProjectService(BossService):
         Raises:
             requests.HTTPError on failure.
         """
-        self.service.delete(
-            resource, self.url_prefix, self.auth, self.session,
-            self.session_send_opts)
+        try:
+            self.service.delete(
+                resource, self.url_prefix, self.auth, self.session,
+                self.session_send_opts)
+        finally:
+            self._invalidate(resource)
             
\ No newline at end of file
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 from intern.service.service import Service
-from requests import Session
+from intern.utils.sessions import sessions
 
 
 class BossService(Service):
@@ -22,25 +22,35 @@ class BossService(Service):
     Attributes:
         _versions (dictionary): Stores supported versions of the Boss API.
         _session (requests.Session): The HTTP session used for each service.
+            Shared with every other service of the same host and token (see
+            intern.utils.sessions); fetched from the registry on first use.
+        _pool_maxsize (int|None): Connections this service may use at once.
+            The shared session's pool is grown to fit it.
         _session_send_opts (dictionary): Options to use when sending requests.  See http://docs.python-requests.org/en/master/api/#sessionapi
     """
 
     def __init__(self):
         Service.__init__(self)
         self._versions = {}
-        self._session = Session()
-        self._session_send_opts = self._session.merge_environment_settings(None, {}, None, None, None)
+        self._session = None
+        self._session_send_opts = None
+        self._pool_maxsize = None
 
     def __del__(self):
-        if self._session is not None:
-            self._session.close()
+        # The session belongs to the registry and outlives this service.
+        self._session = None
 
     @property
     def session(self):
+        if self._session is None:
+            self._session = sessions.get(
+                self.base_url, self._auth, self._pool_maxsize)
         return self._session
 
     @property
     def session_send_opts(self):
+        if self._session_send_opts is None:
+            self._session_send_opts = self.session.merge_environment_settings(None, {}, None, None, None)
         return self._session_send_opts
 
     @session_send_opts.setter
@@ -54,6 +64,8 @@ class BossService(Service):
             token (string):  Token generated by the Django Rest Framework.
         """
         self._auth = token
+        # Sessions are shared per token, so a new token needs another one.
+        self._session = None
 
     def get_api_impl(self, version):
         """Get service object that implements the given version.
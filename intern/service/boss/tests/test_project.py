@@ -0,0 +1,67 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from intern.remote.boss import LATEST_VERSION
+from intern.resource.boss import (
+    ChannelResource, CollectionResource, CoordinateFrameResource)
+from intern.service.boss.project import ProjectService
+from intern.utils.cache import TTLCache
+from unittest.mock import Mock
+import unittest
+
+
+class TestProjectServiceResourceCache(unittest.TestCase):
+    """
+    Test the resource cache of the ProjectService class that is common to all
+    API versions.
+    """
+
+    def setUp(self):
+        self.ps = ProjectService('some.host.name', LATEST_VERSION)
+        self.ps.service = Mock()
+        self.ps.service.get.side_effect = lambda resource, *args: resource
+        self.ps.resource_cache = TTLCache()
+        self.chan = ChannelResource('chan', 'coll', 'exp')
+
+    def test_get_is_cached(self):
+        first = self.ps.get(self.chan)
+        second = self.ps.get(ChannelResource('chan', 'coll', 'exp'))
+        self.assertEqual(1, self.ps.service.get.call_count)
+        self.assertEqual('chan', second.name)
+        # Each caller gets its own copy:
+        self.assertIsNot(first, second)
+        self.assertEqual(
+            {'hits': 1, 'misses': 1, 'invalidations': 0, 'entries': 1},
+            self.ps.resource_cache.stats())
+
+    def test_coordinate_frames_and_collections_do_not_collide(self):
+        self.ps.get(CollectionResource('frame'))
+        self.ps.get(CoordinateFrameResource('frame'))
+        self.assertEqual(2, self.ps.service.get.call_count)
+
+    def test_delete_invalidates_children(self):
+        self.ps.get(self.chan)
+        self.ps.delete(CollectionResource('coll'))
+        self.ps.get(self.chan)
+        self.assertEqual(2, self.ps.service.get.call_count)
+
+    def test_update_invalidates_old_name(self):
+        self.ps.get(self.chan)
+        self.ps.update('chan', ChannelResource('renamed', 'coll', 'exp'))
+        self.ps.get(self.chan)
+        self.assertEqual(2, self.ps.service.get.call_count)
+
+    def test_disabled_by_default(self):
+        ps = ProjectService('some.host.name', LATEST_VERSION)
+        self.assertIsNone(ps.resource_cache)
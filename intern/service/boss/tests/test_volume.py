@@ -15,6 +15,10 @@
 from intern.remote.boss import LATEST_VERSION
 from intern.resource.boss import ChannelResource, PartialChannelResourceError
 from intern.service.boss.volume import VolumeService
+from intern.utils.compression import BloscSettings
+from intern.utils.sessions import sessions
+from unittest.mock import patch
+import blosc
 import numpy as np
 import unittest
 
@@ -25,6 +29,8 @@ class TestVolumeService(unittest.TestCase):
     """
 
     def setUp(self):
+        # Start each test from fresh shared sessions.
+        sessions.close()
         self.vs = VolumeService('some.host.name', LATEST_VERSION)
 
     def test_given_invalid_channel(self):
@@ -39,3 +45,40 @@ class TestVolumeService(unittest.TestCase):
             vol = np.ones((100, 100, 100))
             self.vs.create_cutout(
                 chan, 0, [0, 100], [0, 100], [0, 100], vol)
+
+    def test_executor_is_reused(self):
+        self.assertIs(self.vs.executor, self.vs.executor)
+
+    def test_set_max_workers_resizes_pools(self):
+        old_executor = self.vs.executor
+        workers = self.vs.max_workers + 8
+        self.vs.max_workers = workers
+        self.assertEqual(workers, self.vs.max_workers)
+        self.assertIsNot(old_executor, self.vs.executor)
+        self.assertEqual(
+            workers, self.vs.session.get_adapter('https://some.host.name')._pool_maxsize)
+
+    def test_set_max_workers_never_shrinks_shared_pool(self):
+        other = VolumeService('some.host.name', LATEST_VERSION, max_workers=64)
+        self.vs.max_workers = 2
+        self.assertIs(other.session, self.vs.session)
+        self.assertEqual(
+            64, self.vs.session.get_adapter('https://some.host.name')._pool_maxsize)
+
+    def test_compression_nthreads_applied_once_and_restored(self):
+        previous = blosc.set_nthreads(2)
+        try:
+            self.vs.compression = BloscSettings(nthreads=3)
+            self.assertEqual(3, blosc.set_nthreads(3))
+            with patch('blosc.set_nthreads') as set_nthreads:
+                self.vs.compression.compress(np.ones(100, dtype='uint8'))
+            set_nthreads.assert_not_called()
+
+            self.vs.compression = BloscSettings()
+            self.assertEqual(2, blosc.set_nthreads(2))
+        finally:
+            blosc.set_nthreads(previous)
+
+    def test_set_max_workers_invalid(self):
+        with self.assertRaises(ValueError):
+            self.vs.max_workers = 0
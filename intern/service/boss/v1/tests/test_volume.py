@@ -16,9 +16,20 @@ from intern.service.boss.v1.volume import VolumeService_1
 from intern.service.boss import BaseVersion
 from intern.service.boss.v1.volume import CacheMode
 from intern.resource.boss.resource import ChannelResource
+from intern.service.boss.httperrorlist import CutoutError
+from intern.utils.autotune import CutoutAutotuner
+from intern.utils.cache import DiskCache, MemoryCache
+from intern.utils.compression import BloscSettings
+from intern.utils.retry import RetryPolicy
+from intern.utils.journal import UploadJournal
 import blosc
 import numpy
 from requests import HTTPError, PreparedRequest, Response, Session
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import shared_memory
+import os
+import re
+import tempfile
 import unittest
 from unittest.mock import patch, ANY
 
@@ -29,6 +40,44 @@ class TestVolume_v1(unittest.TestCase):
         self.chan = ChannelResource('chan', 'foo', 'bar', 'image', datatype='uint16')
         self.anno_chan = ChannelResource('anno_chan', 'foo', 'bar', 'annotation', datatype='uint64', sources=['chan'])
 
+    def serve_cutouts(self, mock_session, volume, error=None):
+        """Make mock_session answer each cutout GET with the matching region
+        of volume, a (time)ZYX array whose origin is at (0, 0, 0).
+
+        Args:
+            error (optional callable): Called with the ranges of each request;
+                if it returns a status code, that error is served instead.
+
+        Returns:
+            (list): The (x_range, y_range, z_range[, time_range]) of every
+                request served.
+        """
+        served = []
+        mock_session.prepare_request.side_effect = lambda req: req
+
+        def send(req, **kwargs):
+            ranges = [
+                [int(i) for i in rng.split(':')]
+                for rng in re.findall(r'/(\d+:\d+)', req.url)
+            ]
+            served.append(tuple(ranges))
+            index = tuple(slice(*rng) for rng in reversed(ranges))
+            resp = Response()
+            status = error(ranges) if error else None
+            if status:
+                resp.status_code = status
+                resp.headers['Retry-After'] = '0'
+                resp._content = b'try again'
+                return resp
+            resp.status_code = 200
+            resp._content = blosc.compress(
+                numpy.ascontiguousarray(volume[index]),
+                typesize=volume.dtype.itemsize)
+            return resp
+
+        mock_session.send.side_effect = send
+        return served
+
     @patch('requests.Session', autospec=True)
     def test_create_cutout_success(self, mock_session):
         resolution = 0
@@ -122,6 +171,625 @@ class TestVolume_v1(unittest.TestCase):
 
         numpy.testing.assert_array_equal(data, actual)
 
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_parallel_chunks_reassembled(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (40, 600, 600), numpy.uint16)
+        served = self.serve_cutouts(mock_session, volume)
+
+        actual = self.vol.get_cutout(
+            self.chan, 0, [10, 590], [5, 600], [1, 40], None, [],
+            'https://api.theboss.io', 'mytoken', mock_session, {},
+            parallel=3, chunk_size=(512, 512, 16))
+
+        numpy.testing.assert_array_equal(volume[1:40, 5:600, 10:590], actual)
+        self.assertEqual(12, len(served))
+
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_into_memmap(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (40, 600, 600), numpy.uint16)
+        self.serve_cutouts(mock_session, volume)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            out = numpy.memmap(
+                os.path.join(tmp, 'cutout.raw'), dtype=numpy.uint16, mode='w+', shape=(39, 595, 580))
+            actual = self.vol.get_cutout(
+                self.chan, 0, [10, 590], [5, 600], [1, 40], None, [],
+                'https://api.theboss.io', 'mytoken', mock_session, {},
+                parallel=3, chunk_size=(512, 512, 16), out=out)
+
+            self.assertIs(out, actual)
+            numpy.testing.assert_array_equal(volume[1:40, 5:600, 10:590], out)
+            del out, actual
+
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_into_shared_memory(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (16, 64, 64), numpy.uint16)
+        self.serve_cutouts(mock_session, volume)
+
+        shm = shared_memory.SharedMemory(create=True, size=volume.nbytes)
+        try:
+            actual = self.vol.get_cutout(
+                self.chan, 0, [0, 64], [0, 64], [0, 16], None, [],
+                'https://api.theboss.io', 'mytoken', mock_session, {},
+                parallel=False, out=shm.buf)
+
+            numpy.testing.assert_array_equal(volume, actual)
+            numpy.testing.assert_array_equal(
+                volume, numpy.ndarray(volume.shape, numpy.uint16, buffer=shm.buf))
+            del actual
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def test_get_cutout_out_mismatch(self):
+        for out in (numpy.empty((16, 64, 32), numpy.uint16),
+                    numpy.empty((16, 64, 64), numpy.uint8),
+                    bytearray(10)):
+            with self.assertRaises(ValueError):
+                self.vol.get_cutout(
+                    self.chan, 0, [0, 64], [0, 64], [0, 16], None, [],
+                    'https://api.theboss.io', 'mytoken', None, {}, out=out)
+
+        readonly = numpy.empty((16, 64, 64), numpy.uint16)
+        readonly.flags.writeable = False
+        with self.assertRaises(ValueError):
+            self.vol.get_cutout(
+                self.chan, 0, [0, 64], [0, 64], [0, 16], None, [],
+                'https://api.theboss.io', 'mytoken', None, {}, out=readonly)
+
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_autotune(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (64, 600, 600), numpy.uint16)
+        served = self.serve_cutouts(mock_session, volume)
+        tuner = CutoutAutotuner(initial_chunk_size=(512, 512, 16), max_workers=4)
+
+        actual = self.vol.get_cutout(
+            self.chan, 0, [0, 600], [0, 600], [0, 64], None, [],
+            'https://api.theboss.io', 'mytoken', mock_session, {},
+            parallel=4, autotune=tuner)
+
+        numpy.testing.assert_array_equal(volume, actual)
+        self.assertEqual(16, len(served))
+        best = tuner.best('https://api.theboss.io')
+        self.assertEqual((512, 512, 16), best['chunk_size'])
+        self.assertEqual((512, 512, 32), tuner.chunk_size('https://api.theboss.io', 2))
+
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_autotune_keeps_explicit_chunk_size(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (64, 600, 600), numpy.uint16)
+        served = self.serve_cutouts(mock_session, volume)
+        tuner = CutoutAutotuner(initial_chunk_size=(512, 512, 16))
+
+        self.vol.get_cutout(
+            self.chan, 0, [0, 600], [0, 600], [0, 64], None, [],
+            'https://api.theboss.io', 'mytoken', mock_session, {},
+            parallel=4, autotune=tuner, chunk_size=(512, 512, 64))
+
+        self.assertEqual(4, len(served))
+
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_retries_failed_chunks(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (32, 600, 600), numpy.uint16)
+        attempts = {'count': 0}
+
+        def error(ranges):
+            if ranges[0][0] == 512 and ranges[2][0] == 16 and attempts['count'] < 2:
+                attempts['count'] += 1
+                return 503
+        served = self.serve_cutouts(mock_session, volume, error)
+
+        actual = self.vol.get_cutout(
+            self.chan, 0, [0, 600], [0, 600], [0, 32], None, [],
+            'https://api.theboss.io', 'mytoken', mock_session, {},
+            parallel=2, chunk_size=(512, 512, 16), retry=RetryPolicy(backoff=0))
+
+        numpy.testing.assert_array_equal(volume, actual)
+        self.assertEqual(8 + 2, len(served))
+        self.assertEqual(3, served.count(([512, 600], [0, 512], [16, 32])))
+
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_reports_and_resumes_failed_chunks(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (32, 600, 600), numpy.uint16)
+        down = {'503': True}
+
+        def error(ranges):
+            if ranges[0][0] == 512 and ranges[1][0] == 512 and down['503']:
+                return 503
+        served = self.serve_cutouts(mock_session, volume, error)
+
+        with self.assertRaises(CutoutError) as err:
+            self.vol.get_cutout(
+                self.chan, 0, [0, 600], [0, 600], [0, 32], None, [],
+                'https://api.theboss.io', 'mytoken', mock_session, {},
+                parallel=2, chunk_size=(512, 512, 16), retry=RetryPolicy(retries=1, backoff=0))
+
+        self.assertEqual(
+            [[[512, 600], [512, 600], [0, 16]], [[512, 600], [512, 600], [16, 32]]],
+            sorted(err.exception.regions))
+        self.assertEqual(503, err.exception.response.status_code)
+        self.assertEqual(6 + 2 * 2, len(served))
+        numpy.testing.assert_array_equal(volume[:, :512], err.exception.result[:, :512])
+
+        down['503'] = False
+        del served[:]
+        actual = self.vol.get_cutout(
+            self.chan, 0, [0, 600], [0, 600], [0, 32], None, [],
+            'https://api.theboss.io', 'mytoken', mock_session, {},
+            parallel=2, chunk_size=(512, 512, 16), resume=err.exception)
+
+        self.assertIs(err.exception.result, actual)
+        numpy.testing.assert_array_equal(volume, actual)
+        self.assertEqual(2, len(served))
+
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_does_not_retry_client_errors(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (32, 600, 600), numpy.uint16)
+        served = self.serve_cutouts(mock_session, volume, lambda ranges: 403)
+
+        with self.assertRaises(HTTPError) as err:
+            self.vol.get_cutout(
+                self.chan, 0, [0, 600], [0, 600], [0, 32], None, [],
+                'https://api.theboss.io', 'mytoken', mock_session, {},
+                parallel=False, chunk_size=(512, 512, 16), retry=RetryPolicy(backoff=0))
+
+        self.assertNotIsInstance(err.exception, CutoutError)
+        self.assertEqual(1, len(served))
+
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_without_retry_raises_first_failure(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (32, 600, 600), numpy.uint16)
+        served = self.serve_cutouts(mock_session, volume, lambda ranges: 503)
+
+        with self.assertRaises(HTTPError) as err:
+            self.vol.get_cutout(
+                self.chan, 0, [0, 600], [0, 600], [0, 32], None, [],
+                'https://api.theboss.io', 'mytoken', mock_session, {},
+                parallel=False, chunk_size=(512, 512, 16))
+
+        self.assertNotIsInstance(err.exception, CutoutError)
+        self.assertEqual(503, err.exception.response.status_code)
+        self.assertEqual(1, len(served))
+
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_cache_serves_repeated_reads(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (40, 600, 600), numpy.uint16)
+        served = self.serve_cutouts(mock_session, volume)
+        bounds = [[0, 600], [0, 600], [0, 40]]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = DiskCache(tmp)
+            for _ in range(2):
+                actual = self.vol.get_cutout(
+                    self.chan, 0, [10, 590], [20, 530], [5, 35], None, [],
+                    'https://api.theboss.io', 'mytoken', mock_session, {},
+                    parallel=False, chunk_size=(512, 512, 32),
+                    cache=cache, cache_bounds=bounds)
+                numpy.testing.assert_array_equal(volume[5:35, 20:530, 10:590], actual)
+
+            # The first read fetched 4 columns of 3 cuboids in runs of at most
+            # 2, with edge cuboids fetched whole (clipped to the bounds); the
+            # second read was served from the cache:
+            self.assertEqual(8, len(served))
+            self.assertIn(([512, 600], [512, 600], [32, 40]), served)
+            self.assertEqual(12, len(cache))
+            self.assertEqual(12, cache.hits)
+
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_cache_fetches_only_missing_cuboids(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (48, 512, 512), numpy.uint16)
+        served = self.serve_cutouts(mock_session, volume)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = DiskCache(tmp)
+            self.vol.get_cutout(
+                self.chan, 0, [0, 512], [0, 512], [0, 32], None, [],
+                'https://api.theboss.io', 'mytoken', mock_session, {},
+                parallel=False, cache=cache)
+            actual = self.vol.get_cutout(
+                self.chan, 0, [0, 512], [0, 512], [16, 48], None, [],
+                'https://api.theboss.io', 'mytoken', mock_session, {},
+                parallel=False, cache=cache)
+
+        numpy.testing.assert_array_equal(volume[16:48], actual)
+        self.assertEqual(
+            [([0, 512], [0, 512], [0, 32]), ([0, 512], [0, 512], [32, 48])], served)
+
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_memory_cache_reuses_overlapping_slices(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (128, 64, 64), numpy.uint16)
+        served = self.serve_cutouts(mock_session, volume)
+        cache = MemoryCache()
+        bounds = [[0, 64], [0, 64], [0, 128]]
+
+        for z_range in ([100, 110], [105, 115]):
+            actual = self.vol.get_cutout(
+                self.chan, 0, [0, 64], [0, 64], z_range, None, [],
+                'https://api.theboss.io', 'mytoken', mock_session, {},
+                parallel=False, cache=cache, cache_bounds=bounds)
+            numpy.testing.assert_array_equal(volume[z_range[0]:z_range[1]], actual)
+
+        self.assertEqual(
+            [([0, 64], [0, 64], [96, 112]), ([0, 64], [0, 64], [112, 128])], served)
+        self.assertEqual(1, cache.hits)
+
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_cache_bypassed_for_other_access_modes(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (16, 64, 64), numpy.uint16)
+        served = self.serve_cutouts(mock_session, volume)
+        cache = MemoryCache()
+        bounds = [[0, 64], [0, 64], [0, 16]]
+
+        for mode in (CacheMode.no_cache, CacheMode.raw, CacheMode.cache):
+            actual = self.vol.get_cutout(
+                self.chan, 0, [0, 64], [0, 64], [0, 16], None, [],
+                'https://api.theboss.io', 'mytoken', mock_session, {},
+                access_mode=mode, parallel=False, cache=cache, cache_bounds=bounds)
+            numpy.testing.assert_array_equal(volume, actual)
+
+        # Only the default mode reads and fills the cache:
+        self.assertEqual(3, len(served))
+        self.assertEqual((0, 1), (cache.hits, cache.misses))
+
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_cache_skips_partial_cuboids_without_bounds(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (16, 512, 512), numpy.uint16)
+        served = self.serve_cutouts(mock_session, volume)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = DiskCache(tmp)
+            for _ in range(2):
+                actual = self.vol.get_cutout(
+                    self.chan, 0, [100, 200], [100, 200], [0, 16], None, [],
+                    'https://api.theboss.io', 'mytoken', mock_session, {},
+                    parallel=False, cache=cache)
+            self.assertEqual(0, len(cache))
+
+        numpy.testing.assert_array_equal(volume[:, 100:200, 100:200], actual)
+        self.assertEqual(2, len(served))
+
+    @patch('requests.Session', autospec=True)
+    def test_iter_cutout_reports_failed_blocks_last(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (32, 64, 64), numpy.uint16)
+        self.serve_cutouts(
+            mock_session, volume, lambda ranges: 429 if ranges[2][0] == 0 else None)
+
+        blocks = []
+        with self.assertRaises(CutoutError) as err:
+            for b, data in self.vol.iter_cutout(
+                    self.chan, 0, [0, 64], [0, 64], [0, 32], None, [],
+                    'https://api.theboss.io', 'mytoken', mock_session, {},
+                    parallel=False, chunk_size=(512, 512, 16),
+                    retry=RetryPolicy(retries=2, backoff=0)):
+                blocks.append(b)
+
+        self.assertEqual([[[0, 64], [0, 64], [16, 32]]], blocks)
+        self.assertEqual([[[0, 64], [0, 64], [0, 16]]], err.exception.regions)
+
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_chunks_are_cuboid_aligned(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (40, 600, 600), numpy.uint16)
+        served = self.serve_cutouts(mock_session, volume)
+
+        self.vol.get_cutout(
+            self.chan, 0, [10, 590], [5, 600], [1, 40], None, [],
+            'https://api.theboss.io', 'mytoken', mock_session, {},
+            parallel=False, chunk_size=(500, 500, 10))
+
+        for xs, ys, zs in served:
+            self.assertTrue(xs[0] in (10, 512) and xs[1] in (512, 590))
+            self.assertTrue(ys[0] in (5, 512) and ys[1] in (512, 600))
+            self.assertTrue(zs[0] in (1, 16, 32) and zs[1] in (16, 32, 40))
+
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_parallel_uses_given_executor(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (16, 512, 1024), numpy.uint16)
+        self.serve_cutouts(mock_session, volume)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with patch.object(executor, 'submit', wraps=executor.submit) as submit_spy:
+                actual = self.vol.get_cutout(
+                    self.chan, 0, [0, 1024], [0, 512], [0, 16], None, [],
+                    'https://api.theboss.io', 'mytoken', mock_session, {},
+                    chunk_size=(512, 512, 16), executor=executor)
+                self.assertEqual(2, submit_spy.call_count)
+
+        numpy.testing.assert_array_equal(volume, actual)
+
+    @patch('requests.Session', autospec=True)
+    def test_get_cutout_time_series_chunked_over_time(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (12, 16, 256, 512), numpy.uint16)
+        served = self.serve_cutouts(mock_session, volume)
+
+        actual = self.vol.get_cutout(
+            self.chan, 0, [0, 512], [0, 256], [0, 16], [2, 12], [],
+            'https://api.theboss.io', 'mytoken', mock_session, {},
+            parallel=2, chunk_size=(512, 512, 16), time_chunk_size=3)
+
+        numpy.testing.assert_array_equal(volume[2:12], actual)
+        self.assertEqual(
+            [[2, 5], [5, 8], [8, 11], [11, 12]],
+            sorted(ranges[3] for ranges in served))
+
+    @patch('requests.Session', autospec=True)
+    def test_create_cutout_time_series_chunked_over_time(self, mock_session):
+        data = numpy.ones((5, 16, 1024, 1024), numpy.uint8)
+        mock_session.prepare_request.side_effect = lambda req: req
+        fake_response = Response()
+        fake_response.status_code = 201
+        mock_session.send.return_value = fake_response
+
+        with patch.object(
+                BaseVersion, 'get_cutout_request', autospec=True,
+                wraps=BaseVersion.get_cutout_request) as req_spy:
+            self.vol.create_cutout(
+                self.chan, 0, [0, 1024], [0, 1024], [0, 16], [0, 5], data,
+                'https://api.theboss.io', 'mytoken', mock_session, {})
+            time_ranges = sorted(call[0][10] for call in req_spy.call_args_list)
+
+        self.assertEqual([[0, 2], [2, 4], [4, 5]], time_ranges)
+
+    def accept_uploads(self, mock_session, uploaded):
+        """Make mock_session accept each cutout POST by writing it into
+        uploaded, a ZYX array whose origin is at (0, 0, 0).
+
+        Returns:
+            (list): The [x_range, y_range, z_range] of every request.
+        """
+        posted = []
+        mock_session.prepare_request.side_effect = lambda req: req
+
+        def send(req, **kwargs):
+            ranges = [
+                [int(i) for i in rng.split(':')]
+                for rng in re.findall(r'/(\d+:\d+)', req.url)
+            ]
+            posted.append(ranges)
+            index = tuple(slice(*rng) for rng in reversed(ranges))
+            uploaded[index] = numpy.frombuffer(
+                blosc.decompress(req.data), uploaded.dtype).reshape(uploaded[index].shape)
+            resp = Response()
+            resp.status_code = 201
+            return resp
+
+        mock_session.send.side_effect = send
+        return posted
+
+    @patch('requests.Session', autospec=True)
+    def test_create_cutout_uploads_blocks_in_parallel(self, mock_session):
+        data = numpy.random.randint(1, 255, (32, 1024, 1024), numpy.uint8)
+        data[16:, :512, :512] = 0
+        uploaded = numpy.zeros_like(data)
+        posted = self.accept_uploads(mock_session, uploaded)
+
+        self.vol.create_cutout(
+            self.chan, 0, [0, 1024], [0, 1024], [0, 32], None, data,
+            'https://api.theboss.io', 'mytoken', mock_session, {},
+            parallel=3, chunk_size=(512, 512, 16))
+
+        numpy.testing.assert_array_equal(data, uploaded)
+        # The empty block is skipped:
+        self.assertEqual(8 - 1, len(posted))
+        self.assertNotIn([[0, 512], [0, 512], [16, 32]], posted)
+
+    @patch('requests.Session', autospec=True)
+    def test_create_cutout_skips_empty_cuboids(self, mock_session):
+        data = numpy.zeros((16, 100, 2048), numpy.uint64)
+        data[3, 50, 0:10] = 7
+        data[9, 20, 2000] = 9
+        uploaded = numpy.zeros_like(data)
+        posted = self.accept_uploads(mock_session, uploaded)
+
+        self.vol.create_cutout(
+            self.chan, 0, [0, 2048], [0, 100], [0, 16], None, data,
+            'https://api.theboss.io', 'mytoken', mock_session, {})
+
+        numpy.testing.assert_array_equal(data, uploaded)
+        self.assertEqual(
+            [[[0, 512], [0, 100], [0, 16]], [[1536, 2048], [0, 100], [0, 16]]], sorted(posted))
+
+    @patch('requests.Session', autospec=True)
+    def test_create_cutout_merges_occupied_cuboids(self, mock_session):
+        data = numpy.zeros((16, 512, 3072), numpy.uint8)
+        data[:, :, :10] = 1
+        data[:, :, 1600:2100] = 1
+        uploaded = numpy.zeros_like(data)
+        posted = self.accept_uploads(mock_session, uploaded)
+
+        self.vol.create_cutout(
+            self.chan, 0, [0, 3072], [0, 512], [0, 16], None, data,
+            'https://api.theboss.io', 'mytoken', mock_session, {}, parallel=False)
+
+        numpy.testing.assert_array_equal(data, uploaded)
+        self.assertEqual(
+            [[[0, 512], [0, 512], [0, 16]], [[1536, 2560], [0, 512], [0, 16]]], posted)
+
+    def test_plan_upload_merges_cuboids_along_y_and_z(self):
+        data = numpy.zeros((32, 1024, 2048), numpy.uint8)
+        data[:, :, 100] = 1
+
+        blocks = self.vol._plan_upload(data, [0, 2048], [0, 1024], [0, 32], None)
+
+        # One request covers the occupied column of cuboids; the empty block
+        # is skipped:
+        self.assertEqual([[[0, 512], [0, 1024], [0, 32]]], blocks)
+
+    def test_plan_upload_keeps_mostly_occupied_blocks_whole(self):
+        data = numpy.ones((32, 1024, 1024), numpy.uint8)
+        data[16:, 512:, 512:] = 0
+        blocks = self.vol._plan_upload(data, [0, 1024], [0, 1024], [0, 32], None)
+        self.assertEqual([[[0, 1024], [0, 1024], [0, 32]]], blocks)
+
+        data[:, 512:, :] = 0
+        blocks = self.vol._plan_upload(data, [0, 1024], [0, 1024], [0, 32], None)
+        self.assertEqual([[[0, 1024], [0, 512], [0, 32]]], blocks)
+
+    def test_get_bit_width_is_deprecated(self):
+        with self.assertWarns(DeprecationWarning):
+            self.assertEqual(16, self.vol.get_bit_width(self.chan))
+
+    @patch('requests.Session', autospec=True)
+    def test_create_cutout_does_not_overflow(self, mock_session):
+        # These voxels sum to 0 in uint64:
+        data = numpy.zeros((16, 16, 16), numpy.uint64)
+        data[0, 0, :2] = 2 ** 63
+        uploaded = numpy.zeros_like(data)
+        posted = self.accept_uploads(mock_session, uploaded)
+
+        self.vol.create_cutout(
+            self.chan, 0, [0, 16], [0, 16], [0, 16], None, data,
+            'https://api.theboss.io', 'mytoken', mock_session, {})
+        self.assertEqual(1, len(posted))
+
+        del posted[:]
+        self.vol.create_cutout(
+            self.chan, 0, [0, 16], [0, 16], [0, 16], None, numpy.zeros_like(data),
+            'https://api.theboss.io', 'mytoken', mock_session, {})
+        self.assertEqual([], posted)
+
+    @patch('requests.Session', autospec=True)
+    def test_create_cutout_compression_settings(self, mock_session):
+        data = numpy.random.randint(1, 3000, (16, 64, 64), numpy.uint64)
+        mock_session.prepare_request.side_effect = lambda req: req
+        bodies = []
+
+        def send(req, **kwargs):
+            bodies.append(req.data)
+            resp = Response()
+            resp.status_code = 201
+            return resp
+        mock_session.send.side_effect = send
+
+        self.vol.create_cutout(
+            self.anno_chan, 0, [0, 64], [0, 64], [0, 16], None, data,
+            'https://api.theboss.io', 'mytoken', mock_session, {},
+            compression=BloscSettings(cname='zstd'))
+
+        # The typesize in the blosc header is in bytes, not bits:
+        self.assertEqual(8, bodies[0][3])
+        self.assertEqual('Zstd', blosc.get_clib(bodies[0]))
+        self.assertEqual(data.tobytes(), blosc.decompress(bodies[0]))
+
+    @patch('requests.Session', autospec=True)
+    def test_create_cutout_retries_failed_blocks(self, mock_session):
+        data = numpy.ones((48, 512, 512), numpy.uint8)
+        mock_session.prepare_request.side_effect = lambda req: req
+        statuses = [503, 201, 201, 201]
+
+        def send(req, **kwargs):
+            resp = Response()
+            resp.status_code = statuses.pop(0)
+            return resp
+        mock_session.send.side_effect = send
+
+        self.vol.create_cutout(
+            self.chan, 0, [0, 512], [0, 512], [0, 48], None, data,
+            'https://api.theboss.io', 'mytoken', mock_session, {},
+            parallel=False, chunk_size=(512, 512, 16), retry=RetryPolicy(backoff=0))
+
+        self.assertEqual([], statuses)
+
+    @patch('requests.Session', autospec=True)
+    def test_create_cutout_resumes_from_journal(self, mock_session):
+        data = numpy.ones((48, 512, 512), numpy.uint8)
+        uploaded = numpy.zeros_like(data)
+        posted = self.accept_uploads(mock_session, uploaded)
+        send = mock_session.send.side_effect
+
+        def fail_third(req, **kwargs):
+            if len(posted) == 2:
+                resp = Response()
+                resp.status_code = 403
+                return resp
+            return send(req, **kwargs)
+        mock_session.send.side_effect = fail_third
+
+        with tempfile.TemporaryDirectory() as tmp:
+            journal = UploadJournal(os.path.join(tmp, 'upload.journal'))
+            with self.assertRaises(HTTPError):
+                self.vol.create_cutout(
+                    self.chan, 0, [0, 512], [0, 512], [0, 48], None, data,
+                    'https://api.theboss.io', 'mytoken', mock_session, {},
+                    parallel=False, chunk_size=(512, 512, 16), journal=journal)
+
+            mock_session.send.side_effect = send
+            self.vol.create_cutout(
+                self.chan, 0, [0, 512], [0, 512], [0, 48], None, data,
+                'https://api.theboss.io', 'mytoken', mock_session, {},
+                parallel=False, chunk_size=(512, 512, 16),
+                journal=UploadJournal(journal.path))
+
+        numpy.testing.assert_array_equal(data, uploaded)
+        self.assertEqual(
+            [[[0, 512], [0, 512], [0, 16]],
+             [[0, 512], [0, 512], [16, 32]],
+             [[0, 512], [0, 512], [32, 48]]], posted)
+
+    @patch('requests.Session', autospec=True)
+    def test_iter_cutout_yields_every_block(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (40, 600, 600), numpy.uint16)
+        self.serve_cutouts(mock_session, volume)
+
+        result = numpy.zeros_like(volume)
+        count = 0
+        for b, data in self.vol.iter_cutout(
+                self.chan, 0, [10, 590], [5, 600], [1, 40], None, [],
+                'https://api.theboss.io', 'mytoken', mock_session, {},
+                parallel=2, chunk_size=(512, 512, 16)):
+            result[b[2][0]:b[2][1], b[1][0]:b[1][1], b[0][0]:b[0][1]] = data
+            count += 1
+
+        self.assertEqual(12, count)
+        numpy.testing.assert_array_equal(
+            volume[1:40, 5:600, 10:590], result[1:40, 5:600, 10:590])
+
+    @patch('requests.Session', autospec=True)
+    def test_iter_cutout_stops_early(self, mock_session):
+        volume = numpy.random.randint(0, 3000, (48, 64, 64), numpy.uint16)
+        served = self.serve_cutouts(mock_session, volume)
+
+        blocks = self.vol.iter_cutout(
+            self.chan, 0, [0, 64], [0, 64], [0, 48], None, [],
+            'https://api.theboss.io', 'mytoken', mock_session, {},
+            parallel=False, chunk_size=(512, 512, 16))
+        next(blocks)
+        blocks.close()
+
+        self.assertEqual(1, len(served))
+
+    @patch('requests.Session', autospec=True)
+    def test_iter_cutout_rejects_get_cutout_options(self, mock_session):
+        served = self.serve_cutouts(
+            mock_session, numpy.zeros((16, 64, 64), numpy.uint16))
+        args = (
+            self.chan, 0, [0, 64], [0, 64], [0, 16], None, [],
+            'https://api.theboss.io', 'mytoken', mock_session, {})
+
+        for option in ('out', 'resume', 'cache', 'cache_bounds'):
+            with self.assertRaisesRegex(ValueError, option):
+                self.vol.iter_cutout(*args, **{option: None})
+        with self.assertRaisesRegex(TypeError, 'bogus'):
+            self.vol.iter_cutout(*args, bogus=1)
+        self.assertEqual([], served)
+
+    def test_decompress_into_contiguous(self):
+        data = numpy.random.randint(0, 3000, (4, 5, 6), numpy.uint16)
+        out = numpy.zeros((4, 5, 6), numpy.uint16)
+        self.vol.decompress_into(blosc.compress(data, typesize=2), out)
+        numpy.testing.assert_array_equal(data, out)
+
+    def test_decompress_into_view(self):
+        data = numpy.random.randint(0, 3000, (4, 5, 6), numpy.uint16)
+        out = numpy.zeros((4, 10, 12), numpy.uint16)
+        self.vol.decompress_into(blosc.compress(data, typesize=2), out[:, 5:, 6:])
+        numpy.testing.assert_array_equal(data, out[:, 5:, 6:])
+        self.assertEqual(0, out[:, :5, :].sum())
+
+    def test_decompress_into_wrong_size(self):
+        data = numpy.random.randint(0, 3000, (4, 5, 6), numpy.uint16)
+        out = numpy.zeros((4, 5, 7), numpy.uint16)
+        with self.assertRaises(ValueError):
+            self.vol.decompress_into(blosc.compress(data, typesize=2), out)
+
     @patch('requests.Session', autospec=True)
     def test_get_cutout_failure(self, mock_session):
         resolution = 0
@@ -14,9 +14,16 @@
 from intern.service.boss import BaseVersion
 from intern.service.boss.v1 import BOSS_API_VERSION
 from intern.resource.boss.resource import *
+from intern.service.boss.httperrorlist import CutoutError
+from intern.utils.compression import BloscSettings
 from intern.utils.parallel import *
+from intern.utils.retry import RetryPolicy
 from requests import HTTPError
-import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+import itertools
+import struct
+import time
+import warnings
 import blosc
 import numpy as np
 from enum import Enum
@@ -27,6 +34,11 @@ class CacheMode(str, Enum):
     raw = 'raw'
 
 class VolumeService_1(BaseVersion):
+    # Uploads send blocks in which more than this fraction of the cuboids hold
+    # data whole: empty cuboids compress to almost nothing, while splitting a
+    # block around them multiplies the requests.
+    _dense_block_fraction = 0.5
+
     def __init__(self):
         BaseVersion.__init__(self)
 
@@ -37,7 +49,14 @@ class VolumeService_1(BaseVersion):
         return BOSS_API_VERSION
 
     def get_bit_width(self, resource):
-        """Method to return the bit width for blosc based on the Resource"""
+        """Method to return the bit width of the Resource's datatype.
+
+        Deprecated: uploads no longer use it, because blosc's typesize is in
+        bytes (the datatype's itemsize), not bits.
+        """
+        warnings.warn(
+            "get_bit_width is deprecated and will be removed in a future version of intern.",
+            DeprecationWarning, stacklevel=2)
         datatype = resource.datatype
 
         if "uint" in datatype:
@@ -47,9 +66,51 @@ class VolumeService_1(BaseVersion):
 
         return bit_width
 
+    def _block_index(self, block, x_range, y_range, z_range, time_range=None):
+        """Index of a planned block within a (time)ZYX array of the full region.
+
+        Args:
+            block (list[list[int]]): A row of cuboid_aligned_blocks().
+            x_range (list[int]): x range of the full region.
+            y_range (list[int]): y range of the full region.
+            z_range (list[int]): z range of the full region.
+            time_range (optional [list[int]]): time range of the full region.
+
+        Returns:
+            (tuple[slice]): Usable as array[index].
+        """
+        index = (
+            slice(block[2][0] - z_range[0], block[2][1] - z_range[0]),
+            slice(block[1][0] - y_range[0], block[1][1] - y_range[0]),
+            slice(block[0][0] - x_range[0], block[0][1] - x_range[0]),
+        )
+        if time_range:
+            index = (slice(block[3][0] - time_range[0], block[3][1] - time_range[0]),) + index
+        return index
+
+    def _time_block_size(self, block_size, x_range, y_range, z_range):
+        """Number of time points that fit in one block of a 4D transfer.
+
+        Small spatial regions are grouped across time so that each request
+        still moves roughly a full block's worth of voxels.
+
+        Args:
+            block_size (tuple[int]): (x, y, z) voxel size of a block.
+            x_range (list[int]): x range of the full region.
+            y_range (list[int]): y range of the full region.
+            z_range (list[int]): z range of the full region.
+
+        Returns:
+            (int)
+        """
+        spatial = 1
+        for rng, size in zip((x_range, y_range, z_range), block_size):
+            spatial *= min(rng[1] - rng[0], size)
+        return max(1, int(np.prod(block_size) // max(spatial, 1)))
+
     def create_cutout(
         self, resource, resolution, x_range, y_range, z_range, time_range, numpyVolume,
-        url_prefix, auth, session, send_opts):
+        url_prefix, auth, session, send_opts, parallel=True, **kwargs):
         """Upload a cutout to the Boss data store.
 
         Args:
@@ -64,12 +125,239 @@ class VolumeService_1(BaseVersion):
             auth (string): Token to send in the request header.
             session (requests.Session): HTTP session to use for request.
             send_opts (dictionary): Additional arguments to pass to session.send().
+            parallel (Union[int, bool]: True): Whether large uploads are split into blocks
+                that are compressed and posted concurrently. If set to True, will use up to
+                DEFAULT_MAX_WORKERS concurrent requests. If set to False, blocks are uploaded
+                one after another. If set to an integer, will keep at most that number of
+                blocks in flight (and in memory).
+            executor (optional concurrent.futures.Executor): A long-lived executor to run
+                parallel block uploads on.
+            chunk_size (optional Tuple[int, int, int]): The (x, y, z) block size of large
+                uploads. Rounded up to a whole number of cuboids. Defaults to (1024, 1024, 32).
+            retry (optional intern.utils.retry.RetryPolicy): Retry each block that fails
+                with a transient error.
+            compression (optional intern.utils.compression.BloscSettings): How blocks are
+                compressed.  Defaults to BloscSettings().
+            journal (optional intern.utils.journal.UploadJournal): Record each block once
+                it is uploaded, and skip the blocks it already records, so that a failed
+                or interrupted upload can be resumed by calling create_cutout() again.
+
+        Cuboids whose voxels are all zero are not uploaded, so they leave the data
+        already stored there untouched.  Use create_cutout_to_black() to clear a region.
+
+        Raises:
+            requests.HTTPError
+            ValueError: if the dimensions of the volume and time range disagree.
         """
+        executor = kwargs.pop("executor", None)
+        retry = kwargs.pop("retry", None)
+        chunk_size = kwargs.pop("chunk_size", None)
+        compression = kwargs.pop("compression", None) or BloscSettings()
+        journal = kwargs.pop("journal", None)
         numpyVolume = np.ascontiguousarray(numpyVolume)
 
-        if np.sum(numpyVolume) == 0:
+        blocks = self._plan_upload(
+            numpyVolume, x_range, y_range, z_range, time_range, chunk_size)
+        if journal is not None:
+            job = self._journal_job(
+                resource, resolution, url_prefix, x_range, y_range, z_range, time_range)
+            if blocks is None:
+                blocks = [[x_range, y_range, z_range] + ([time_range] if time_range else [])]
+            blocks = [b for b in blocks if not journal.done(job, b)]
+        elif blocks is None:
+            self._call_with_retry(
+                retry, self._create_cutout_block,
+                resource, resolution, x_range, y_range, z_range, time_range, numpyVolume,
+                url_prefix, auth, session, send_opts, compression)
+            return
+
+        def upload(b):
+            # Each worker copies out, compresses and posts its own block, so
+            # compression overlaps with the other blocks' requests and only
+            # the blocks in flight are ever held in memory twice:
+            data = np.ascontiguousarray(
+                numpyVolume[self._block_index(b, x_range, y_range, z_range, time_range)])
+            self._create_cutout_block(
+                resource, resolution, b[0], b[1], b[2], b[3] if time_range else None,
+                data, url_prefix, auth, session, send_opts, compression)
+            if journal is not None:
+                journal.record(job, b)
+
+        for _ in self._run_blocks(upload, blocks, parallel, executor, retry=retry):
+            pass
+
+    def _journal_job(
+            self, resource, resolution, url_prefix, x_range, y_range, z_range, time_range):
+        """Identify an upload in an upload journal.
+
+        Args:
+            resource (intern.resource.boss.ChannelResource): Channel of the upload.
+            resolution (int): Resolution of the upload.
+            url_prefix (string): Protocol + host such as https://api.theboss.io
+            x_range (list[int]): x range of the upload.
+            y_range (list[int]): y range of the upload.
+            z_range (list[int]): z range of the upload.
+            time_range ([list[int]]|None): time range of the upload.
+
+        Returns:
+            (str)
+        """
+        ranges = [x_range, y_range, z_range] + ([time_range] if time_range else [])
+        return '{}/{}'.format(
+            self._cache_key_prefix(resource, resolution, url_prefix),
+            ','.join('{}:{}'.format(*r) for r in ranges))
+
+    def _create_cutout_block(
+            self, resource, resolution, x_range, y_range, z_range, time_range, numpyVolume,
+            url_prefix, auth, session, send_opts, compression):
+        """Compress and post a single cutout request.
+
+        Args:
+            numpyVolume (numpy.array): C-contiguous (time)ZYX data of the region.
+            compression (intern.utils.compression.BloscSettings): How to compress it.
+
+        Raises:
+            requests.HTTPError
+        """
+        compressed = compression.compress(numpyVolume)
+        req = self.get_cutout_request(
+            resource, 'POST', 'application/blosc',
+            url_prefix, auth,
+            resolution, x_range, y_range, z_range, time_range, numpyVolume=compressed)
+        prep = session.prepare_request(req)
+        resp = session.send(prep, **send_opts)
+
+        if resp.status_code == 201:
             return
 
+        msg = ('Create cutout failed on {}, got HTTP response: ({}) - {}'.format(
+            resource.name, resp.status_code, resp.text))
+        raise HTTPError(msg, request=req, response=resp)
+
+    def _plan_upload(self, numpyVolume, x_range, y_range, z_range, time_range, block_size=None):
+        """Plan the requests of an upload, leaving out the empty cuboids of sparse blocks.
+
+        Args:
+            numpyVolume (numpy.array): A 3D or 4D (time) numpy matrix in (time)ZYX order.
+            x_range (list[int]): x range of the upload.
+            y_range (list[int]): y range of the upload.
+            z_range (list[int]): z range of the upload.
+            time_range ([list[int]]|None): time range of the upload.
+            block_size (optional Tuple[int, int, int]): The (x, y, z) block size.
+
+        Returns:
+            (list|None): Blocks to upload separately (empty if every voxel is zero),
+                or None if the whole volume should be uploaded in one request.
+
+        Raises:
+            ValueError: if the dimensions of the volume and time range disagree.
+        """
+        blocks = self._plan_create_cutout(
+            numpyVolume, x_range, y_range, z_range, time_range, block_size)
+
+        ranges = [x_range, y_range, z_range]
+        if numpyVolume.shape[-3:] != tuple(rng[1] - rng[0] for rng in reversed(ranges)):
+            # Without one voxel per position the cuboids cannot be told apart;
+            # leave the shape to the server to check.
+            return blocks
+        occupied, origin = self._occupied_cuboids(numpyVolume, ranges)
+        if occupied.all():
+            return blocks
+
+        if blocks is None:
+            blocks = [ranges + [time_range]] if time_range else [ranges]
+        sparse = []
+        for b in blocks:
+            first = [rng[0] // size - i for rng, size, i in zip(b, CUBOID_SIZE, origin)]
+            last = [(rng[1] - 1) // size + 1 - i for rng, size, i in zip(b, CUBOID_SIZE, origin)]
+            grid = occupied[first[2]:last[2], first[1]:last[1], first[0]:last[0]]
+            if grid.mean() > self._dense_block_fraction:
+                sparse.append(b)
+                continue
+            for box in self._occupied_boxes(grid):
+                extent = [
+                    [max((f + i + lo) * size, rng[0]), min((f + i + hi) * size, rng[1])]
+                    for (lo, hi), f, i, size, rng in zip(box, first, origin, CUBOID_SIZE, b)
+                ]
+                sparse.append(extent + b[3:])
+        return sparse
+
+    def _occupied_cuboids(self, numpyVolume, ranges):
+        """Find the cuboids of an upload that hold any nonzero voxel.
+
+        Args:
+            numpyVolume (numpy.array): A 3D or 4D (time) numpy matrix in (time)ZYX order.
+            ranges (list[list[int]]): x, y and z ranges of the upload.
+
+        Returns:
+            (numpy.array, list[int]): A ZYX boolean grid of the cuboids that
+                overlap the upload, and the x, y and z index of its first cuboid.
+        """
+        occupied = numpyVolume
+        origin = []
+        # Reduce x first, as it shrinks the array the most.  logical_or rather
+        # than add: it cannot overflow.
+        for axis, rng, size in zip((-1, -2, -3), ranges, CUBOID_SIZE):
+            first = rng[0] // size
+            starts = [0] + [
+                i * size - rng[0] for i in range(first + 1, (rng[1] - 1) // size + 1)]
+            occupied = np.logical_or.reduceat(occupied, starts, axis=axis)
+            origin.append(first)
+        if occupied.ndim == 4:
+            occupied = occupied.any(axis=0)
+        return occupied, origin
+
+    def _occupied_boxes(self, grid):
+        """Cover the occupied cells of a grid with few disjoint boxes.
+
+        Greedily grows each box from its first uncovered cell: along x, then
+        y, then z, as far as every cell it takes in is occupied.
+
+        Args:
+            grid (numpy.array): A ZYX boolean grid.
+
+        Returns:
+            (list[list[list[int]]]): The x, y and z cell ranges of each box.
+        """
+        grid = grid.copy()
+        nz, ny, nx = grid.shape
+        boxes = []
+        for z, y, x in zip(*np.nonzero(grid)):
+            if not grid[z, y, x]:
+                continue
+            x1 = x + 1
+            while x1 < nx and grid[z, y, x1]:
+                x1 += 1
+            y1 = y + 1
+            while y1 < ny and grid[z, y1, x:x1].all():
+                y1 += 1
+            z1 = z + 1
+            while z1 < nz and grid[z1, y:y1, x:x1].all():
+                z1 += 1
+            grid[z:z1, y:y1, x:x1] = False
+            boxes.append([[int(x), int(x1)], [int(y), int(y1)], [int(z), int(z1)]])
+        return boxes
+
+    def _plan_create_cutout(
+            self, numpyVolume, x_range, y_range, z_range, time_range, block_size=None):
+        """Validate an upload and split it into blocks if it is too large for one request.
+
+        Args:
+            numpyVolume (numpy.array): A 3D or 4D (time) numpy matrix in (time)ZYX order.
+            x_range (list[int]): x range of the upload.
+            y_range (list[int]): y range of the upload.
+            z_range (list[int]): z range of the upload.
+            time_range ([list[int]]|None): time range of the upload.
+            block_size (optional Tuple[int, int, int]): The (x, y, z) block size.
+                Defaults to (1024, 1024, 32).
+
+        Returns:
+            (list|None): Blocks to upload separately, or None if the volume
+                fits in a single request.
+
+        Raises:
+            ValueError: if the dimensions of the volume and time range disagree.
+        """
         if numpyVolume.ndim == 3:
             # Can't have time
             if time_range is not None:
@@ -86,51 +374,25 @@ class VolumeService_1(BaseVersion):
                 "Number of dimensions: {}".format(numpyVolume.ndim)
             )
 
-        # Check to see if this volume is larger than 1GB. If so, chunk it into
-        # several smaller bites:
-        if (
-                (x_range[1] - x_range[0]) *
-                (y_range[1] - y_range[0]) *
-                (z_range[1] - z_range[0])
-        ) > 1024 * 1024 * 32 * 2:
-            blocks = block_compute(
-                x_range[0], x_range[1],
-                y_range[0], y_range[1],
-                z_range[0], z_range[1],
-                block_size=(1024, 1024, 32)
-            )
-
-            for b in blocks:
-                _data = np.ascontiguousarray(
-                    numpyVolume[
-                        b[2][0] - z_range[0]: b[2][1] - z_range[0],
-                        b[1][0] - y_range[0]: b[1][1] - y_range[0],
-                        b[0][0] - x_range[0]: b[0][1] - x_range[0]
-                    ],
-                    dtype=numpyVolume.dtype
-                )
-                self.create_cutout(
-                    resource, resolution, b[0], b[1], b[2],
-                    time_range, _data, url_prefix, auth, session, send_opts
-                )
-            return
-
-        compressed = blosc.compress(
-            numpyVolume, typesize=self.get_bit_width(resource)
+        # Check to see if this volume is larger than two blocks (by default,
+        # 64M voxels). If so, chunk it into several smaller bites (across time
+        # as well, for 4D volumes):
+        block_size = align_to_cuboids(block_size or (1024, 1024, 32))
+        cutout_size = (
+            (x_range[1] - x_range[0]) *
+            (y_range[1] - y_range[0]) *
+            (z_range[1] - z_range[0])
         )
-        req = self.get_cutout_request(
-            resource, 'POST', 'application/blosc',
-            url_prefix, auth,
-            resolution, x_range, y_range, z_range, time_range, numpyVolume=compressed)
-        prep = session.prepare_request(req)
-        resp = session.send(prep, **send_opts)
-
-        if resp.status_code == 201:
-            return
-
-        msg = ('Create cutout failed on {}, got HTTP response: ({}) - {}'.format(
-            resource.name, resp.status_code, resp.text))
-        raise HTTPError(msg, request=req, response=resp)
+        if time_range:
+            cutout_size *= time_range[1] - time_range[0]
+        if cutout_size > int(np.prod(block_size)) * 2:
+            return cuboid_aligned_blocks(
+                x_range, y_range, z_range, block_size=block_size,
+                time_range=time_range,
+                time_block_size=self._time_block_size(
+                    block_size, x_range, y_range, z_range)
+            ).tolist()
+        return None
 
     def create_cutout_to_black(
         self, resource, resolution, x_range, y_range, z_range, time_range, url_prefix, 
@@ -157,12 +419,8 @@ class VolumeService_1(BaseVersion):
                 (y_range[1] - y_range[0]) *
                 (z_range[1] - z_range[0])
         ) > 1024 * 1024 * 32 * 2:
-            blocks = block_compute(
-                x_range[0], x_range[1],
-                y_range[0], y_range[1],
-                z_range[0], z_range[1],
-                block_size=(1024, 1024, 32)
-            )
+            blocks = cuboid_aligned_blocks(
+                x_range, y_range, z_range, block_size=(1024, 1024, 32)).tolist()
             for b in blocks:
                 self.create_cutout_to_black(
                     resource, resolution, b[0], b[1], b[2],
@@ -209,99 +467,620 @@ class VolumeService_1(BaseVersion):
                 no_cache = Will skip cache check but check for dirty keys
                 raw = Will skip both the cache and dirty keys check
             chunk_size (optional Tuple[int, int, int]): The chunk size to request
-            parallel (Union[int, bool]: True): Whether downloads should be parallelized using 
-                multiprocessing. If set to True, will use all available CPUs. If set to False,
-                will use only one CPU. If set to an integer, will spawn that number of threads.
+            time_chunk_size (optional int): Number of time points to request per chunk of
+                a time-series cutout.  Defaults to as many as fit in one chunk_size block.
+            parallel (Union[int, bool]: True): Whether downloads should be parallelized using
+                threads. If set to True, will use up to DEFAULT_MAX_WORKERS concurrent requests.
+                If set to False, chunks are downloaded one after another. If set to an integer,
+                will keep at most that number of requests in flight.
+            executor (optional concurrent.futures.Executor): A long-lived executor to run
+                parallel chunk downloads on. If not provided, a temporary thread pool is
+                created for the duration of the call.
+            out (optional numpy.ndarray|buffer): Writable destination for the cutout, such
+                as an ndarray, a numpy.memmap, or a multiprocessing.shared_memory buffer.
+                Arrays must have the cutout's (time)ZYX shape and the channel's dtype;
+                plain buffers are viewed with that shape and dtype. Chunks are decompressed
+                straight into it.
+            retry (optional intern.utils.retry.RetryPolicy): Retry each chunk that fails
+                with a transient error (e.g. 429 or 503), honoring Retry-After. Chunks that
+                still fail do not stop the others; they are reported at the end. Without
+                it, the first failure is raised straight away.
+            resume (optional intern.service.boss.httperrorlist.CutoutError): The error
+                raised by an earlier call with the same arguments. Only its failed
+                regions are fetched, into its partial result.
+            cache (optional intern.utils.cache.DiskCache|MemoryCache): Cache of compressed cuboids.
+                Cached cuboids are copied from it and only the missing ones are
+                downloaded, then stored in it.  Time-series and id_list cutouts,
+                and cutouts with an access_mode other than no_cache, bypass the cache.
+            cache_bounds (optional list[list[int]]): x, y and z ranges of the channel at
+                this resolution.  If given, cuboids on the edge of the cutout are
+                downloaded whole so they can be cached; otherwise only cuboids that
+                lie entirely inside the cutout are cached.
 
         Returns:
-            (numpy.array): A 3D or 4D numpy matrix in ZXY(time) order.
+            (numpy.array): A 3D or 4D numpy matrix in ZXY(time) order. If `out` was
+                given, the array (or view of the buffer) the data was written to.
 
         Raises:
             requests.HTTPError
+            intern.service.boss.httperrorlist.CutoutError: if `retry` is given and some
+                chunks could not be downloaded after retrying. It holds the failed regions
+                and the partial result.
         """
-        if parallel:
-            # Parallel downloads are faster with a smaller chunk size but can easily overwhelm
-            # the endpoint if its too small. Therefore from empirical testing (512, 512, 96) 
-            # USUALLY is the fastest. There is some variabiity on number of threads. 
-            chunk_size = kwargs.pop("chunk_size", (512, 512, 16 * 6))
-        else:
-            # Single thread downloads are faster with a large chunk size, but can't surpass 
-            # 500 MB limit. To stay within 500 MB constraint with 64-bit data, we chose a 
-            # chunk size of (512, 512, 192) which is about 402 MB. 
-            chunk_size = kwargs.pop("chunk_size", (512, 512, 16 * 12))
-        
+        executor = kwargs.pop("executor", None)
+        retry = kwargs.pop("retry", None)
+        resume = kwargs.pop("resume", None)
+        cache = kwargs.pop("cache", None)
+        cache_bounds = kwargs.pop("cache_bounds", None)
+        tuner = self._apply_autotune(resource, url_prefix, parallel, kwargs)
+        if resume is not None:
+            if resume.result is None:
+                raise ValueError("resume must be a CutoutError raised by get_cutout.")
+            kwargs["out"] = resume.result
+        chunk_depth = align_to_cuboids(
+            kwargs.get("chunk_size") or self._default_chunk_size(parallel))[2] // CUBOID_SIZE[2]
+        result, blocks = self._prepare_get_cutout(
+            resource, x_range, y_range, z_range, time_range, parallel, kwargs)
+
+        def fetch_into(b, out):
+            self._get_cutout_block(
+                resource, resolution, b[0], b[1], b[2],
+                b[3] if time_range else None, id_list,
+                url_prefix, auth, session, send_opts, access_mode, out, **kwargs
+            )
+
+        def fetch(b):
+            # Each chunk is decompressed straight into its own (disjoint) slab
+            # of the result, so no per-chunk array is ever materialized:
+            fetch_into(
+                b, result[self._block_index(b, x_range, y_range, z_range, time_range)])
+
+        if resume is not None:
+            # Only fetch the regions that failed last time:
+            blocks = resume.regions
+        elif (cache is not None and not time_range and not id_list
+                and access_mode == CacheMode.no_cache):
+            # Copy cached cuboids into the result and only fetch the rest:
+            blocks, fetch = self._plan_cached_cutout(
+                cache, self._cache_key_prefix(resource, resolution, url_prefix),
+                result, x_range, y_range, z_range, cache_bounds, chunk_depth, fetch_into)
+        elif blocks is None:
+            self._call_with_retry(
+                retry, self._get_cutout_block,
+                resource, resolution, x_range, y_range, z_range, time_range, id_list,
+                url_prefix, auth, session, send_opts, access_mode, result, **kwargs
+            )
+            return result
+
+        failures = [] if retry is not None else None
+        for _ in self._run_blocks(
+                fetch, blocks, parallel, executor, tuner, url_prefix, result.itemsize,
+                retry, failures):
+            pass
+
+        if failures:
+            raise CutoutError(
+                'Get cutout failed on {} for {} of {} chunks.'.format(
+                    resource.name, len(failures), len(blocks)),
+                failures, result)
+
+        return result
+
+    def iter_cutout(
+            self, resource, resolution, x_range, y_range, z_range, time_range, id_list,
+            url_prefix, auth, session, send_opts, access_mode=CacheMode.no_cache, parallel=True, **kwargs
+        ):
+        """
+        Download a cutout block by block, yielding each block as it arrives.
+
+        Only the blocks currently being downloaded or handed to the caller are
+        held in memory, so arbitrarily large regions can be processed.
+
+        Args:
+            resource (intern.resource.resource.Resource): Resource compatible
+                with cutout operations
+            resolution (int): 0 indicates native resolution.
+            x_range (list[int]): x range such as [10, 20] which means x>=10 and x<20.
+            y_range (list[int]): y range such as [10, 20] which means y>=10 and y<20.
+            z_range (list[int]): z range such as [10, 20] which means z>=10 and z<20.
+            time_range ([list[int]]|None): time range such as [30, 40] which means t>=30 and t<40.
+            id_list (list[int]): list of object ids to filter the cutout by.
+            url_prefix (string): Protocol + host such as https://api.theboss.io
+            auth (string): Token to send in the request header.
+            session (requests.Session): HTTP session to use for request.
+            send_opts (dictionary): Additional arguments to pass to session.send().
+            access_mode (optional [Enum]): Identifies one of three cache access options.
+            chunk_size (optional Tuple[int, int, int]): The (x, y, z) block size to request.
+                Rounded up to a whole number of cuboids.
+            time_chunk_size (optional int): Number of time points per block of a
+                time-series cutout.
+            parallel (Union[int, bool]: True): Number of requests to keep in flight. If set
+                to True, uses DEFAULT_MAX_WORKERS; if False, blocks are downloaded one at a
+                time as the caller asks for them.
+            executor (optional concurrent.futures.Executor): A long-lived executor to run
+                parallel downloads on.
+            retry (optional intern.utils.retry.RetryPolicy): Retry each block that fails
+                with a transient error. Without it, the first failure is raised straight
+                away.
+
+        Yields:
+            (list[list[int]], numpy.array): The [x_range, y_range, z_range(, time_range)]
+                of the block and its (time)ZYX data, in completion order.
+
+        Raises:
+            requests.HTTPError
+            intern.service.boss.httperrorlist.CutoutError: if `retry` is given, after
+                every other block has been yielded, if some blocks could not be
+                downloaded after retrying.
+            ValueError: if given an option only get_cutout supports (out, resume,
+                cache or cache_bounds).
+            TypeError: if given any other unknown option.
+        """
+        executor = kwargs.pop("executor", None)
+        retry = kwargs.pop("retry", None)
+        tuner = self._apply_autotune(resource, url_prefix, parallel, kwargs)
+        time_chunk_size = kwargs.pop("time_chunk_size", None)
+        chunk_size = align_to_cuboids(
+            kwargs.pop("chunk_size", None) or self._default_chunk_size(parallel))
+        # Anything left would be sent to get_cutout_request, so check it here,
+        # before the first block is requested:
+        unsupported = sorted(set(kwargs) & {"out", "resume", "cache", "cache_bounds"})
+        if unsupported:
+            raise ValueError(
+                "iter_cutout does not support {}; use get_cutout instead.".format(
+                    ", ".join(unsupported)))
+        if kwargs:
+            raise TypeError("iter_cutout got unexpected keyword arguments: {}".format(
+                ", ".join(sorted(kwargs))))
+
+        return self._iter_cutout_blocks(
+            resource, resolution, x_range, y_range, z_range, time_range, id_list,
+            url_prefix, auth, session, send_opts, access_mode, parallel, executor, retry,
+            tuner, chunk_size, time_chunk_size)
+
+    def _iter_cutout_blocks(
+            self, resource, resolution, x_range, y_range, z_range, time_range, id_list,
+            url_prefix, auth, session, send_opts, access_mode, parallel, executor, retry,
+            tuner, chunk_size, time_chunk_size):
+        """The generator behind iter_cutout(), given its validated options."""
+
+        blocks = self._plan_cutout(
+            x_range, y_range, z_range, time_range, chunk_size, time_chunk_size)
+
+        def fetch(b):
+            shape = tuple(rng[1] - rng[0] for rng in reversed(b))
+            data = np.empty(shape, dtype=resource.datatype)
+            self._get_cutout_block(
+                resource, resolution, b[0], b[1], b[2],
+                b[3] if time_range else None, id_list,
+                url_prefix, auth, session, send_opts, access_mode, data
+            )
+            return data
+
+        itemsize = np.dtype(resource.datatype).itemsize
+        failures = [] if retry is not None else None
+        for b, data in self._run_blocks(
+                fetch, blocks, parallel, executor, tuner, url_prefix, itemsize,
+                retry, failures):
+            if data is not None:
+                yield b, data
+
+        if failures:
+            raise CutoutError(
+                'Get cutout failed on {} for {} of {} blocks.'.format(
+                    resource.name, len(failures), len(blocks)),
+                failures)
+
+    def _prepare_get_cutout(self, resource, x_range, y_range, z_range, time_range, parallel, kwargs):
+        """Allocate (or validate) the output of a cutout and plan its chunks.
+
+        Pops the `out`, `chunk_size` and `time_chunk_size` options from kwargs.
+
+        Args:
+            resource (intern.resource.Resource): Resource compatible with cutout operations.
+            x_range (list[int]): x range of the cutout.
+            y_range (list[int]): y range of the cutout.
+            z_range (list[int]): z range of the cutout.
+            time_range ([list[int]]|None): time range of the cutout.
+            parallel (Union[int, bool]): The parallel argument of the transfer.
+            kwargs (dict): Keyword arguments of the get_cutout call.
+
+        Returns:
+            (numpy.array, list|None): The (time)ZYX result array, and the blocks to
+                download into it, or None if it fits in a single request.
+        """
+        out = kwargs.pop("out", None)
+        time_chunk_size = kwargs.pop("time_chunk_size", None)
+        chunk_size = align_to_cuboids(
+            kwargs.pop("chunk_size", None) or self._default_chunk_size(parallel))
+
         # TODO: magic number
         chunk_limit = (chunk_size[0] * chunk_size[1] * chunk_size[2]) * 1.2
+        # ...but never make a single request larger than the server accepts:
+        chunk_limit = min(
+            chunk_limit, MAX_REQUEST_BYTES // np.dtype(resource.datatype).itemsize)
 
-        # Check to see if this volume is larger than a single request. If so,
-        # chunk it into several smaller bites:
         if time_range:
-            cutout_size = (
-                (x_range[1] - x_range[0]) *
-                (y_range[1] - y_range[0]) *
-                (z_range[1] - z_range[0]) *
-                (time_range[1] - time_range[0])
+            shape = (
+                time_range[1] - time_range[0],
+                z_range[1] - z_range[0],
+                y_range[1] - y_range[0],
+                x_range[1] - x_range[0]
             )
         else:
-            cutout_size = (
-                (x_range[1] - x_range[0]) *
-                (y_range[1] - y_range[0]) *
-                (z_range[1] - z_range[0])
-            )
-
-        if cutout_size > chunk_limit:
-            blocks = block_compute(
-                x_range[0], x_range[1],
-                y_range[0], y_range[1],
-                z_range[0], z_range[1],
-                block_size=chunk_size
-            )
-
-            result = np.ndarray((
+            shape = (
                 z_range[1] - z_range[0],
                 y_range[1] - y_range[0],
                 x_range[1] - x_range[0]
-            ), dtype=resource.datatype)
-
-            if parallel:
-                if type(parallel) == bool:
-                    parallel = multiprocessing.cpu_count()
-                elif parallel > 0:
-                    parallel = int(parallel)
-                else:
-                    raise ValueError("Parallel must be greater than 0.")
-                with multiprocessing.Pool(processes=parallel) as pool:
-                    chunks = pool.starmap(self.get_cutout, [
-                        (
-                            resource, resolution, b[0], b[1], b[2],
-                            time_range, id_list, url_prefix, auth, session, send_opts,
-                            access_mode
-                            # TODO: kwargs
-                        )
-                     for b in blocks])
-
-                for b, data in zip(blocks, chunks):
-                    result[
-                        b[2][0] - z_range[0] : b[2][1] - z_range[0],
-                        b[1][0] - y_range[0] : b[1][1] - y_range[0],
-                        b[0][0] - x_range[0] : b[0][1] - x_range[0]
-                    ] = data
+            )
+        if out is None:
+            result = np.empty(shape, dtype=resource.datatype)
+        else:
+            result = self._as_output_array(out, shape, resource.datatype)
+
+        # Check to see if this volume is larger than a single request. If so,
+        # chunk it into several smaller bites:
+        if result.size <= chunk_limit:
+            return result, None
+
+        return result, self._plan_cutout(
+            x_range, y_range, z_range, time_range, chunk_size, time_chunk_size)
+
+    def _cache_key_prefix(self, resource, resolution, url_prefix):
+        """The prefix of the cache keys of a channel's cuboids at a resolution.
+
+        Args:
+            resource (intern.resource.boss.ChannelResource): Channel of the cutout.
+            resolution (int): Resolution of the cutout.
+            url_prefix (string): Protocol + host of the Boss.
+
+        Returns:
+            (string)
+        """
+        return '/'.join((
+            url_prefix, resource.coll_name, resource.exp_name, resource.name,
+            str(resolution)))
+
+    def _cuboid_indices(self, x_range, y_range, z_range):
+        """Indices of the cuboids that overlap a region, in x, y, z order."""
+        return list(itertools.product(*(
+            range(rng[0] // size, (rng[1] - 1) // size + 1)
+            for rng, size in zip((x_range, y_range, z_range), CUBOID_SIZE))))
+
+    def _cuboid_extent(self, index, ranges, bounds=None):
+        """The region of a cuboid that is cached.
+
+        The region is the whole cuboid clipped to the bounds of the channel, if
+        they are known, or else to the requested ranges.  Only regions that are
+        the same for every request overlapping the cuboid can be cached.
+
+        Args:
+            index (tuple[int]): Index of the cuboid along x, y and z.
+            ranges (list[list[int]]): x, y and z ranges of the request.
+            bounds (optional list[list[int]]): x, y and z ranges of the channel.
+
+        Returns:
+            (list[list[int]], bool): The x, y and z ranges of the region, and
+                whether it can be cached.
+        """
+        extent = []
+        cacheable = True
+        for i, rng, size, bound in zip(index, ranges, CUBOID_SIZE, bounds or [None] * 3):
+            start, stop = i * size, (i + 1) * size
+            if bound is not None:
+                start, stop = max(start, bound[0]), min(stop, bound[1])
+            elif rng[0] > start or rng[1] < stop:
+                start, stop = max(start, rng[0]), min(stop, rng[1])
+                cacheable = False
+            extent.append([start, stop])
+        return extent, cacheable
+
+    def _plan_cached_cutout(
+            self, cache, key_prefix, result, x_range, y_range, z_range, bounds, chunk_depth,
+            fetch_into):
+        """Fill a cutout from cached cuboids, and plan the download of the rest.
+
+        Missing cuboids are grouped into runs of up to `chunk_depth` cuboids
+        along z.  Each run is downloaded in one request, copied into the result
+        and stored in the cache, one entry per cuboid.
+
+        Args:
+            cache (intern.utils.cache.DiskCache|MemoryCache): Cache of compressed cuboids.
+            key_prefix (string): From _cache_key_prefix().
+            result (numpy.ndarray): ZYX destination of the cutout.
+            x_range (list[int]): x range of the cutout.
+            y_range (list[int]): y range of the cutout.
+            z_range (list[int]): z range of the cutout.
+            bounds (optional list[list[int]]): x, y and z ranges of the channel.
+                If given, cuboids on the edge of the cutout are downloaded whole
+                so that they can be cached too.
+            chunk_depth (int): Largest number of cuboids to download at once.
+            fetch_into (callable): Function of a region and a destination array
+                that downloads the region into the array.
+
+        Returns:
+            (list, callable): The blocks of the cutout that still need to be
+                downloaded, and the function that downloads one of them.
+        """
+        ranges = [x_range, y_range, z_range]
+        columns = {}
+        for index in self._cuboid_indices(x_range, y_range, z_range):
+            extent, cacheable = self._cuboid_extent(index, ranges, bounds)
+            data = None
+            if cacheable:
+                data = self._unpack_cuboid(
+                    cache.get(self._cuboid_key(key_prefix, index)), extent, result.dtype)
+            if data is None:
+                columns.setdefault(index[:2], []).append((index, extent, cacheable))
             else:
+                self._copy_overlap(data, extent, result, ranges)
+
+        plan = {}
+        for cuboids in columns.values():
+            # Split each column into runs of consecutive cuboids:
+            run = []
+            for cuboid in cuboids + [None]:
+                if run and (cuboid is None or len(run) == chunk_depth
+                            or cuboid[0][2] != run[-1][0][2] + 1):
+                    region = [run[0][1][0], run[0][1][1], [run[0][1][2][0], run[-1][1][2][1]]]
+                    block = [
+                        [max(r[0], rng[0]), min(r[1], rng[1])]
+                        for r, rng in zip(region, ranges)]
+                    plan[self._block_key(block)] = (region, run)
+                    run = []
+                if cuboid is not None:
+                    run.append(cuboid)
+
+        def fetch(b):
+            region, run = plan[self._block_key(b)]
+            if region == b:
+                data = result[self._block_index(b, x_range, y_range, z_range)]
+                fetch_into(b, data)
+            else:
+                data = np.empty(
+                    [rng[1] - rng[0] for rng in reversed(region)], dtype=result.dtype)
+                fetch_into(region, data)
+                self._copy_overlap(data, region, result, ranges)
+            for index, extent, cacheable in run:
+                if cacheable:
+                    z = extent[2][0] - region[2][0]
+                    cache.put(
+                        self._cuboid_key(key_prefix, index),
+                        self._pack_cuboid(data[z:z + extent[2][1] - extent[2][0]]))
+
+        return [self._unkey_block(key) for key in plan], fetch
+
+    def invalidate_cached_cutout(self, cache, resource, resolution, x_range, y_range, z_range, url_prefix):
+        """Drop the cached cuboids that overlap a region, e.g. after writing to it.
+
+        Args:
+            cache (intern.utils.cache.DiskCache|MemoryCache): Cache of compressed cuboids.
+            resource (intern.resource.boss.ChannelResource): Channel written to.
+            resolution (int): Resolution written to.
+            x_range (list[int]): x range written to.
+            y_range (list[int]): y range written to.
+            z_range (list[int]): z range written to.
+            url_prefix (string): Protocol + host of the Boss.
+        """
+        key_prefix = self._cache_key_prefix(resource, resolution, url_prefix)
+        for index in self._cuboid_indices(x_range, y_range, z_range):
+            cache.delete(self._cuboid_key(key_prefix, index))
+
+    @staticmethod
+    def _cuboid_key(key_prefix, index):
+        return '{}/{}_{}_{}'.format(key_prefix, *index)
+
+    @staticmethod
+    def _block_key(block):
+        return tuple(tuple(rng) for rng in block)
+
+    @staticmethod
+    def _unkey_block(key):
+        return [list(rng) for rng in key]
+
+    def _copy_overlap(self, data, extent, result, ranges):
+        """Copy the part of a ZYX region that overlaps the result into it."""
+        src = []
+        dst = []
+        for (start, stop), rng in zip(extent, ranges):
+            lo, hi = max(start, rng[0]), min(stop, rng[1])
+            src.append(slice(lo - start, hi - start))
+            dst.append(slice(lo - rng[0], hi - rng[0]))
+        result[tuple(reversed(dst))] = data[tuple(reversed(src))]
+
+    def _pack_cuboid(self, data):
+        """Compress a ZYX cuboid for the cache, prefixed by its shape."""
+        return struct.pack('<3I', *data.shape) + blosc.compress(
+            np.ascontiguousarray(data), typesize=data.itemsize)
+
+    def _unpack_cuboid(self, value, extent, dtype):
+        """Decompress a cached cuboid, or return None if it is missing or stale.
+
+        Args:
+            value (bytes|None): From _pack_cuboid().
+            extent (list[list[int]]): Expected x, y and z ranges of the cuboid.
+            dtype (numpy.dtype): Expected dtype of the cuboid.
+
+        Returns:
+            (numpy.ndarray|None): The ZYX cuboid.
+        """
+        if value is None:
+            return None
+        shape = tuple(rng[1] - rng[0] for rng in reversed(extent))
+        if struct.unpack_from('<3I', value) != shape:
+            return None
+        compressed = value[struct.calcsize('<3I'):]
+        if struct.unpack_from('<I', compressed, 4)[0] != int(np.prod(shape)) * dtype.itemsize:
+            return None
+        data = np.empty(shape, dtype=dtype)
+        self.decompress_into(compressed, data)
+        return data
+
+    def _default_chunk_size(self, parallel):
+        """The (x, y, z) chunk size to use when the caller does not give one.
+
+        Args:
+            parallel (Union[int, bool]): The parallel argument of the transfer.
+
+        Returns:
+            (tuple[int])
+        """
+        if parallel:
+            # Parallel downloads are faster with a smaller chunk size but can easily overwhelm
+            # the endpoint if its too small. Therefore from empirical testing (512, 512, 96) 
+            # USUALLY is the fastest. There is some variabiity on number of threads. 
+            return (512, 512, 16 * 6)
+        # Single thread downloads are faster with a large chunk size, but can't surpass 
+        # 500 MB limit. To stay within 500 MB constraint with 64-bit data, we chose a 
+        # chunk size of (512, 512, 192) which is about 402 MB. 
+        return (512, 512, 16 * 12)
+
+    def _plan_cutout(self, x_range, y_range, z_range, time_range, chunk_size, time_chunk_size=None):
+        """Split a cutout into cuboid-aligned blocks.
+
+        Returns:
+            (list[list[list[int]]]): Rows of cuboid_aligned_blocks() as lists.
+        """
+        if time_range:
+            time_chunk_size = time_chunk_size or self._time_block_size(
+                chunk_size, x_range, y_range, z_range)
+        return cuboid_aligned_blocks(
+            x_range, y_range, z_range, block_size=chunk_size,
+            time_range=time_range, time_block_size=time_chunk_size or 1).tolist()
+
+    def _run_blocks(
+            self, fn, blocks, parallel, executor=None, tuner=None, host=None, itemsize=1,
+            retry=None, failures=None):
+        """Call fn on every block, serially or with a bounded number in flight.
+
+        Args:
+            fn (callable): Function of one block.
+            blocks (list): Blocks from _plan_cutout().
+            parallel (Union[int, bool]): False to run serially, True to use
+                DEFAULT_MAX_WORKERS threads, or the number of calls to keep in flight.
+            executor (optional concurrent.futures.Executor): Executor to use. If not
+                provided, a temporary thread pool is created.
+            tuner (optional intern.utils.autotune.CutoutAutotuner): If given, the
+                latency of each call is recorded and the tuner sets the number of
+                calls in flight (up to `parallel`).
+            host (optional string): Key of the transfer's host in the tuner.
+            itemsize (optional int): Bytes per voxel, used to measure throughput.
+            retry (optional intern.utils.retry.RetryPolicy): Retry calls that fail
+                with a transient error.
+            failures (optional list): If given, (block, exception) pairs for calls that
+                still fail with a transient error after retrying are appended to it
+                (and yielded with a result of None) instead of being raised.
+
+        Yields:
+            (block, result) pairs, in completion order.
+
+        Raises:
+            ValueError: if parallel is not a positive number.
+        """
+        if tuner is not None:
+            transfer = tuner.start(host)
+            timed = fn
+
+            def fn(b):
+                start = time.perf_counter()
+                result = timed(b)
+                nbytes = itemsize * int(np.prod([rng[1] - rng[0] for rng in b]))
+                tuner.record(transfer, nbytes, time.perf_counter() - start)
+                return result
+
+        if retry is not None or failures is not None:
+            attempt = fn
+
+            def fn(b):
+                try:
+                    return self._call_with_retry(retry, attempt, b)
+                except Exception as err:
+                    if failures is None or not (retry or RetryPolicy(0)).is_retryable(err):
+                        raise
+                    failures.append((b, err))
+                    return None
+
+        if not parallel:
+            completed = False
+            try:
                 for b in blocks:
-                    _data = self.get_cutout(
-                        resource, resolution, b[0], b[1], b[2],
-                        time_range, id_list, url_prefix, auth, session, send_opts,
-                        access_mode, **kwargs
-                    )
-
-                    result[
-                        b[2][0] - z_range[0] : b[2][1] - z_range[0],
-                        b[1][0] - y_range[0] : b[1][1] - y_range[0],
-                        b[0][0] - x_range[0] : b[0][1] - x_range[0]
-                    ] = _data
+                    yield b, fn(b)
+                completed = True
+            finally:
+                if tuner is not None:
+                    tuner.finish(transfer, completed)
+            return
 
-            return result
+        if type(parallel) == bool:
+            parallel = DEFAULT_MAX_WORKERS
+        elif parallel > 0:
+            parallel = int(parallel)
+        else:
+            raise ValueError("Parallel must be greater than 0.")
+
+        max_in_flight = parallel
+        if tuner is not None:
+            max_in_flight = lambda: min(parallel, tuner.max_in_flight(host))
+
+        # Threads (rather than processes) share the session and its
+        # keep-alive connection pool, and need not pickle anything:
+        pool = executor or ThreadPoolExecutor(max_workers=parallel)
+        completed = False
+        try:
+            for item in imap_bounded(pool, fn, blocks, max_in_flight):
+                yield item
+            completed = True
+        finally:
+            if tuner is not None:
+                tuner.finish(transfer, completed)
+            if executor is None:
+                pool.shutdown()
+
+    def _call_with_retry(self, retry, fn, *args, **kwargs):
+        """Call fn, retrying transient failures if a RetryPolicy is given."""
+        if retry is None:
+            return fn(*args, **kwargs)
+        return retry.call(fn, *args, **kwargs)
+
+    def _apply_autotune(self, resource, url_prefix, parallel, kwargs):
+        """Pop the `autotune` option and let it choose the chunk size.
+
+        The tuner is only used for parallel transfers, and only picks the
+        chunk size when the caller did not give one.
+
+        Args:
+            resource (intern.resource.Resource): Resource of the transfer.
+            url_prefix (string): Protocol + host, used as the tuner's key.
+            parallel (Union[int, bool]): The parallel argument of the transfer.
+            kwargs (dict): Keyword arguments of the transfer.
+
+        Returns:
+            (intern.utils.autotune.CutoutAutotuner|None)
+        """
+        tuner = kwargs.pop("autotune", None)
+        if tuner is None or not parallel:
+            # Serial transfers have no concurrency to tune.
+            return None
+        if kwargs.get("chunk_size") is None:
+            kwargs["chunk_size"] = tuner.chunk_size(
+                url_prefix, np.dtype(resource.datatype).itemsize)
+        return tuner
+
+    def _get_cutout_block(
+            self, resource, resolution, x_range, y_range, z_range, time_range, id_list,
+            url_prefix, auth, session, send_opts, access_mode, out, **kwargs
+        ):
+        """
+        Download a single cutout request and decompress it into `out`.
+
+        Args:
+            out (numpy.ndarray): Destination with the (time)ZYX shape and dtype of
+                the requested region.  May be a view into a larger array.
 
+        Raises:
+            requests.HTTPError
+            ValueError: if the server returned a different amount of data than requested.
+        """
         req = self.get_cutout_request(
             resource, 'GET', 'application/blosc',
             url_prefix, auth,
@@ -314,29 +1093,77 @@ class VolumeService_1(BaseVersion):
         resp = session.send(prep, **send_opts)
 
         if resp.status_code == 200:
-            raw_data = blosc.decompress(resp.content)
-            data_mat = np.frombuffer(raw_data, dtype=resource.datatype)
-
-            if time_range:
-                # Reshape including time
-                return np.reshape(data_mat,
-                                  (time_range[1] - time_range[0],
-                                   z_range[1] - z_range[0],
-                                   y_range[1] - y_range[0],
-                                   x_range[1] - x_range[0]),
-                                  order='C')
-            else:
-                # Reshape without including time
-                return np.reshape(data_mat,
-                                  (z_range[1] - z_range[0],
-                                   y_range[1] - y_range[0],
-                                   x_range[1] - x_range[0]),
-                                  order='C')
+            self.decompress_into(resp.content, out)
+            return
 
         msg = ('Get cutout failed on {}, got HTTP response: ({}) - {}'.format(
             resource.name, resp.status_code, resp.text))
         raise HTTPError(msg, request=req, response=resp)
 
+    def _as_output_array(self, out, shape, dtype):
+        """
+        Validate a caller-provided output buffer for a cutout.
+
+        Args:
+            out (numpy.ndarray|buffer): An array, or any writable object exposing
+                the buffer protocol (e.g. `SharedMemory.buf`).
+            shape (tuple[int]): Expected shape of the cutout.
+            dtype (str|numpy.dtype): Expected dtype of the cutout.
+
+        Returns:
+            (numpy.ndarray): `out` itself, or an array view of the buffer.
+
+        Raises:
+            ValueError: if `out` is read-only or its shape, dtype or size does not match.
+        """
+        dtype = np.dtype(dtype)
+        if not isinstance(out, np.ndarray):
+            count = int(np.prod(shape))
+            try:
+                out = np.frombuffer(out, dtype=dtype, count=count).reshape(shape)
+            except (TypeError, ValueError) as err:
+                raise ValueError(
+                    "out must be an ndarray or a buffer of at least {} bytes: {}".format(
+                        count * dtype.itemsize, err))
+        if out.shape != tuple(shape):
+            raise ValueError(
+                "out has shape {} but the cutout has shape {}.".format(out.shape, tuple(shape)))
+        if out.dtype != dtype:
+            raise ValueError(
+                "out has dtype {} but the channel has dtype {}.".format(out.dtype, dtype))
+        if not out.flags.writeable:
+            raise ValueError("out must be writeable.")
+        return out
+
+    def decompress_into(self, compressed, out):
+        """
+        Decompress a blosc buffer directly into an existing array.
+
+        If `out` is C-contiguous the data are written in place with no
+        intermediate copy; otherwise they are staged in a temporary contiguous
+        buffer and placed with a single copy.
+
+        Args:
+            compressed (bytes): A blosc-compressed buffer.
+            out (numpy.ndarray): Writable destination array.
+
+        Raises:
+            ValueError: if the uncompressed size does not match `out`.
+        """
+        # Bytes 4-8 of the blosc header hold the uncompressed size:
+        nbytes = struct.unpack_from('<I', compressed, 4)[0]
+        if nbytes != out.nbytes:
+            raise ValueError(
+                "Expected {} bytes of cutout data but received {}.".format(
+                    out.nbytes, nbytes))
+
+        if out.flags.c_contiguous and out.flags.writeable:
+            blosc.decompress_ptr(compressed, out.__array_interface__['data'][0])
+        else:
+            staging = np.empty(out.shape, dtype=out.dtype)
+            blosc.decompress_ptr(compressed, staging.__array_interface__['data'][0])
+            out[...] = staging
+
     def reserve_ids(
             self, resource, num_ids,
             url_prefix, auth, session, send_opts):
@@ -16,6 +16,11 @@ from intern.resource.boss import ChannelResource, PartialChannelResourceError
 from intern.service.boss import BossService
 from intern.service.boss.v1.volume import VolumeService_1
 from intern.service.boss.v1.volume import CacheMode
+from intern.utils.compression import BloscSettings
+from intern.utils.journal import open_journal
+from intern.utils.parallel import DEFAULT_MAX_WORKERS
+from concurrent.futures import ThreadPoolExecutor
+import blosc
 
 def check_channel(fcn):
     """Decorator that ensures a valid channel passed in.
@@ -42,13 +47,34 @@ def check_channel(fcn):
 
 class VolumeService(BossService):
     """VolumeService routes calls to the appropriate API version.
+
+    Attributes:
+        _executor (concurrent.futures.ThreadPoolExecutor): Long-lived thread
+            pool used for parallel cutout transfers.  Created on first use.
+        _max_workers (int): Number of threads in the pool.  The shared
+            connection pool is grown to at least this size.
+        autotuner (intern.utils.autotune.CutoutAutotuner|None): If set, tunes
+            the chunk size and concurrency of parallel transfers that do not
+            specify them.
+        retry_policy (intern.utils.retry.RetryPolicy|None): How cutout chunks
+            that fail with a transient error are retried.  None (the default)
+            disables retries, so the first failure is raised straight away.
+        compression (intern.utils.compression.BloscSettings): How uploads are
+            compressed.  Its `nthreads` is applied to blosc when it is
+            assigned, and the previous blosc thread count is restored when it
+            is replaced.
+        cache (intern.utils.cache.DiskCache|MemoryCache|None): If set, cuboids
+            of downloaded cutouts are cached in it, and cuboids of uploaded ones
+            dropped from it.
     """
-    def __init__(self, base_url, version):
+    def __init__(self, base_url, version, max_workers=None):
         """Constructor.
 
         Args:
             base_url (string): Base url (host) of project service such as 'api.boss.io'.
             version (string): Version of Boss API to use.
+            max_workers (optional[int]): Number of threads to use for parallel
+                cutout transfers.  Defaults to DEFAULT_MAX_WORKERS.
 
         Raises:
             (KeyError): if given invalid version.
@@ -59,10 +85,74 @@ class VolumeService(BossService):
             'v1': VolumeService_1()
         }
         self.service = self.get_api_impl(version)
+        self._executor = None
+        self._max_workers = max_workers or DEFAULT_MAX_WORKERS
+        self._pool_maxsize = self._max_workers
+        self.autotuner = None
+        self.retry_policy = None
+        self._compression = None
+        self._previous_nthreads = None
+        self.compression = BloscSettings()
+        self.cache = None
+
+    def __del__(self):
+        self.shutdown()
+        BossService.__del__(self)
+
+    @property
+    def max_workers(self):
+        return self._max_workers
+
+    @max_workers.setter
+    def max_workers(self, value):
+        if value is None or value < 1:
+            raise ValueError('max_workers must be greater than 0.')
+        self.shutdown()
+        self._max_workers = int(value)
+        # Other services may be using the shared pool, so it only grows.
+        self._pool_maxsize = self._max_workers
+        self._session = None
+
+    @property
+    def compression(self):
+        return self._compression
+
+    @compression.setter
+    def compression(self, value):
+        # blosc's thread count is process-wide, so it is set here once rather
+        # than by every compressing worker thread.
+        if self._previous_nthreads is not None:
+            blosc.set_nthreads(self._previous_nthreads)
+            self._previous_nthreads = None
+        self._compression = value
+        if value is not None:
+            self._previous_nthreads = value.apply()
+
+    @property
+    def executor(self):
+        """Thread pool shared by every parallel transfer made by this service.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix='intern-volume')
+        return self._executor
+
+    def shutdown(self, wait=False):
+        """Stop the transfer thread pool.  It is recreated on next use.
+
+        Args:
+            wait (optional[bool]): Block until outstanding transfers finish.
+        """
+        executor = getattr(self, '_executor', None)
+        if executor is not None:
+            executor.shutdown(wait=wait)
+            self._executor = None
 
     @check_channel
     def create_cutout(
-        self, resource, resolution, x_range, y_range, z_range, numpyVolume, time_range=None):
+        self, resource, resolution, x_range, y_range, z_range, numpyVolume, time_range=None,
+        parallel=True, **kwargs):
         """Upload a cutout to the volume service.
 
         Args:
@@ -73,12 +163,30 @@ class VolumeService(BossService):
             z_range (list[int]): z range such as [10, 20] which means z>=10 and z<20.
             numpyVolume (numpy.array): A 3D or 4D (time) numpy matrix in (time)ZYX order.
             time_range (optional [list[int]]): time range such as [30, 40] which means t>=30 and t<40.
+            parallel (Union[int, bool]: True): Whether blocks of large uploads are compressed
+                and posted concurrently on this service's thread pool. If set to True, will
+                use every thread in the pool. If set to an integer, will keep at most that
+                number of blocks in flight.
+            journal (optional str|intern.utils.journal.UploadJournal): An upload journal,
+                or the path of its file.  Blocks it records as uploaded are skipped, so
+                an interrupted upload resumes where it stopped when called again.
         """
-
-
-        return self.service.create_cutout(
-            resource, resolution, x_range, y_range, z_range, time_range, numpyVolume,
-            self.url_prefix, self.auth, self.session, self.session_send_opts)
+        kwargs.setdefault('retry', self.retry_policy)
+        kwargs.setdefault('compression', self.compression)
+        if kwargs.get('journal') is not None:
+            kwargs['journal'] = open_journal(kwargs['journal'])
+        if parallel:
+            kwargs.setdefault('executor', self.executor)
+            if type(parallel) == bool:
+                parallel = self._max_workers
+
+        try:
+            return self.service.create_cutout(
+                resource, resolution, x_range, y_range, z_range, time_range, numpyVolume,
+                self.url_prefix, self.auth, self.session, self.session_send_opts,
+                parallel, **kwargs)
+        finally:
+            self._invalidate_cache(resource, resolution, x_range, y_range, z_range)
 
     @check_channel
     def create_cutout_to_black(
@@ -95,9 +203,19 @@ class VolumeService(BossService):
         """
 
 
-        return self.service.create_cutout_to_black(
-            resource, resolution, x_range, y_range, z_range, time_range,
-            self.url_prefix, self.auth, self.session, self.session_send_opts)
+        try:
+            return self.service.create_cutout_to_black(
+                resource, resolution, x_range, y_range, z_range, time_range,
+                self.url_prefix, self.auth, self.session, self.session_send_opts)
+        finally:
+            self._invalidate_cache(resource, resolution, x_range, y_range, z_range)
+
+    def _invalidate_cache(self, resource, resolution, x_range, y_range, z_range):
+        """Drop cached cuboids of a region that was written to."""
+        if self.cache is not None:
+            self.service.invalidate_cached_cutout(
+                self.cache, resource, resolution, x_range, y_range, z_range,
+                self.url_prefix)
 
     @check_channel
     def get_cutout(self, resource, resolution, x_range, y_range, z_range, time_range=None, id_list=[], access_mode=CacheMode.no_cache, parallel=True, **kwargs):
@@ -116,9 +234,10 @@ class VolumeService(BossService):
                 cache = Will check both cache and for dirty keys
                 no_cache = Will skip cache check but check for dirty keys
                 raw = Will skip both the cache and dirty keys check
-            parallel (Union[int, bool]: True): Whether downloads should be parallelized using 
-                multiprocessing. If set to True, will use all available CPUs. If set to False,
-                will use only one CPU. If set to an integer, will spawn that number of threads.
+            parallel (Union[int, bool]: True): Whether downloads should be parallelized using
+                this service's thread pool. If set to True, will use every thread in the pool.
+                If set to False, chunks are downloaded one after another. If set to an
+                integer, will keep at most that number of requests in flight.
 
         Returns:
             (numpy.array): A 3D or 4D (time) numpy matrix in (time)ZYX order.
@@ -126,11 +245,54 @@ class VolumeService(BossService):
         Raises:
             requests.HTTPError on error.
         """
+        kwargs.setdefault('retry', self.retry_policy)
+        kwargs.setdefault('cache', self.cache)
+        if parallel:
+            kwargs.setdefault('executor', self.executor)
+            if type(parallel) == bool:
+                parallel = self._max_workers
+                if self.autotuner is not None:
+                    kwargs.setdefault('autotune', self.autotuner)
 
         return self.service.get_cutout(
             resource, resolution, x_range, y_range, z_range, time_range, id_list,
             self.url_prefix, self.auth, self.session, self.session_send_opts, access_mode, parallel, **kwargs)
 
+    @check_channel
+    def iter_cutout(self, resource, resolution, x_range, y_range, z_range, time_range=None, id_list=[], access_mode=CacheMode.no_cache, parallel=True, **kwargs):
+        """Download a cutout block by block, yielding each block as it arrives.
+
+        Args:
+            resource (intern.resource.boss.resource.ChannelResource): Channel or layer resource.
+            resolution (int): 0 indicates native resolution.
+            x_range (list[int]): x range such as [10, 20] which means x>=10 and x<20.
+            y_range (list[int]): y range such as [10, 20] which means y>=10 and y<20.
+            z_range (list[int]): z range such as [10, 20] which means z>=10 and z<20.
+            time_range (optional [list[int]]): time range such as [30, 40] which means t>=30 and t<40.
+            id_list (optional [list[int]]): list of object ids to filter the cutout by.
+            access_mode (optional [Enum]): Identifies one of three cache access options.
+            parallel (Union[int, bool]: True): Number of requests to keep in flight on this
+                service's thread pool. If set to True, uses every thread in the pool. If set to
+                False, blocks are downloaded one at a time.
+
+        Returns:
+            (generator): Yields ([x_range, y_range, z_range(, time_range)], numpy.array) pairs.
+
+        Raises:
+            requests.HTTPError on error.
+        """
+        kwargs.setdefault('retry', self.retry_policy)
+        if parallel:
+            kwargs.setdefault('executor', self.executor)
+            if type(parallel) == bool:
+                parallel = self._max_workers
+                if self.autotuner is not None:
+                    kwargs.setdefault('autotune', self.autotuner)
+
+        return self.service.iter_cutout(
+            resource, resolution, x_range, y_range, z_range, time_range, id_list,
+            self.url_prefix, self.auth, self.session, self.session_send_opts, access_mode, parallel, **kwargs)
+
     @check_channel
     def reserve_ids(self, resource, num_ids):
         """Reserve a block of unique, sequential ids for annotations.
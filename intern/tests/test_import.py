@@ -0,0 +1,85 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import subprocess
+import sys
+import unittest
+
+# Modules that a bare `import intern` must not import:
+HEAVY_MODULES = [
+    "numpy",
+    "requests",
+    "PIL",
+    "psutil",
+    "tqdm",
+    "joblib",
+    "aiohttp",
+    "cloudvolume",
+    "intern.convenience.array",
+    "intern.remote.boss",
+    "intern.remote.boss.remote",
+]
+
+# `import intern` must cost at most this fraction of importing the array
+# module (and with it numpy, requests, PIL...). Both are timed in the same
+# interpreter, so the ratio does not depend on how loaded the machine is;
+# eager imports would push it close to 1.
+MAX_IMPORT_FRACTION = 0.1
+
+def run_python(code, *args):
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+
+class TestImport(unittest.TestCase):
+    def test_import_is_lazy(self):
+        result = run_python(
+            "import sys, json, intern; "
+            "print(json.dumps(sorted(set(sys.modules) & set({}))))".format(
+                repr(HEAVY_MODULES)
+            )
+        )
+        self.assertEqual([], json.loads(result.stdout))
+
+    def test_import_time(self):
+        result = run_python(
+            "import intern; import intern.convenience.array", "-X", "importtime"
+        )
+        cumulative = {}
+        for line in result.stderr.splitlines():
+            fields = line.split("|")
+            if len(fields) == 3 and fields[1].strip().isdigit():
+                cumulative[fields[2].strip()] = int(fields[1])
+        self.assertLess(
+            cumulative["intern"],
+            MAX_IMPORT_FRACTION * cumulative["intern.convenience.array"],
+        )
+
+    def test_lazy_attributes(self):
+        result = run_python(
+            "import intern, intern.convenience, intern.remote.boss; "
+            "from intern.convenience.array import array; "
+            "assert intern.array is array; "
+            "assert intern.convenience.array is array; "
+            "assert 'aiohttp' not in __import__('sys').modules; "
+            "assert intern.remote.boss.LATEST_VERSION == 'v1'; "
+            "from intern.remote import Remote; "
+            "assert issubclass(intern.remote.boss.AsyncBossRemote, Remote)"
+        )
+        self.assertEqual("", result.stderr)
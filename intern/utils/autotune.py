@@ -0,0 +1,335 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import threading
+import time
+
+from intern.utils.parallel import CUBOID_SIZE, DEFAULT_MAX_WORKERS, MAX_REQUEST_BYTES
+
+
+class _HostState(object):
+    """Tuning state for one host."""
+
+    def __init__(self, chunk_depth, workers):
+        # Current settings; chunk_depth is the chunk's z extent in cuboids.
+        self.chunk_depth = chunk_depth
+        self.workers = workers
+        self.best = None
+
+        # Chunk depth is hill-climbed once per transfer, doubling or halving
+        # until the search has turned around twice:
+        self.depth_step = 1
+        self.depth_reversals = 0
+        self.last_throughput = None
+
+        # The in-flight count is hill-climbed within a transfer, once every
+        # `window` completed requests:
+        self.worker_step = 1
+        self.last_window_throughput = None
+
+        # Transfers in progress:
+        self.active = set()
+
+
+class _Transfer(object):
+    """Measurements of one transfer, returned by CutoutAutotuner.start."""
+
+    def __init__(self, host):
+        self.host = host
+        self.start = None
+        self.bytes = 0
+        self.requests = 0
+        self.window_start = None
+        self.window_bytes = 0
+        self.window_requests = 0
+        # Whether another transfer to the host ran at the same time, sharing
+        # its bandwidth:
+        self.overlapped = False
+
+
+class CutoutAutotuner(object):
+    """
+    Tune the chunk shape and concurrency of cutout transfers for each host.
+
+    The tuner watches the latency and size of every chunk request. Within a
+    transfer, it raises or lowers the number of requests in flight while the
+    aggregate throughput keeps improving. Between transfers, it doubles or
+    halves the z-depth of the chunks (in whole cuboids) the same way. Chunks
+    never exceed `max_request_bytes` for the channel's datatype. Once the
+    chunk search has bracketed the fastest depth, the best settings seen for
+    the host are reused.
+
+    Each transfer is measured separately, from `start` to `finish`. Transfers
+    to a host that overlap (e.g. a read and its read-ahead prefetches) share
+    its bandwidth, so they neither adjust the concurrency nor count towards
+    the chunk search while they overlap.
+
+    Best settings can be persisted to a JSON file so that they survive across
+    sessions.
+
+    Arguments:
+        path (str : None): JSON file in which to remember the best settings
+            per host. If not given, they are only kept in memory.
+        min_workers (int : 1): Lower bound on requests in flight.
+        max_workers (int : DEFAULT_MAX_WORKERS): Upper bound on requests in flight.
+        initial_chunk_size (Tuple[int, int, int] : (512, 512, 96)): The XYZ chunk
+            size to start from.
+        max_request_bytes (int : MAX_REQUEST_BYTES): Largest request to make.
+        window (int : 8): Number of requests between concurrency adjustments.
+        tolerance (float : 0.05): Relative change in throughput treated as noise.
+        cuboid_size (Tuple[int, int, int] : CUBOID_SIZE): The storage cuboid shape.
+
+    """
+
+    def __init__(
+        self,
+        path=None,
+        min_workers=1,
+        max_workers=DEFAULT_MAX_WORKERS,
+        initial_chunk_size=(512, 512, 16 * 6),
+        max_request_bytes=MAX_REQUEST_BYTES,
+        window=8,
+        tolerance=0.05,
+        cuboid_size=CUBOID_SIZE,
+    ):
+        if min_workers < 1 or max_workers < min_workers:
+            raise ValueError("Worker bounds must satisfy 1 <= min_workers <= max_workers.")
+        self.path = os.path.expanduser(path) if path else None
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.max_request_bytes = max_request_bytes
+        self.window = window
+        self.tolerance = tolerance
+        self.cuboid_size = tuple(cuboid_size)
+        self._plane = (
+            max(initial_chunk_size[0], cuboid_size[0]),
+            max(initial_chunk_size[1], cuboid_size[1]),
+        )
+        self._initial_depth = max(1, -(-initial_chunk_size[2] // cuboid_size[2]))
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _state(self, host):
+        if host not in self._hosts:
+            self._hosts[host] = _HostState(
+                self._initial_depth, self._clamp_workers(self.max_workers // 2)
+            )
+        return self._hosts[host]
+
+    def _clamp_workers(self, workers):
+        return int(min(self.max_workers, max(self.min_workers, workers)))
+
+    def _max_depth(self, itemsize):
+        cuboid_bytes = self._plane[0] * self._plane[1] * self.cuboid_size[2] * itemsize
+        return max(1, self.max_request_bytes // cuboid_bytes)
+
+    def chunk_size(self, host, itemsize):
+        """
+        Get the XYZ chunk size to use for the next transfer from `host`.
+
+        Arguments:
+            host (str): The URL prefix of the Boss.
+            itemsize (int): Bytes per voxel of the channel's datatype.
+
+        Returns:
+            Tuple[int, int, int]
+
+        """
+        with self._lock:
+            state = self._state(host)
+            state.chunk_depth = min(state.chunk_depth, self._max_depth(itemsize))
+            return (
+                self._plane[0],
+                self._plane[1],
+                state.chunk_depth * self.cuboid_size[2],
+            )
+
+    def max_in_flight(self, host):
+        """
+        Get the number of requests to keep in flight to `host` right now.
+
+        Arguments:
+            host (str): The URL prefix of the Boss.
+
+        Returns:
+            int
+
+        """
+        with self._lock:
+            return self._state(host).workers
+
+    def start(self, host):
+        """
+        Begin measuring a transfer from `host`.
+
+        Arguments:
+            host (str): The URL prefix of the Boss.
+
+        Returns:
+            A token to pass to `record` and `finish`.
+
+        """
+        transfer = _Transfer(host)
+        with self._lock:
+            state = self._state(host)
+            if state.active:
+                transfer.overlapped = True
+                for other in state.active:
+                    other.overlapped = True
+            state.active.add(transfer)
+        return transfer
+
+    def record(self, transfer, nbytes, seconds):
+        """
+        Record one completed chunk request of a transfer.
+
+        Arguments:
+            transfer: The token returned by `start`.
+            nbytes (int): Uncompressed size of the chunk.
+            seconds (float): Latency of the request.
+
+        """
+        now = time.perf_counter()
+        with self._lock:
+            state = self._state(transfer.host)
+            if transfer.start is None:
+                transfer.start = now - seconds
+            if transfer.window_start is None:
+                transfer.window_start = now - seconds
+            transfer.bytes += nbytes
+            transfer.requests += 1
+            transfer.window_bytes += nbytes
+            transfer.window_requests += 1
+
+            if transfer.window_requests < self.window:
+                return
+
+            throughput = transfer.window_bytes / max(now - transfer.window_start, 1e-9)
+            transfer.window_start = now
+            transfer.window_bytes = 0
+            transfer.window_requests = 0
+            if len(state.active) > 1:
+                # Other transfers are sharing the bandwidth.
+                return
+
+            last = state.last_window_throughput
+            if last is not None and throughput < last * (1 - self.tolerance):
+                state.worker_step = -state.worker_step
+            step = max(1, state.workers // 4)
+            state.workers = self._clamp_workers(state.workers + step * state.worker_step)
+            state.last_window_throughput = throughput
+
+    def finish(self, transfer, completed=True):
+        """
+        End a transfer and pick the chunk size for the next one.
+
+        Transfers of fewer than two chunks carry no information about
+        concurrency, and transfers that overlapped others measured a share
+        of the bandwidth; both are ignored, as are transfers that failed.
+
+        Arguments:
+            transfer: The token returned by `start`.
+            completed (bool : True): Whether every chunk was transferred.
+
+        """
+        now = time.perf_counter()
+        with self._lock:
+            state = self._state(transfer.host)
+            state.active.discard(transfer)
+            if not completed or transfer.requests < 2 or transfer.overlapped:
+                return
+
+            throughput = transfer.bytes / max(now - transfer.start, 1e-9)
+
+            if state.best is None or throughput > state.best["throughput"]:
+                state.best = {
+                    "throughput": throughput,
+                    "chunk_depth": state.chunk_depth,
+                    "workers": state.workers,
+                }
+
+            if state.depth_reversals >= 2:
+                state.chunk_depth = state.best["chunk_depth"]
+            else:
+                last = state.last_throughput
+                if last is not None and throughput < last * (1 - self.tolerance):
+                    # Worse than last time: go back to the best depth and
+                    # search in the other direction.
+                    state.depth_step = -state.depth_step
+                    state.depth_reversals += 1
+                    state.chunk_depth = state.best["chunk_depth"]
+                if state.depth_reversals < 2:
+                    if state.depth_step > 0:
+                        state.chunk_depth *= 2
+                    else:
+                        state.chunk_depth = max(1, state.chunk_depth // 2)
+            state.last_throughput = throughput
+            self._save()
+
+    def best(self, host):
+        """
+        Get the best settings seen for `host`.
+
+        Arguments:
+            host (str): The URL prefix of the Boss.
+
+        Returns:
+            dict: With keys `chunk_size`, `workers` and `throughput` (bytes per
+                second), or None if no transfer has been measured.
+
+        """
+        with self._lock:
+            best = self._state(host).best
+            if best is None:
+                return None
+            return {
+                "chunk_size": (
+                    self._plane[0],
+                    self._plane[1],
+                    best["chunk_depth"] * self.cuboid_size[2],
+                ),
+                "workers": best["workers"],
+                "throughput": best["throughput"],
+            }
+
+    def _load(self):
+        if not self.path or not os.path.isfile(self.path):
+            return
+        with open(self.path) as fh:
+            saved = json.load(fh)
+        for host, best in saved.items():
+            state = _HostState(best["chunk_depth"], self._clamp_workers(best["workers"]))
+            state.best = best
+            # Remembered settings are already the result of a search:
+            state.depth_reversals = 2
+            self._hosts[host] = state
+
+    def _save(self):
+        if not self.path:
+            return
+        saved = {
+            host: state.best
+            for host, state in self._hosts.items()
+            if state.best is not None
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as fh:
+            json.dump(saved, fh)
+        os.replace(tmp, self.path)
@@ -0,0 +1,461 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+DEFAULT_CACHE_DIR = "~/.intern/cache"
+DEFAULT_CACHE_BYTES = 10 * 1000 * 1000 * 1000
+DEFAULT_CACHE_MAX_AGE = 60 * 60
+DEFAULT_MEMORY_CACHE_BYTES = 512 * 1000 * 1000
+
+
+class DiskCache(object):
+    """
+    A persistent key-value store of bytes with a size cap and LRU eviction.
+
+    Each value is stored in its own file, named by a hash of its key. A
+    file's modification time records when it was written and its access time
+    when it was last read, so least-recently-used order survives across
+    sessions. Writes are atomic, so several processes can share one cache
+    directory (each process enforces the size cap on what it sees).
+
+    The cache only sees the writes made through it, so values written
+    elsewhere (by other clients of the same data) become stale. Values older
+    than `max_age` are therefore treated as missing.
+
+    Arguments:
+        path (str : DEFAULT_CACHE_DIR): Directory to store values in.
+        max_bytes (int : DEFAULT_CACHE_BYTES): Total size at which the least
+            recently used values are evicted.
+        max_age (float : DEFAULT_CACHE_MAX_AGE): Seconds a value stays valid
+            after it is written. None keeps values until they are evicted,
+            which is only safe for data that no one else writes.
+
+    Attributes:
+        hits (int): Number of successful lookups.
+        misses (int): Number of failed lookups.
+
+    """
+
+    def __init__(
+        self,
+        path=DEFAULT_CACHE_DIR,
+        max_bytes=DEFAULT_CACHE_BYTES,
+        max_age=DEFAULT_CACHE_MAX_AGE,
+    ):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be greater than 0.")
+        if max_age is not None and max_age < 0:
+            raise ValueError("max_age must not be negative.")
+        self.path = os.path.expanduser(path)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._sizes = OrderedDict()
+        self._total = 0
+        os.makedirs(self.path, exist_ok=True)
+        self._scan()
+
+    def _expired(self, stat):
+        return self.max_age is not None and time.time() - stat.st_mtime > self.max_age
+
+    def _scan(self):
+        entries = []
+        for root, _, files in os.walk(self.path):
+            for name in files:
+                if not name.endswith(".bin"):
+                    continue
+                filename = os.path.join(root, name)
+                stat = os.stat(filename)
+                if self._expired(stat):
+                    os.unlink(filename)
+                    continue
+                entries.append((stat.st_atime, name[:-4], stat.st_size))
+        for _, digest, size in sorted(entries):
+            self._sizes[digest] = size
+            self._total += size
+        self._evict()
+
+    def _file(self, digest):
+        return os.path.join(self.path, digest[:2], digest + ".bin")
+
+    @staticmethod
+    def _digest(key):
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def __len__(self):
+        return len(self._sizes)
+
+    def __contains__(self, key):
+        return self._digest(key) in self._sizes
+
+    @property
+    def nbytes(self):
+        """Total size of the stored values."""
+        return self._total
+
+    def get(self, key):
+        """
+        Get the value stored for `key`.
+
+        Arguments:
+            key (str)
+
+        Returns:
+            bytes: Or None if the key is not cached or has expired.
+
+        """
+        digest = self._digest(key)
+        try:
+            with open(self._file(digest), "rb") as fh:
+                stat = os.fstat(fh.fileno())
+                value = None if self._expired(stat) else fh.read()
+            if value is not None:
+                # Bump the access time only: the modification time dates
+                # the value.
+                os.utime(self._file(digest), (time.time(), stat.st_mtime))
+        except OSError:
+            value = None
+        if value is None:
+            with self._lock:
+                self.misses += 1
+                self._remove(digest)
+            return None
+        with self._lock:
+            self.hits += 1
+            if digest in self._sizes:
+                self._sizes.move_to_end(digest)
+            else:
+                # Written by another process sharing the directory:
+                self._sizes[digest] = len(value)
+                self._total += len(value)
+        return value
+
+    def put(self, key, value):
+        """
+        Store `value` for `key`, evicting least recently used values to stay
+        under `max_bytes`. Values larger than `max_bytes` are not stored.
+
+        Arguments:
+            key (str)
+            value (bytes)
+
+        """
+        if len(value) > self.max_bytes:
+            return
+        digest = self._digest(key)
+        filename = self._file(digest)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(filename), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(value)
+            os.replace(tmp, filename)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        with self._lock:
+            self._forget(digest)
+            self._sizes[digest] = len(value)
+            self._total += len(value)
+            self._evict()
+
+    def delete(self, key):
+        """
+        Remove the value stored for `key`, if any.
+
+        Arguments:
+            key (str)
+
+        """
+        with self._lock:
+            self._remove(self._digest(key))
+
+    def clear(self):
+        """Remove every stored value."""
+        with self._lock:
+            for digest in list(self._sizes):
+                self._remove(digest)
+
+    def _forget(self, digest):
+        size = self._sizes.pop(digest, None)
+        if size is not None:
+            self._total -= size
+
+    def _remove(self, digest):
+        self._forget(digest)
+        try:
+            os.unlink(self._file(digest))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self._total > self.max_bytes and self._sizes:
+            self._remove(next(iter(self._sizes)))
+
+
+class MemoryCache(object):
+    """
+    An in-process key-value store of bytes with a size cap and LRU eviction.
+
+    It has the same interface as DiskCache, so either can back the cutout
+    cache. Cutout cuboids are stored blosc-compressed, so the budget goes a
+    long way for sparse or smooth data.
+
+    Arguments:
+        max_bytes (int : DEFAULT_MEMORY_CACHE_BYTES): Total size at which the
+            least recently used values are evicted.
+
+    Attributes:
+        hits (int): Number of successful lookups.
+        misses (int): Number of failed lookups.
+
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MEMORY_CACHE_BYTES):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be greater than 0.")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._values = OrderedDict()
+        self._total = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    @property
+    def nbytes(self):
+        """Total size of the stored values."""
+        return self._total
+
+    def get(self, key):
+        """
+        Get the value stored for `key`.
+
+        Arguments:
+            key (str)
+
+        Returns:
+            bytes: Or None if the key is not cached.
+
+        """
+        with self._lock:
+            value = self._values.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._values.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """
+        Store `value` for `key`, evicting least recently used values to stay
+        under `max_bytes`. Values larger than `max_bytes` are not stored.
+
+        Arguments:
+            key (str)
+            value (bytes)
+
+        """
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._values[key] = value
+            self._total += len(value)
+            while self._total > self.max_bytes:
+                self._remove(next(iter(self._values)))
+
+    def delete(self, key):
+        """
+        Remove the value stored for `key`, if any.
+
+        Arguments:
+            key (str)
+
+        """
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        """Remove every stored value."""
+        with self._lock:
+            self._values.clear()
+            self._total = 0
+
+    def _remove(self, key):
+        value = self._values.pop(key, None)
+        if value is not None:
+            self._total -= len(value)
+
+
+class TTLCache(object):
+    """
+    An in-process store of objects that expire `ttl` seconds after they are
+    stored, with a cap on the number of entries (least recently stored are
+    evicted first).
+
+    Arguments:
+        ttl (float : 60): Seconds an entry stays valid.
+        max_entries (int : 10000): Number of entries at which the oldest are
+            evicted.
+
+    Attributes:
+        hits (int): Number of successful lookups.
+        misses (int): Number of failed lookups, including expired entries.
+        invalidations (int): Number of entries removed by `delete` or
+            `delete_prefix`.
+
+    """
+
+    def __init__(self, ttl=60, max_entries=10000):
+        if ttl < 0:
+            raise ValueError("ttl must not be negative.")
+        if max_entries <= 0:
+            raise ValueError("max_entries must be greater than 0.")
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+        self._values = OrderedDict()
+
+    def __len__(self):
+        return len(self._values)
+
+    def stats(self):
+        """
+        Summarize how the cache has been used.
+
+        Returns:
+            dict: `hits`, `misses`, `invalidations` and `entries`.
+
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "entries": len(self._values),
+        }
+
+    def get(self, key):
+        """
+        Get the object stored for `key`.
+
+        Arguments:
+            key (hashable)
+
+        Returns:
+            The object, or None if the key is not cached or has expired.
+
+        """
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is not None and time.monotonic() >= entry[0]:
+                del self._values[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        """
+        Store `value` for `key`, evicting the oldest entries to stay under
+        `max_entries`.
+
+        Arguments:
+            key (hashable)
+            value (object)
+
+        """
+        with self._lock:
+            self._values.pop(key, None)
+            self._values[key] = (time.monotonic() + self.ttl, value)
+            while len(self._values) > self.max_entries:
+                self._values.popitem(last=False)
+
+    def delete(self, key):
+        """
+        Remove the object stored for `key`, if any.
+
+        Arguments:
+            key (hashable)
+
+        """
+        with self._lock:
+            if self._values.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def delete_prefix(self, prefix):
+        """
+        Remove the objects stored for every string key that is `prefix` or
+        starts with `prefix` followed by "/".
+
+        Arguments:
+            prefix (str)
+
+        """
+        with self._lock:
+            for key in [
+                k for k in self._values if k == prefix or k.startswith(prefix + "/")
+            ]:
+                del self._values[key]
+                self.invalidations += 1
+
+    def clear(self):
+        """Remove every stored object."""
+        with self._lock:
+            self._values.clear()
+
+
+def open_cache(cache):
+    """
+    Normalize the `cache` option of a remote or volume provider.
+
+    Arguments:
+        cache (bool | str | int | object): True for a DiskCache in the default
+            directory, a path for a DiskCache in that directory (both with the
+            default `max_age`), a number of
+            bytes for a MemoryCache of that size, False or None for no cache,
+            or a cache object to use as is.
+
+    Returns:
+        The cache object, or None.
+
+    """
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        return DiskCache()
+    if isinstance(cache, str):
+        return DiskCache(cache)
+    if isinstance(cache, int):
+        return MemoryCache(cache)
+    return cache
@@ -0,0 +1,152 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import itertools
+import time
+
+import blosc
+import numpy as np
+
+SHUFFLES = {
+    "none": blosc.NOSHUFFLE,
+    "byte": blosc.SHUFFLE,
+    "bit": blosc.BITSHUFFLE,
+}
+
+
+class BloscSettings(object):
+    """
+    How cutouts are blosc-compressed before they are uploaded.
+
+    The blosc typesize is always the itemsize of the data, in bytes, so that
+    the shuffle filter groups the bytes of each voxel correctly.
+
+    Arguments:
+        cname (str : "blosclz"): Codec, one of `blosc.cnames` (e.g. "lz4",
+            "zstd" or "blosclz").
+        clevel (int : 9): Compression level from 0 (none) to 9 (most).
+        shuffle (str | int : "byte"): Shuffle filter: "none", "byte" or "bit"
+            (or the matching blosc constant).
+        nthreads (int : None): Number of threads blosc uses to compress and
+            decompress. This is a process-wide blosc setting, so it is set
+            once, by `apply`, when the settings are assigned to
+            `BossRemote.compression`, rather than on every upload; None leaves
+            it unchanged.
+
+    """
+
+    def __init__(self, cname="blosclz", clevel=9, shuffle="byte", nthreads=None):
+        if cname not in blosc.cnames:
+            raise ValueError(
+                "cname must be one of {}, not {}.".format(blosc.cnames, cname)
+            )
+        if not 0 <= clevel <= 9:
+            raise ValueError("clevel must be between 0 and 9.")
+        shuffle = SHUFFLES.get(shuffle, shuffle)
+        if shuffle not in SHUFFLES.values():
+            raise ValueError(
+                "shuffle must be one of {}.".format(sorted(SHUFFLES))
+            )
+        if nthreads is not None and nthreads < 1:
+            raise ValueError("nthreads must be at least 1.")
+        self.cname = cname
+        self.clevel = clevel
+        self.shuffle = shuffle
+        self.nthreads = nthreads
+
+    def __repr__(self):
+        shuffle = {v: k for k, v in SHUFFLES.items()}[self.shuffle]
+        return "BloscSettings(cname={!r}, clevel={}, shuffle={!r}, nthreads={})".format(
+            self.cname, self.clevel, shuffle, self.nthreads
+        )
+
+    def apply(self):
+        """
+        Set blosc's process-wide thread count to `nthreads`.
+
+        Returns:
+            int: The previous thread count, to restore later, or None if
+                `nthreads` is None and nothing was changed.
+
+        """
+        if self.nthreads is None:
+            return None
+        return blosc.set_nthreads(self.nthreads)
+
+    def compress(self, data):
+        """
+        Compress a C-contiguous array.
+
+        Arguments:
+            data (np.ndarray)
+
+        Returns:
+            bytes
+
+        """
+        return blosc.compress(
+            data,
+            typesize=data.itemsize,
+            clevel=self.clevel,
+            shuffle=self.shuffle,
+            cname=self.cname,
+        )
+
+
+def benchmark(data, cnames=None, clevels=(1, 5, 9), shuffles=("byte", "bit"), repeat=3):
+    """
+    Measure the compression ratio and speed of blosc settings on sample data.
+
+    Use a representative cutout of your own channel: ratios depend heavily on
+    the content (e.g. sparse labels compress far better than raw images).
+
+    Arguments:
+        data (np.ndarray): Sample data.
+        cnames (List[str] : None): Codecs to try. Defaults to every codec.
+        clevels (List[int] : (1, 5, 9)): Compression levels to try.
+        shuffles (List[str] : ("byte", "bit")): Shuffle filters to try.
+        repeat (int : 3): Timings are the best of this many runs.
+
+    Returns:
+        List[dict]: One result per combination, sorted from the highest
+            compression ratio, with the keys `settings` (BloscSettings),
+            `ratio`, `compress_mbps` and `decompress_mbps` (megabytes of
+            uncompressed data per second).
+
+    """
+    data = np.ascontiguousarray(data)
+    results = []
+    for cname, clevel, shuffle in itertools.product(
+        cnames or blosc.cnames, clevels, shuffles
+    ):
+        settings = BloscSettings(cname, clevel, shuffle)
+        compress_time = decompress_time = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            compressed = settings.compress(data)
+            compress_time = min(compress_time, time.perf_counter() - start)
+            start = time.perf_counter()
+            blosc.decompress(compressed)
+            decompress_time = min(decompress_time, time.perf_counter() - start)
+        megabytes = data.nbytes / 1e6
+        results.append(
+            {
+                "settings": settings,
+                "ratio": data.nbytes / len(compressed),
+                "compress_mbps": megabytes / max(compress_time, 1e-9),
+                "decompress_mbps": megabytes / max(decompress_time, 1e-9),
+            }
+        )
+    results.sort(key=lambda result: -result["ratio"])
+    return results
@@ -0,0 +1,140 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import threading
+
+
+class UploadJournal(object):
+    """
+    A JSON-lines file recording the blocks of uploads that have completed.
+
+    Pass the same journal (or the same path) to a restarted upload and the
+    blocks it already sent are skipped. Each line is written and flushed to
+    disk as soon as its block is accepted, so a crash loses at most the
+    blocks that were in flight.
+
+    A journal only records *where* data was written: restart a job with the
+    same data, or `forget` it first.
+
+    Arguments:
+        path (str): The journal file. It is created if it does not exist.
+
+    """
+
+    def __init__(self, path):
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._done = set()
+        self._truncated = False
+        if os.path.isfile(self.path):
+            with open(self.path) as fh:
+                for line in fh:
+                    # A crash may cut the last line short; the next record
+                    # must then start on a new line.
+                    self._truncated = not line.endswith("\n")
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if entry.get("forget"):
+                        self._discard(entry["job"])
+                    else:
+                        self._done.add(self._key(entry["job"], entry["block"]))
+
+    def __len__(self):
+        return len(self._done)
+
+    @staticmethod
+    def _plain(block):
+        return [[int(v) for v in r] for r in block]
+
+    @classmethod
+    def _key(cls, job, block):
+        return (job, json.dumps(cls._plain(block)))
+
+    def _discard(self, job):
+        self._done = {key for key in self._done if key[0] != job}
+
+    def _append(self, entry):
+        with open(self.path, "a") as fh:
+            if self._truncated:
+                fh.write("\n")
+                self._truncated = False
+            fh.write(json.dumps(entry) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def done(self, job, block):
+        """
+        Whether a block of a job has already been uploaded.
+
+        Arguments:
+            job (str): Identifies the upload (e.g. its channel and region).
+            block (List[List[int]]): The block's ranges.
+
+        Returns:
+            bool
+
+        """
+        return self._key(job, block) in self._done
+
+    def record(self, job, block):
+        """
+        Record that a block of a job has been uploaded.
+
+        Arguments:
+            job (str): Identifies the upload.
+            block (List[List[int]]): The block's ranges.
+
+        Returns:
+            None
+
+        """
+        with self._lock:
+            self._append({"job": job, "block": self._plain(block)})
+            self._done.add(self._key(job, block))
+
+    def forget(self, job):
+        """
+        Forget every block of a job, so that it is uploaded again in full.
+
+        Arguments:
+            job (str): Identifies the upload.
+
+        Returns:
+            None
+
+        """
+        with self._lock:
+            self._append({"job": job, "forget": True})
+            self._discard(job)
+
+
+def open_journal(journal):
+    """
+    Turn a `journal=` argument into an UploadJournal.
+
+    Arguments:
+        journal (None | str | UploadJournal): None for no journal, or the path
+            of a journal file.
+
+    Returns:
+        UploadJournal: Or None.
+
+    """
+    if journal is None or isinstance(journal, UploadJournal):
+        return journal
+    return UploadJournal(journal)
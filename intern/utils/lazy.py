@@ -0,0 +1,48 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import sys
+
+
+def lazy_module_attributes(module_name, mapping):
+    """
+    Build a module's `__getattr__` and `__dir__` (PEP 562) so that some of
+    its attributes are imported on first use.
+
+    Each attribute is imported from its module the first time it is looked
+    up, then stored on the package so later lookups are ordinary.
+
+    Arguments:
+        module_name (str): The package, usually its `__name__`.
+        mapping (Dict[str, str]): Attribute name to the module defining it.
+
+    Returns:
+        Tuple[Callable, Callable]: The `__getattr__` and `__dir__` functions.
+
+    """
+
+    def __getattr__(name):
+        if name in mapping:
+            value = getattr(importlib.import_module(mapping[name]), name)
+            setattr(sys.modules[module_name], name, value)
+            return value
+        raise AttributeError(
+            "module {!r} has no attribute {!r}".format(module_name, name)
+        )
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[module_name])) | set(mapping))
+
+    return __getattr__, __dir__
@@ -14,6 +14,8 @@
 # limitations under the License.
 
 from __future__ import absolute_import
+from concurrent import futures
+import os
 import numpy
 from six.moves import range
 
@@ -124,3 +126,152 @@ def block_compute(x_start, x_stop,
             for z in z_slices:
                 chunks.append((x, y, z))
     return chunks
+
+
+# The shape (XYZ) of a Boss cuboid, the unit in which data are stored. The
+# cuboid grid is anchored at the origin of the dataset, and the same cuboid
+# shape is used at every resolution level.
+CUBOID_SIZE = (512, 512, 16)
+
+# The Boss rejects cutout requests larger than about 500 MB.
+MAX_REQUEST_BYTES = 500 * 1000 * 1000
+
+
+def align_to_cuboids(block_size, cuboid_size=CUBOID_SIZE):
+    """
+    Round a block size up to a whole number of cuboids along each axis.
+
+    Arguments:
+        block_size (Tuple[int, ...]): The desired block size
+        cuboid_size (Tuple[int, ...]): The cuboid size, in the same axis order
+
+    Returns:
+        Tuple[int, ...]: The aligned block size
+    """
+    return tuple(
+        max(cuboid, -(-int(block) // cuboid) * cuboid)
+        for block, cuboid in zip(block_size, cuboid_size)
+    )
+
+
+def _axis_segments(start, stop, block, origin):
+    """
+    Split [start, stop) along one axis at multiples of `block` from `origin`.
+
+    Returns:
+        numpy.ndarray: (k, 2) array of (start, stop) pairs
+    """
+    first = origin + ((start - origin) // block + 1) * block
+    edges = numpy.concatenate(([start], numpy.arange(first, stop, block), [stop]))
+    return numpy.stack((edges[:-1], edges[1:]), axis=1)
+
+
+def cuboid_aligned_blocks(x_range, y_range, z_range,
+                          block_size=(512, 512, 96),
+                          cuboid_size=CUBOID_SIZE,
+                          origin=(0, 0, 0),
+                          time_range=None,
+                          time_block_size=1):
+    """
+    Plan the requests needed to transfer a region so that every interior block
+    edge falls on the storage cuboid grid.
+
+    `block_size` is rounded up to a whole number of cuboids along each axis,
+    so only the blocks on the outside of the region can touch partial cuboids.
+    Blocks are ordered with x varying fastest and z (or time, if given)
+    slowest, which matches the memory layout of a (T)ZYX array.
+
+    Arguments:
+        x_range (list[int]): x range such as [10, 20] which means x>=10 and x<20.
+        y_range (list[int]): y range such as [10, 20] which means y>=10 and y<20.
+        z_range (list[int]): z range such as [10, 20] which means z>=10 and z<20.
+        block_size (Tuple[int, int, int]): Desired (x, y, z) size of each block
+        cuboid_size (Tuple[int, int, int]): The (x, y, z) shape of a cuboid at
+            the resolution being transferred
+        origin (Tuple[int, int, int]): The coordinate at which the cuboid grid
+            is anchored
+        time_range (optional [list[int]]): time range such as [30, 40] which
+            means t>=30 and t<40. If given, time is chunked as a fourth axis.
+        time_block_size (int : 1): Number of time points in each block
+
+    Returns:
+        numpy.ndarray: (N, 3, 2) array where blocks[i] is
+            [[x_start, x_stop], [y_start, y_stop], [z_start, z_stop]], or an
+            (N, 4, 2) array with a trailing [t_start, t_stop] row if
+            `time_range` was given.
+    """
+    ranges = [x_range, y_range, z_range]
+    sizes = list(align_to_cuboids(block_size, cuboid_size))
+    origins = list(origin)
+    if time_range is not None:
+        ranges.append(time_range)
+        sizes.append(max(1, int(time_block_size)))
+        origins.append(int(time_range[0]))
+
+    segments = [
+        _axis_segments(int(rng[0]), int(rng[1]), size, offset)
+        for rng, size, offset in zip(ranges, sizes, origins)
+    ]
+
+    # Index grids with the slowest-varying axis first:
+    grids = numpy.meshgrid(
+        *[numpy.arange(len(seg)) for seg in reversed(segments)], indexing="ij"
+    )
+    return numpy.stack(
+        [seg[idx.ravel()] for seg, idx in zip(segments, reversed(grids))],
+        axis=1,
+    )
+
+
+# Default number of worker threads used for concurrent HTTP requests. Cutout
+# transfers are I/O-bound, so (like concurrent.futures) we oversubscribe the
+# CPU count slightly rather than matching it.
+DEFAULT_MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def imap_bounded(executor, fn, items, max_in_flight=None):
+    """
+    Apply `fn` to every item in `items` using `executor`, keeping at most
+    `max_in_flight` calls submitted at any one time.
+
+    Results are yielded in completion order, alongside the item that produced
+    them. If any call raises, the calls that have not yet started are
+    cancelled and the exception is re-raised.
+
+    Arguments:
+        executor (concurrent.futures.Executor): The executor to submit to
+        fn (callable): A function of one argument
+        items (iterable): The arguments to pass to `fn`
+        max_in_flight (int | callable : None): The maximum number of outstanding
+            calls, or a function returning it, which is consulted again every
+            time a call completes. Defaults to DEFAULT_MAX_WORKERS.
+
+    Yields:
+        (item, result) for each item in `items`
+    """
+    if callable(max_in_flight):
+        limit = max_in_flight
+    else:
+        limit = lambda: max_in_flight or DEFAULT_MAX_WORKERS
+    items = iter(items)
+    pending = {}
+
+    def fill():
+        while len(pending) < max(1, limit()):
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            pending[executor.submit(fn, item)] = item
+
+    try:
+        fill()
+        while pending:
+            done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                yield item, future.result()
+                fill()
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,147 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from email.utils import parsedate_to_datetime
+import datetime
+import random
+import time
+
+from requests import ConnectionError, HTTPError, Timeout
+from requests.exceptions import ChunkedEncodingError
+
+
+class RetryPolicy(object):
+    """
+    Retry transient HTTP failures with capped exponential backoff and jitter.
+
+    A failure is transient if it is a connection error or timeout, or an
+    HTTPError whose response has one of `statuses`. A Retry-After header on
+    the response is honored: the retry never happens sooner than it asks.
+
+    Arguments:
+        retries (int : 5): Number of retries after the first attempt.
+        backoff (float : 0.5): Base delay in seconds; attempt `n` waits up to
+            `backoff * 2**n`.
+        max_backoff (float : 60): Cap on the exponential delay.
+        jitter (bool : True): Randomize each delay between 0 and its cap
+            ("full jitter"), so that parallel clients do not retry in lockstep.
+        statuses (Tuple[int] : (429, 500, 502, 503, 504)): Retryable statuses.
+
+    """
+
+    def __init__(
+        self,
+        retries=5,
+        backoff=0.5,
+        max_backoff=60.0,
+        jitter=True,
+        statuses=(429, 500, 502, 503, 504),
+    ):
+        if retries < 0:
+            raise ValueError("retries must not be negative.")
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = frozenset(statuses)
+
+    def is_retryable(self, err):
+        """
+        Whether an exception is a transient failure worth retrying.
+
+        Arguments:
+            err (Exception)
+
+        Returns:
+            bool
+
+        """
+        if isinstance(err, HTTPError):
+            response = err.response
+            return response is not None and response.status_code in self.statuses
+        return isinstance(err, (ConnectionError, Timeout, ChunkedEncodingError))
+
+    def delay(self, attempt, err=None):
+        """
+        Seconds to wait before retry number `attempt` (counting from 0).
+
+        Arguments:
+            attempt (int): Number of retries already made.
+            err (Exception : None): The failure being retried.
+
+        Returns:
+            float
+
+        """
+        delay = min(self.max_backoff, self.backoff * (2 ** attempt))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        retry_after = _retry_after(getattr(err, "response", None))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def call(self, fn, *args, **kwargs):
+        """
+        Call `fn`, retrying transient failures.
+
+        Arguments:
+            fn (callable)
+
+        Returns:
+            The result of `fn(*args, **kwargs)`.
+
+        Raises:
+            The last exception, if it is not transient or retries ran out.
+
+        """
+        attempt = 0
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except Exception as err:
+                if attempt >= self.retries or not self.is_retryable(err):
+                    raise
+                time.sleep(self.delay(attempt, err))
+                attempt += 1
+
+
+def _retry_after(response):
+    """
+    Parse the Retry-After header of a response into seconds, if present.
+
+    Arguments:
+        response (requests.Response : None)
+
+    Returns:
+        float: Or None if there is no usable header.
+
+    """
+    if response is None or response.headers is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max(0.0, (when - now).total_seconds())
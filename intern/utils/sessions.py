@@ -0,0 +1,130 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+
+from requests import Session
+from requests.adapters import HTTPAdapter, DEFAULT_POOLSIZE
+
+
+class SessionRegistry(object):
+    """
+    One `requests.Session` per host and token, shared by everything in the
+    process that talks to that host as that user.
+
+    Sharing a session means sharing its connection pool, so the project,
+    metadata and volume services of every remote pointed at the same host
+    with the same token reuse the same kept-alive (and TLS-negotiated)
+    connections. Remotes with different tokens get separate sessions, and so
+    separate cookie jars.
+
+    A pool is sized for the most demanding of its users: it grows to the
+    largest `pool_maxsize` asked for and never shrinks, so one remote
+    lowering its parallelism does not throttle the transfers of another.
+
+    Arguments:
+        pool_maxsize (int : requests' default): Smallest connection pool
+            size of a new session.
+
+    """
+
+    def __init__(self, pool_maxsize=DEFAULT_POOLSIZE):
+        self.pool_maxsize = pool_maxsize
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._sizes = {}
+
+    def __len__(self):
+        return len(self._sessions)
+
+    @staticmethod
+    def _mount(session, pool_maxsize):
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+    def get(self, host, token=None, pool_maxsize=None):
+        """
+        Get the session of a host and token, creating it on first use.
+
+        Arguments:
+            host (str): Host (and optional port) such as 'api.bossdb.io'.
+            token (str : None): The token the session's requests carry.
+            pool_maxsize (int : None): Number of connections the caller may
+                use at once. The pool grows to fit it, but never shrinks.
+
+        Returns:
+            requests.Session
+
+        """
+        key = (host, token)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = self._sessions[key] = Session()
+                self._sizes[key] = 0
+            wanted = max(pool_maxsize or 0, self.pool_maxsize)
+            if wanted > self._sizes[key]:
+                self._mount(session, wanted)
+                self._sizes[key] = wanted
+            return session
+
+    def pool_size(self, host, token=None):
+        """
+        The connection pool size of a host and token.
+
+        Arguments:
+            host (str): Host (and optional port).
+            token (str : None): The token.
+
+        Returns:
+            int: Or None if there is no such session yet.
+
+        """
+        return self._sizes.get((host, token))
+
+    def close(self):
+        """
+        Close and forget every session. A later `get` opens a new one.
+
+        Returns:
+            None
+
+        """
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._sizes.clear()
+
+
+sessions = SessionRegistry()
+
+
+def get_session(host, token=None, pool_maxsize=None):
+    """
+    Get the process-wide session of a host and token from the default
+    registry.
+
+    Arguments:
+        host (str): Host (and optional port) such as 'api.bossdb.io'.
+        token (str : None): The token the session's requests carry.
+        pool_maxsize (int : None): Number of connections the caller may use
+            at once.
+
+    Returns:
+        requests.Session
+
+    """
+    return sessions.get(host, token, pool_maxsize)
@@ -0,0 +1,150 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from intern.utils.autotune import CutoutAutotuner
+
+HOST = "https://api.theboss.io"
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCutoutAutotuner(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = patch("intern.utils.autotune.time.perf_counter", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def transfer(self, tuner, nbytes_per_second, requests=8, nbytes=1000):
+        """Simulate a transfer that runs at the given aggregate throughput."""
+        transfer = tuner.start(HOST)
+        for _ in range(requests):
+            self.clock.now += nbytes / nbytes_per_second
+            tuner.record(transfer, nbytes, 0.0)
+        tuner.finish(transfer)
+
+    def test_chunk_size_respects_request_limit(self):
+        tuner = CutoutAutotuner(
+            initial_chunk_size=(512, 512, 192), max_request_bytes=512 * 512 * 64 * 8
+        )
+        self.assertEqual((512, 512, 64), tuner.chunk_size(HOST, 8))
+        self.assertEqual((512, 512, 64), tuner.chunk_size(HOST, 1))
+
+    def test_chunk_size_is_whole_cuboids(self):
+        tuner = CutoutAutotuner(initial_chunk_size=(100, 100, 20))
+        self.assertEqual((512, 512, 32), tuner.chunk_size(HOST, 1))
+
+    def test_workers_increase_while_throughput_improves(self):
+        tuner = CutoutAutotuner(max_workers=32, window=4)
+        start = tuner.max_in_flight(HOST)
+        transfer = tuner.start(HOST)
+        for rate in (100, 200, 300):
+            for _ in range(4):
+                self.clock.now += 10 / rate
+                tuner.record(transfer, 10, 0.0)
+        self.assertGreater(tuner.max_in_flight(HOST), start)
+
+    def test_workers_back_off_when_throughput_drops(self):
+        tuner = CutoutAutotuner(max_workers=32, window=4)
+        transfer = tuner.start(HOST)
+        for rate in (300, 100):
+            for _ in range(4):
+                self.clock.now += 10 / rate
+                tuner.record(transfer, 10, 0.0)
+        after_drop = tuner.max_in_flight(HOST)
+        for _ in range(4):
+            self.clock.now += 10 / 100
+            tuner.record(transfer, 10, 0.0)
+        self.assertLess(tuner.max_in_flight(HOST), after_drop)
+
+    def test_workers_stay_in_bounds(self):
+        tuner = CutoutAutotuner(min_workers=2, max_workers=4, window=1)
+        transfer = tuner.start(HOST)
+        for rate in range(1, 50):
+            self.clock.now += 10 / rate
+            tuner.record(transfer, 10, 0.0)
+            self.assertTrue(2 <= tuner.max_in_flight(HOST) <= 4)
+
+    def test_chunk_depth_search_settles_on_best(self):
+        tuner = CutoutAutotuner(initial_chunk_size=(512, 512, 32))
+        # Throughput peaks at a chunk depth of 64 voxels:
+        rates = {32: 100, 64: 400, 128: 200, 16: 50}
+        for _ in range(6):
+            depth = tuner.chunk_size(HOST, 1)[2]
+            self.transfer(tuner, rates[depth])
+        self.assertEqual((512, 512, 64), tuner.chunk_size(HOST, 1))
+        self.assertEqual((512, 512, 64), tuner.best(HOST)["chunk_size"])
+
+    def test_single_request_transfers_are_ignored(self):
+        tuner = CutoutAutotuner()
+        self.transfer(tuner, 100, requests=1)
+        self.assertIsNone(tuner.best(HOST))
+
+    def test_overlapping_transfers_are_ignored(self):
+        tuner = CutoutAutotuner(max_workers=32, window=2)
+        workers = tuner.max_in_flight(HOST)
+        read = tuner.start(HOST)
+        prefetch = tuner.start(HOST)
+        for _ in range(4):
+            self.clock.now += 1
+            tuner.record(read, 10, 0.0)
+            tuner.record(prefetch, 10, 0.0)
+        # The prefetch finishing must not reset the read's measurements:
+        tuner.finish(prefetch)
+        self.assertEqual(4, read.requests)
+        tuner.finish(read)
+
+        self.assertEqual(workers, tuner.max_in_flight(HOST))
+        self.assertIsNone(tuner.best(HOST))
+
+        # A transfer on its own is measured again:
+        self.transfer(tuner, 100)
+        self.assertIsNotNone(tuner.best(HOST))
+
+    def test_failed_transfers_are_ignored(self):
+        tuner = CutoutAutotuner()
+        transfer = tuner.start(HOST)
+        for _ in range(8):
+            self.clock.now += 1
+            tuner.record(transfer, 10, 0.0)
+        tuner.finish(transfer, completed=False)
+        self.assertIsNone(tuner.best(HOST))
+
+    def test_best_settings_persist(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "autotune.json")
+            tuner = CutoutAutotuner(path=path, initial_chunk_size=(512, 512, 32))
+            self.transfer(tuner, 100)
+
+            restored = CutoutAutotuner(path=path)
+            self.assertEqual(tuner.best(HOST), restored.best(HOST))
+            self.assertEqual((512, 512, 32), restored.chunk_size(HOST, 1))
+            self.assertIsNone(restored.best("https://other.host"))
+
+    def test_invalid_bounds(self):
+        with self.assertRaises(ValueError):
+            CutoutAutotuner(min_workers=0)
+        with self.assertRaises(ValueError):
+            CutoutAutotuner(min_workers=8, max_workers=4)
@@ -0,0 +1,181 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import time
+import unittest
+
+from intern.utils.cache import (
+    DEFAULT_CACHE_MAX_AGE,
+    DiskCache,
+    MemoryCache,
+    TTLCache,
+    open_cache,
+)
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = tmp.name
+
+    def test_get_put(self):
+        cache = DiskCache(self.path)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", b"12345")
+        self.assertEqual(b"12345", cache.get("a"))
+        self.assertIn("a", cache)
+        self.assertEqual(5, cache.nbytes)
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_evicts_least_recently_used(self):
+        cache = DiskCache(self.path, max_bytes=10)
+        cache.put("a", b"aaaa")
+        cache.put("b", b"bbbb")
+        cache.get("a")
+        cache.put("c", b"cccc")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(b"aaaa", cache.get("a"))
+        self.assertEqual(b"cccc", cache.get("c"))
+        self.assertEqual(8, cache.nbytes)
+
+    def test_stale_values_expire(self):
+        cache = DiskCache(self.path, max_age=60)
+        cache.put("a", b"12345")
+        filename = cache._file(cache._digest("a"))
+        written = time.time() - 120
+        os.utime(filename, (written, written))
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(1, cache.misses)
+        self.assertNotIn("a", cache)
+        self.assertFalse(os.path.exists(filename))
+
+    def test_stale_values_dropped_on_open(self):
+        DiskCache(self.path).put("a", b"12345")
+        cache = DiskCache(self.path, max_age=None)
+        filename = cache._file(cache._digest("a"))
+        written = time.time() - 2 * DEFAULT_CACHE_MAX_AGE
+        os.utime(filename, (written, written))
+
+        # Values are kept forever only when staleness is opted in to:
+        self.assertEqual(b"12345", DiskCache(self.path, max_age=None).get("a"))
+        self.assertEqual(0, len(DiskCache(self.path)))
+
+    def test_reads_keep_write_time(self):
+        cache = DiskCache(self.path)
+        cache.put("a", b"12345")
+        filename = cache._file(cache._digest("a"))
+        written = time.time() - 10
+        os.utime(filename, (written, written))
+        cache.get("a")
+        self.assertEqual(written, os.stat(filename).st_mtime)
+
+    def test_does_not_store_oversized_values(self):
+        cache = DiskCache(self.path, max_bytes=4)
+        cache.put("a", b"12345")
+        self.assertEqual(0, len(cache))
+
+    def test_persists_across_instances(self):
+        cache = DiskCache(self.path)
+        cache.put("a", b"aaaa")
+        cache.put("b", b"bbbb")
+        # Older entries are evicted first when reopened with a smaller cap:
+        os.utime(cache._file(cache._digest("a")), (0, 0))
+        restored = DiskCache(self.path, max_bytes=6)
+        self.assertEqual(1, len(restored))
+        self.assertEqual(b"bbbb", restored.get("b"))
+
+    def test_delete_and_clear(self):
+        cache = DiskCache(self.path)
+        cache.put("a", b"aaaa")
+        cache.put("b", b"bbbb")
+        cache.delete("a")
+        cache.delete("missing")
+        self.assertIsNone(cache.get("a"))
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.nbytes)
+        self.assertEqual(0, len(DiskCache(self.path)))
+
+    def test_open_cache(self):
+        self.assertIsNone(open_cache(None))
+        self.assertIsNone(open_cache(False))
+        self.assertEqual(self.path, open_cache(self.path).path)
+        self.assertEqual(1024, open_cache(1024).max_bytes)
+        cache = DiskCache(self.path)
+        self.assertIs(cache, open_cache(cache))
+
+
+class TestMemoryCache(unittest.TestCase):
+    def test_get_put(self):
+        cache = MemoryCache()
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", b"12345")
+        self.assertEqual(b"12345", cache.get("a"))
+        self.assertEqual(5, cache.nbytes)
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_evicts_least_recently_used(self):
+        cache = MemoryCache(max_bytes=10)
+        cache.put("a", b"aaaa")
+        cache.put("b", b"bbbb")
+        cache.get("a")
+        cache.put("c", b"cccc")
+        self.assertNotIn("b", cache)
+        self.assertEqual(["a", "c"], sorted(cache._values))
+        self.assertEqual(8, cache.nbytes)
+
+    def test_replace_and_delete(self):
+        cache = MemoryCache(max_bytes=10)
+        cache.put("a", b"aaaa")
+        cache.put("a", b"aa")
+        self.assertEqual(2, cache.nbytes)
+        cache.delete("a")
+        cache.put("b", b"12345678901")
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.nbytes)
+
+
+class TestTTLCache(unittest.TestCase):
+    def test_get_put(self):
+        cache = TTLCache()
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", {"x": 1})
+        self.assertEqual({"x": 1}, cache.get("a"))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_entries_expire(self):
+        cache = TTLCache(ttl=0)
+        cache.put("a", 1)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(0, len(cache))
+
+    def test_evicts_oldest(self):
+        cache = TTLCache(max_entries=2)
+        for key in "abc":
+            cache.put(key, key)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual("c", cache.get("c"))
+
+    def test_delete_prefix(self):
+        cache = TTLCache()
+        for key in ("coll", "coll/experiment/exp", "collection", "other"):
+            cache.put(key, key)
+        cache.delete_prefix("coll")
+        self.assertEqual(2, len(cache))
+        self.assertEqual("collection", cache.get("collection"))
+        self.assertEqual(2, cache.stats()["invalidations"])
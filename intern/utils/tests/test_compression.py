@@ -0,0 +1,75 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+import blosc
+import numpy as np
+
+from intern.utils.compression import BloscSettings, benchmark
+
+
+class TestBloscSettings(unittest.TestCase):
+    def test_typesize_is_itemsize(self):
+        for dtype in ("uint8", "uint16", "uint64"):
+            data = np.arange(1000, dtype=dtype)
+            compressed = BloscSettings().compress(data)
+            # Byte 3 of the blosc header is the typesize:
+            self.assertEqual(data.itemsize, compressed[3])
+            np.testing.assert_array_equal(
+                data, np.frombuffer(blosc.decompress(compressed), dtype=dtype)
+            )
+
+    def test_codec_and_shuffle(self):
+        data = np.arange(1000, dtype="uint64")
+        compressed = BloscSettings(cname="zstd", clevel=5, shuffle="bit").compress(data)
+        self.assertEqual("Zstd", blosc.get_clib(compressed))
+        self.assertEqual(
+            data.tobytes(), blosc.decompress(compressed)
+        )
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            BloscSettings(cname="gzip")
+        with self.assertRaises(ValueError):
+            BloscSettings(clevel=10)
+        with self.assertRaises(ValueError):
+            BloscSettings(shuffle="word")
+        with self.assertRaises(ValueError):
+            BloscSettings(nthreads=0)
+
+
+    def test_apply_sets_nthreads(self):
+        self.assertIsNone(BloscSettings().apply())
+        previous = BloscSettings(nthreads=2).apply()
+        try:
+            self.assertEqual(2, BloscSettings(nthreads=3).apply())
+        finally:
+            blosc.set_nthreads(previous)
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_reports_every_combination(self):
+        data = np.zeros((16, 64, 64), dtype="uint64")
+        data[:, 10:20, 10:20] = 12345
+        results = benchmark(data, cnames=["lz4", "zstd"], clevels=[1, 9], repeat=1)
+
+        self.assertEqual(2 * 2 * 2, len(results))
+        ratios = [result["ratio"] for result in results]
+        self.assertEqual(sorted(ratios, reverse=True), ratios)
+        for result in results:
+            self.assertGreater(result["ratio"], 1)
+            self.assertGreater(result["compress_mbps"], 0)
+            self.assertGreater(result["decompress_mbps"], 0)
+            self.assertIsInstance(result["settings"], BloscSettings)
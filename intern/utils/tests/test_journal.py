@@ -0,0 +1,65 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from intern.utils.journal import UploadJournal, open_journal
+
+
+class TestUploadJournal(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "upload.journal")
+
+    def test_record_and_reload(self):
+        journal = UploadJournal(self.path)
+        self.assertFalse(journal.done("job", [[0, 512], [0, 512], [0, 16]]))
+        journal.record("job", [[0, 512], [0, 512], np.array([0, 16])])
+        self.assertTrue(journal.done("job", [[0, 512], [0, 512], [0, 16]]))
+        self.assertFalse(journal.done("other", [[0, 512], [0, 512], [0, 16]]))
+
+        restored = UploadJournal(self.path)
+        self.assertEqual(1, len(restored))
+        self.assertTrue(restored.done("job", [[0, 512], [0, 512], [0, 16]]))
+
+    def test_ignores_truncated_lines(self):
+        journal = UploadJournal(self.path)
+        journal.record("job", [[0, 1]])
+        with open(self.path, "a") as fh:
+            fh.write('{"job": "job", "blo')
+        restored = UploadJournal(self.path)
+        self.assertEqual(1, len(restored))
+        restored.record("job", [[1, 2]])
+        self.assertEqual(2, len(UploadJournal(self.path)))
+
+    def test_forget(self):
+        journal = UploadJournal(self.path)
+        journal.record("a", [[0, 1]])
+        journal.record("b", [[0, 1]])
+        journal.forget("a")
+        self.assertFalse(journal.done("a", [[0, 1]]))
+        restored = UploadJournal(self.path)
+        self.assertFalse(restored.done("a", [[0, 1]]))
+        self.assertTrue(restored.done("b", [[0, 1]]))
+
+    def test_open_journal(self):
+        self.assertIsNone(open_journal(None))
+        self.assertEqual(self.path, open_journal(self.path).path)
+        journal = UploadJournal(self.path)
+        self.assertIs(journal, open_journal(journal))
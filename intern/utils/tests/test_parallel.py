@@ -0,0 +1,116 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from intern.utils.parallel import (
+    align_to_cuboids, cuboid_aligned_blocks, imap_bounded)
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+import unittest
+
+
+class TestCuboidAlignedBlocks(unittest.TestCase):
+
+    def test_align_to_cuboids(self):
+        self.assertEqual(
+            (512, 1024, 48), align_to_cuboids((100, 600, 33)))
+
+    def test_single_block(self):
+        blocks = cuboid_aligned_blocks([3, 20], [4, 30], [5, 9])
+        self.assertEqual([[[3, 20], [4, 30], [5, 9]]], blocks.tolist())
+
+    def test_blocks_cover_region_exactly(self):
+        blocks = cuboid_aligned_blocks(
+            [100, 1600], [0, 700], [7, 70], block_size=(512, 512, 32))
+        self.assertEqual((4 * 2 * 3, 3, 2), blocks.shape)
+
+        volume = 0
+        for b in blocks:
+            volume += (b[:, 1] - b[:, 0]).prod()
+        self.assertEqual(1500 * 700 * 63, volume)
+
+    def test_interior_edges_on_cuboid_grid(self):
+        blocks = cuboid_aligned_blocks(
+            [100, 1600], [0, 700], [7, 70], block_size=(500, 500, 20))
+        for b in blocks.tolist():
+            for (start, stop), lo, hi, cuboid in zip(
+                    b, (100, 0, 7), (1600, 700, 70), (512, 512, 16)):
+                self.assertTrue(start == lo or start % cuboid == 0)
+                self.assertTrue(stop == hi or stop % cuboid == 0)
+
+    def test_x_varies_fastest(self):
+        blocks = cuboid_aligned_blocks(
+            [0, 1024], [0, 1024], [0, 32], block_size=(512, 512, 16)).tolist()
+        self.assertEqual([[0, 512], [0, 512], [0, 16]], blocks[0])
+        self.assertEqual([[512, 1024], [0, 512], [0, 16]], blocks[1])
+        self.assertEqual([[0, 512], [0, 512], [16, 32]], blocks[4])
+
+    def test_origin(self):
+        blocks = cuboid_aligned_blocks(
+            [0, 20], [0, 20], [0, 20], cuboid_size=(8, 8, 8),
+            block_size=(8, 8, 8), origin=(4, 0, 0)).tolist()
+        self.assertEqual([[0, 4], [0, 8], [0, 8]], blocks[0])
+        self.assertEqual([[4, 12], [0, 8], [0, 8]], blocks[1])
+
+
+class TestImapBounded(unittest.TestCase):
+
+    def test_all_results_returned(self):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = dict(imap_bounded(executor, lambda i: i * i, range(20), 3))
+        self.assertEqual({i: i * i for i in range(20)}, results)
+
+    def test_in_flight_is_bounded(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'peak': 0}
+
+        def work(i):
+            with lock:
+                state['running'] += 1
+                state['peak'] = max(state['peak'], state['running'])
+            time.sleep(0.01)
+            with lock:
+                state['running'] -= 1
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(imap_bounded(executor, work, range(20), 2))
+        self.assertEqual(2, state['peak'])
+
+    def test_in_flight_limit_can_change(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'peaks': []}
+        limits = iter([1] * 5 + [4] * 100)
+
+        def work(i):
+            with lock:
+                state['running'] += 1
+                state['peaks'].append(state['running'])
+            time.sleep(0.01)
+            with lock:
+                state['running'] -= 1
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(imap_bounded(executor, work, range(20), lambda: next(limits)))
+        self.assertEqual([1, 1], state['peaks'][:2])
+        self.assertEqual(4, max(state['peaks']))
+
+    def test_exception_propagates(self):
+        def work(i):
+            if i == 3:
+                raise ValueError(i)
+            return i
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            with self.assertRaises(ValueError):
+                list(imap_bounded(executor, work, range(10), 2))
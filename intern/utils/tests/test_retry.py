@@ -0,0 +1,91 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import unittest
+from email.utils import format_datetime
+from unittest.mock import patch
+
+from requests import ConnectionError, HTTPError, Response
+
+from intern.utils.retry import RetryPolicy
+
+
+def http_error(status, retry_after=None):
+    resp = Response()
+    resp.status_code = status
+    if retry_after is not None:
+        resp.headers["Retry-After"] = retry_after
+    return HTTPError("failed", response=resp)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_is_retryable(self):
+        policy = RetryPolicy()
+        self.assertTrue(policy.is_retryable(http_error(503)))
+        self.assertTrue(policy.is_retryable(http_error(429)))
+        self.assertTrue(policy.is_retryable(ConnectionError()))
+        self.assertFalse(policy.is_retryable(http_error(403)))
+        self.assertFalse(policy.is_retryable(HTTPError("no response")))
+        self.assertFalse(policy.is_retryable(ValueError()))
+
+    def test_delay_is_capped_exponential(self):
+        policy = RetryPolicy(backoff=1, max_backoff=5, jitter=False)
+        self.assertEqual([1, 2, 4, 5, 5], [policy.delay(i) for i in range(5)])
+
+    def test_jitter_stays_below_cap(self):
+        policy = RetryPolicy(backoff=1, max_backoff=5)
+        for attempt in range(10):
+            self.assertTrue(0 <= policy.delay(attempt) <= 5)
+
+    def test_delay_honors_retry_after_seconds(self):
+        policy = RetryPolicy(backoff=1, jitter=False)
+        self.assertEqual(30, policy.delay(0, http_error(503, "30")))
+
+    def test_delay_honors_retry_after_date(self):
+        policy = RetryPolicy(backoff=0)
+        when = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=60)
+        delay = policy.delay(0, http_error(429, format_datetime(when, usegmt=True)))
+        self.assertTrue(55 <= delay <= 60)
+
+    @patch("intern.utils.retry.time.sleep")
+    def test_call_retries_until_success(self, sleep):
+        results = [http_error(503), http_error(502), "ok"]
+
+        def fn():
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        self.assertEqual("ok", RetryPolicy().call(fn))
+        self.assertEqual(2, sleep.call_count)
+
+    @patch("intern.utils.retry.time.sleep")
+    def test_call_gives_up(self, sleep):
+        def fn():
+            raise http_error(503)
+
+        with self.assertRaises(HTTPError):
+            RetryPolicy(retries=3).call(fn)
+        self.assertEqual(3, sleep.call_count)
+
+    @patch("intern.utils.retry.time.sleep")
+    def test_call_does_not_retry_permanent_errors(self, sleep):
+        def fn():
+            raise http_error(404)
+
+        with self.assertRaises(HTTPError):
+            RetryPolicy().call(fn)
+        sleep.assert_not_called()
@@ -0,0 +1,48 @@
+# Copyright 2020 The Johns Hopkins University Applied Physics Laboratory
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import unittest
+
+from intern.utils.sessions import SessionRegistry
+
+
+class TestSessionRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = SessionRegistry(pool_maxsize=4)
+        self.addCleanup(self.registry.close)
+
+    def pool_maxsize(self, session):
+        return session.get_adapter("https://api.test.com")._pool_maxsize
+
+    def test_one_session_per_host_and_token(self):
+        session = self.registry.get("api.test.com", "a")
+        self.assertIs(session, self.registry.get("api.test.com", "a"))
+        self.assertIsNot(session, self.registry.get("api.test.com", "b"))
+        self.assertIsNot(session, self.registry.get("other.test.com", "a"))
+        self.assertEqual(3, len(self.registry))
+
+    def test_pool_grows_but_never_shrinks(self):
+        session = self.registry.get("api.test.com")
+        self.assertEqual(4, self.pool_maxsize(session))
+        self.registry.get("api.test.com", pool_maxsize=16)
+        self.assertEqual(16, self.pool_maxsize(session))
+        self.registry.get("api.test.com", pool_maxsize=8)
+        self.assertEqual(16, self.pool_maxsize(session))
+        self.assertEqual(16, self.registry.pool_size("api.test.com"))
+
+    def test_close(self):
+        session = self.registry.get("api.test.com")
+        self.registry.close()
+        self.assertIsNone(self.registry.pool_size("api.test.com"))
+        self.assertIsNot(session, self.registry.get("api.test.com"))
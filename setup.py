@@ -80,6 +80,8 @@ setup(
     extras_require={
         "cloudvolume": ["cloud-volume==6.1.1", "brotli>=1.0.7"],
         "meshing": ["zmesh>=0.5.0"],
+        "async": ["aiohttp>=3.7"],
+        "tiff": ["tifffile>=2021.1.1"],
     },
     dependency_links=dependency_links,
     author_email="iarpamicrons@jhuapl.edu",